@@ -1,44 +1,53 @@
-from typing import Any
+from typing import Any, \
+                   Callable as typing_Callable
 from enum import StrEnum as enum_StrEnum
 from os import getenv as os_getenv, \
                system as os_system
 from os.path import exists as os_path_exists
+from sys import _getframe as sys_getframe
 from time import monotonic as time_monotonic, \
+                 perf_counter as time_perf_counter, \
                  sleep as time_sleep
-from datetime import datetime as datetime_datetime, \
-                     date as datetime_date, \
-                     timedelta as datetime_timedelta, \
+from datetime import date as datetime_date, \
                      time as datetime_time
 from json import dumps as json_dumps
 from logging import getLogger as logging_getLogger, \
                     getLevelName as logging_getLevelName, \
                     addLevelName as logging_addLevelName, \
-                    getLevelNamesMapping as logging_getLevelNamesMapping
+                    getLevelNamesMapping as logging_getLevelNamesMapping, \
+                    DEBUG as logging_DEBUG, \
+                    INFO as logging_INFO
 from logging.config import fileConfig as logging_config_fileConfig
 from configparser import ConfigParser as configparser_ConfigParser
 from importlib import import_module as importlib_import_module
-from inspect import stack as inspect_stack
 from signal import signal as signal_signal, \
                    SIGHUP as signal_SIGHUP, \
                    SIGTERM as signal_SIGTERM, \
                    SIGQUIT as signal_SIGQUIT, \
                    SIGINT as signal_SIGINT, \
+                   SIGUSR1 as signal_SIGUSR1, \
                    strsignal as signal_strsignal
 from asyncio import create_task as asyncio_create_task, \
                     gather as asyncio_gather, \
-                    sleep as asyncio_sleep, \
-                    Queue as asyncio_Queue, \
+                    Event as asyncio_Event, \
+                    get_running_loop as asyncio_get_running_loop, \
                     CancelledError as asyncio_CancelledError
 
 from aiomqtt import Client as aiomqtt_Client, \
                     Will as aiomqtt_Will, \
                     MqttError as aiomqtt_MqttError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler as apscheduler_schedulers_AsyncIOScheduler
-from dbus_fast.aio import MessageBus
-from dbus_fast.auth import AuthExternal, UID_NOT_SPECIFIED
-from dbus_fast.constants import BusType
 
+from hal9000.logger import Logger, RingBufferHandler
+from hal9000.queues import BoundedQueue, OVERFLOW, OVERFLOW_VALUES
 from .plugin import HAL9000_Plugin, DataInvalid, RUNLEVEL, CommitPhase
+from .topic import TopicTrie, TopicMessage, RegexDispatcher
+from .signals import Signal, LANE, SIGNAL_LANE
+from .queues import LaneQueue
+from .worker import SignalWorker
+from .timers import Timers
+from .network import SystemNetwork
+from .templates import Template
 from .plugins.brain import STATUS
 
 
@@ -46,15 +55,26 @@ class Daemon(object):
 	LOGLEVEL_TRACE = 5
 
 	def __init__(self) -> None:
-		self.logger = logging_getLogger()
+		self.logger = Logger()
 		self.config = {}
 		self.plugins = {}
-		self.callbacks = {'mqtt': {}}
+		self.callbacks = {'mqtt': TopicTrie()}
+		self.mqtt_regex_dispatchers = {}
 		self.tasks = {}
-		self.signal_queue = asyncio_Queue()
-		self.mqtt_publish_queue = asyncio_Queue()
-		self.scheduler = apscheduler_schedulers_AsyncIOScheduler()
+		self.signal_queue = LaneQueue(0, OVERFLOW.BLOCK, lambda data: (data['plugin'], data['signal'].family()), \
+		                              name='signals', backpressure=True, logger=self.logger) # backpressure by task_mqtt_subscriber()
+		self.signal_lanes = TopicTrie()
+		self.signal_coalesce = frozenset()
+		self.mqtt_publish_coalesce = TopicTrie()
+		self.signal_workers = {}
+		self.mqtt_publish_queue = BoundedQueue(0, OVERFLOW.BLOCK, lambda message: message['topic'], name='mqtt-publish', logger=self.logger)
+		self.scheduler = apscheduler_schedulers_AsyncIOScheduler() # only for 'cron' schedules, see self.timers
+		self.timers = Timers(self.on_timer)
+		self.network = SystemNetwork(self.logger)
+		self.templates = {}
 		self.runlevel_inhibitors = {RUNLEVEL.STARTING: {}, RUNLEVEL.SYNCING: {}, RUNLEVEL.PREPARING: {}, RUNLEVEL.RUNNING: {}}
+		self.changes = asyncio_Event()
+		self.trace_sampling = {'rate': 1.0, 'credit': 0.0, 'traced': 0, 'skipped': 0, 'seconds': 0.0}
 
 
 	def configure(self, filename: str) -> None:
@@ -70,6 +90,7 @@ class Daemon(object):
 		self.logger.debug(f"[daemon] loading plugins....")
 		actions = {}
 		triggers = {}
+		sections = {}
 		for section_name in self.configuration.sections():
 			plugin_path = self.configuration.getstring(section_name, 'plugin', fallback=None)
 			plugin_hidden = self.configuration.getboolean(section_name, 'hidden', fallback=False)
@@ -96,6 +117,7 @@ class Daemon(object):
 				match plugin_type:
 					case 'action':
 						actions[plugin_name].configure(self.configuration, section_name)
+						sections[actions[plugin_name].module.name] = section_name
 					case 'trigger':
 						triggers[plugin_name].configure(self.configuration, section_name)
 		self.logger.debug(f"[daemon] registering callbacks for trigger plugins....")
@@ -106,25 +128,89 @@ class Daemon(object):
 				if callback_type.lower() == 'mqtt':
 					callback_list = callbacks[callback_type]
 					for mqtt_topic in callback_list:
-						if mqtt_topic not in self.callbacks['mqtt']:
-							self.callbacks['mqtt'][mqtt_topic] = []
-						self.callbacks['mqtt'][mqtt_topic].append(trigger)
+						try:
+							self.callbacks['mqtt'].add(mqtt_topic, trigger, trigger.module.sleepless)
+						except ValueError as e:
+							self.logger.error(f"[daemon] invalid MQTT topic filter for trigger '{trigger.module.id}', skipping it: {str(e)}")
 		self.logger.debug(f"[daemon] setting up callback for value changes on all plugins....")
 		self.logger.debug(f"[daemon] reading daemon specific settings....")
 		self.config['mqtt:server']    = str(os_getenv('MQTT_SERVER', default=self.configuration.getstring('mqtt', 'server', fallback='127.0.0.1')))
 		self.config['mqtt:port']      = int(os_getenv('MQTT_PORT', default=self.configuration.getint('mqtt', 'port', fallback=1883)))
 		self.config['mqtt:keepalive'] = int(os_getenv('MQTT_PORT', default=self.configuration.getint('mqtt', 'keepalive', fallback=0)))
+		self.config['mqtt:trigger-regex-dispatch'] = self.configuration.getstring('mqtt', 'trigger-regex-dispatch', fallback='individual')
+		if self.config['mqtt:trigger-regex-dispatch'] not in ['individual', 'combined']:
+			self.logger.warning(f"[daemon] invalid value '{self.config['mqtt:trigger-regex-dispatch']}' for 'trigger-regex-dispatch' " \
+			                    f"in section 'mqtt', using 'individual' instead")
+			self.config['mqtt:trigger-regex-dispatch'] = 'individual'
+		self.config['mqtt:publish-queue-limit'] = self.configuration.getint('mqtt', 'publish-queue-limit', fallback=1000)
+		self.config['mqtt:publish-queue-overflow'] = self.get_config_overflow('mqtt', 'publish-queue-overflow', OVERFLOW.COALESCE, False)
+		self.mqtt_publish_queue.configure(self.config['mqtt:publish-queue-limit'], self.config['mqtt:publish-queue-overflow'])
+		self.config['mqtt:publish-coalesce'] = self.configuration.getlist('mqtt', 'publish-coalesce', fallback=[]) # opt-in, e.g. 'hal9000/command/frontend/gui/screen'
+		for topic_filter in self.config['mqtt:publish-coalesce']:
+			if topic_filter != '':
+				try:
+					self.mqtt_publish_coalesce.add(topic_filter, True)
+				except ValueError as e:
+					self.logger.error(f"[daemon] invalid MQTT topic filter in 'publish-coalesce' (section 'mqtt'), skipping it: {str(e)}")
+		if len(self.mqtt_publish_coalesce.filters()) > 0:
+			self.mqtt_publish_queue.coalesce = self.get_mqtt_publish_coalesce_key
 		self.config['help:error-url']  = self.configuration.getstring('help', 'error-url',  fallback='https://github.com/juergenpabel/HAL9000/wiki/Error-database')
 		self.config['help:splash-url'] = self.configuration.getstring('help', 'splash-url', fallback='https://github.com/juergenpabel/HAL9000/wiki/Splashs')
-		self.add_runlevel_inhibitor(RUNLEVEL.STARTING, 'daemon: *.runlevel!=unknown', self.runlevel_inhibitor_starting_plugins)
+		self.config['trace:sample-rate'] = self.configuration.getfloat('trace', 'sample-rate', fallback=1.0)
+		self.config['signals:dispatch'] = self.configuration.getstring('signals', 'dispatch', fallback='workers')
+		if self.config['signals:dispatch'] not in ['workers', 'inline']:
+			self.logger.warning(f"[daemon] invalid value '{self.config['signals:dispatch']}' for 'dispatch' " \
+			                    f"in section 'signals', using 'workers' instead")
+			self.config['signals:dispatch'] = 'workers'
+		self.config['signals:interactive-topics'] = self.configuration.getlist('signals', 'interactive-topics', \
+		                                                                      fallback=['hal9000/event/frontend/device/input'])
+		for topic_filter in self.config['signals:interactive-topics']:
+			try:
+				self.signal_lanes.add(topic_filter, LANE.INTERACTIVE, True)
+			except ValueError as e:
+				self.logger.error(f"[daemon] invalid MQTT topic filter in 'interactive-topics' (section 'signals'), skipping it: {str(e)}")
+		self.config['signals:signal-queue-limit'] = self.configuration.getint('signals', 'signal-queue-limit', fallback=1000)
+		self.config['signals:signal-queue-overflow'] = self.get_config_overflow('signals', 'signal-queue-overflow', OVERFLOW.DROP_OLDEST, True)
+		self.signal_queue.configure(self.config['signals:signal-queue-limit'], self.config['signals:signal-queue-overflow'])
+		self.config['signals:coalesce'] = self.configuration.getlist('signals', 'coalesce', fallback=[]) # opt-in, e.g. 'gui/screen, gui/overlay'
+		self.signal_coalesce = frozenset(path for path in self.config['signals:coalesce'] if path != '')
+		if len(self.signal_coalesce) > 0:
+			self.signal_queue.coalesce = self.get_signal_coalesce_key
+		self.config['signals:queue-limit'] = self.configuration.getint('signals', 'queue-limit', fallback=SignalWorker.QUEUE_LIMIT)
+		self.config['signals:queue-overflow'] = self.get_config_overflow('signals', 'queue-overflow', SignalWorker.QUEUE_OVERFLOW, False)
+		self.config['signals:handler-timeout'] = self.configuration.getfloat('signals', 'handler-timeout', fallback=SignalWorker.HANDLER_TIMEOUT)
+		for plugin_name, section_name in sections.items():
+			self.config[f'signals:{plugin_name}:queue-limit'] = self.configuration.getint(section_name, 'signal-queue-limit', \
+			                                                                              fallback=self.config['signals:queue-limit'])
+			self.config[f'signals:{plugin_name}:handler-timeout'] = self.configuration.getfloat(section_name, 'signal-handler-timeout', \
+			                                                                                   fallback=self.config['signals:handler-timeout'])
+			self.config[f'signals:{plugin_name}:queue-overflow'] = self.get_config_overflow(section_name, 'signal-queue-overflow', \
+			                                                                                self.config['signals:queue-overflow'], False)
+		self.trace_sampling['rate'] = min(max(self.config['trace:sample-rate'], 0.0), 1.0)
+		self.add_runlevel_inhibitor(RUNLEVEL.STARTING, 'daemon: *.runlevel!=unknown', self.runlevel_inhibitor_starting_plugins, ['*.runlevel'])
 		self.logger.debug(f"[daemon] daemon configuration completed")
 
 
+	def get_config_overflow(self, section_name: str, option: str, fallback: OVERFLOW, backpressure: bool) -> OVERFLOW:
+		# 'block' only for queues with backpressure (the signal queue: task_mqtt_subscriber() waits for space, but signals
+		# queued by plugins are still rejected while it's full), all other producers would just lose their items
+		overflow = self.configuration.getstring(section_name, option, fallback=fallback)
+		if overflow not in OVERFLOW_VALUES:
+			self.logger.warning(f"[daemon] invalid value '{overflow}' for '{option}' in section '{section_name}', using '{fallback}' instead")
+			overflow = fallback
+		if overflow == OVERFLOW.BLOCK and backpressure is False:
+			self.logger.warning(f"[daemon] unsupported value '{overflow}' for '{option}' in section '{section_name}' (no producer waits " \
+			                    f"for space, items would be rejected), using '{fallback}' instead")
+			overflow = fallback
+		return OVERFLOW(overflow)
+
+
 	async def loop(self) -> dict:
 		signal_signal(signal_SIGHUP, self.on_posix_signal)
 		signal_signal(signal_SIGTERM, self.on_posix_signal)
 		signal_signal(signal_SIGQUIT, self.on_posix_signal)
 		signal_signal(signal_SIGINT, self.on_posix_signal)
+		signal_signal(signal_SIGUSR1, self.on_posix_signal_dump)
 		results = await self.runlevel_starting()
 		if len(results) == 0 and self.plugins['brain'].status != STATUS.DYING:
 			results = await self.runlevel_syncing()
@@ -138,52 +224,48 @@ class Daemon(object):
 			task.cancel()
 			results[name] = (await asyncio_gather(task, return_exceptions=True)).pop()
 		self.scheduler.shutdown()
+		self.timers.shutdown()
+		self.network.shutdown()
+		if self.trace_sampling['traced'] > 0:
+			self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] caller traces: {self.trace_sampling['traced']} traced, " \
+			                                       f"{self.trace_sampling['skipped']} skipped (sample-rate={self.trace_sampling['rate']}), " \
+			                                       f"{self.trace_sampling['seconds'] / self.trace_sampling['traced'] * 1000000:.1f}us per trace")
 		return results
 
 
 	async def runlevel_starting(self) -> dict:
 		self.logger.info(f"[daemon] Runlevel: {RUNLEVEL.STARTING}")
 		self.plugins['brain'].runlevel = RUNLEVEL.STARTING, CommitPhase.COMMIT
-		self.logger.debug(f"[daemon] STATUS in runlevel '{self.plugins['brain'].runlevel}' = {self}")
+		self.logger.debug("[daemon] STATUS in runlevel '{runlevel}' = {daemon}", runlevel=self.plugins['brain'].runlevel, daemon=self)
 		try:
 			self.scheduler.start()
+			self.timers.start(asyncio_get_running_loop())
 			self.tasks['signals'] = asyncio_create_task(self.task_signal())
 			self.tasks['mqtt'] = asyncio_create_task(self.task_mqtt())
-			while 'mqtt:publisher' not in self.tasks and 'mqtt:subscriber' not in self.tasks:
-				if self.plugins['brain'].status == STATUS.DYING:
-					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for MQTT connection in runlevel 'starting'")
-					raise RuntimeError(STATUS.DYING)
-				await asyncio_sleep(0.1)
+			await self.wait_until(lambda: 'mqtt:publisher' in self.tasks or 'mqtt:subscriber' in self.tasks, \
+			                      f"MQTT connection in runlevel '{RUNLEVEL.STARTING}'")
 			self.mqtt_publish_queue.put_nowait({'topic': f'hal9000/event/brain/runlevel', 'payload': 'starting'})
 			self.logger.info(f"[daemon] Connected to MQTT, now requesting runlevel announcements from these services:")
 			for name, plugin in dict(filter(lambda item: item[1].runlevel == DataInvalid.UNKNOWN, self.plugins.items())).items():
 				self.logger.info(f"[daemon] - Service '{name}'")
 				self.mqtt_publish_queue.put_nowait({'topic': f'hal9000/command/{name}/runlevel', 'payload': None})
 			self.logger.info(f"[daemon] Waiting for these services to announce their runlevel...")
-			while len(list(filter(lambda plugin: plugin.runlevel == DataInvalid.UNKNOWN, self.plugins.values()))) > 0:
-				if self.plugins['brain'].status == STATUS.DYING:
-					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for plugins in runlevel 'starting'")
-					raise RuntimeError(STATUS.DYING)
-				await asyncio_sleep(0.1)
+			await self.wait_until(lambda: all(plugin.runlevel != DataInvalid.UNKNOWN for plugin in self.plugins.values()), \
+			                      f"plugins in runlevel '{RUNLEVEL.STARTING}'")
 			self.logger.info(f"[daemon] ...all services announced their runlevel")
 			self.logger.info(f"[daemon] Inhibitors in runlevel '{RUNLEVEL.STARTING}':")
 			for name in self.runlevel_inhibitors[RUNLEVEL.STARTING].keys():
 				self.logger.info(f"[daemon] - Inhibitor '{name}'")
 			self.logger.info(f"[daemon] Waiting for these inhibitors to finish...")
-			while len(self.runlevel_inhibitors[RUNLEVEL.STARTING]) > 0:
-				await self.evaluate_runlevel_inhibitors(RUNLEVEL.STARTING)
-				if self.plugins['brain'].status == STATUS.DYING:
-					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for inhibitors in runlevel 'starting'")
-					raise RuntimeError(STATUS.DYING)
-				await asyncio_sleep(0.1)
+			await self.wait_for_runlevel_inhibitors(RUNLEVEL.STARTING)
 			self.logger.info(f"[daemon] ...all inhibitors in runlevel '{RUNLEVEL.STARTING}' have finished")
-			self.logger.debug(f"[daemon] STATUS after runlevel 'starting' = {self}")
+			self.logger.debug("[daemon] STATUS after runlevel '{runlevel}' = {daemon}", runlevel=RUNLEVEL.STARTING, daemon=self)
 		except Exception as e:
 			self.logger.debug(f"[daemon] execution of runlevel '{RUNLEVEL.STARTING}' aborted, services that haven't announced their runlevel: " \
 			                  f"{', '.join(list(dict(filter(lambda item: item[1].runlevel == DataInvalid.UNKNOWN, self.plugins.items())).keys()))}")
 			self.logger.info(f"[daemon] Execution of runlevel '{RUNLEVEL.STARTING}' aborted, remaining inhibitors that haven't finished:")
-			for name in list(self.runlevel_inhibitors[RUNLEVEL.STARTING].keys()):
-				self.logger.info(f"[daemon] - Inhibitor '{name}'")
+			for name, inhibitor in self.runlevel_inhibitors[RUNLEVEL.STARTING].items():
+				self.logger.info(f"[daemon] - Inhibitor '{name}' (waited {time_monotonic()-inhibitor['since']:.3f} seconds)")
 			self.logger.critical(f"[daemon] Daemon.runlevel_starting(): {type(e).__name__} => {str(e)}")
 			from traceback import format_exc as traceback_format_exc
 			self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] {traceback_format_exc()}")
@@ -196,7 +278,7 @@ class Daemon(object):
 	async def runlevel_syncing(self) -> dict:
 		self.logger.info(f"[daemon] Runlevel: {RUNLEVEL.SYNCING}")
 		self.plugins['brain'].runlevel = RUNLEVEL.SYNCING, CommitPhase.COMMIT
-		self.logger.debug(f"[daemon] STATUS in runlevel '{self.plugins['brain'].runlevel}' = {self}")
+		self.logger.debug("[daemon] STATUS in runlevel '{runlevel}' = {daemon}", runlevel=self.plugins['brain'].runlevel, daemon=self)
 		try:
 			self.plugins['brain'].status = STATUS.AWAKE
 			self.queue_signal('brain', {'time': None})
@@ -204,19 +286,13 @@ class Daemon(object):
 			for name in self.runlevel_inhibitors[RUNLEVEL.SYNCING].keys():
 				self.logger.info(f"[daemon] - Inhibitor '{name}'")
 			self.logger.info(f"[daemon] Waiting for these inhibitors to finish...")
-			while len(self.runlevel_inhibitors[RUNLEVEL.SYNCING]) > 0:
-				if self.plugins['brain'].status == STATUS.DYING:
-					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for inhibitors " \
-					                  f"in runlevel '{RUNLEVEL.SYNCING}'")
-					raise RuntimeError(STATUS.DYING)
-				await self.evaluate_runlevel_inhibitors(RUNLEVEL.SYNCING)
-				await asyncio_sleep(0.1)
+			await self.wait_for_runlevel_inhibitors(RUNLEVEL.SYNCING)
 			self.logger.info(f"[daemon] ...all inhibitors in runlevel '{RUNLEVEL.SYNCING}' have finished")
-			self.logger.debug(f"[daemon] STATUS after runlevel '{RUNLEVEL.SYNCING}' = {self}")
+			self.logger.debug("[daemon] STATUS after runlevel '{runlevel}' = {daemon}", runlevel=RUNLEVEL.SYNCING, daemon=self)
 		except Exception as e:
 			self.logger.info(f"[daemon] Execution of runlevel '{RUNLEVEL.SYNCING}' aborted, remaining inhibitors that haven't finished: ")
-			for name in list(self.runlevel_inhibitors[RUNLEVEL.SYNCING].keys()):
-				self.logger.info(f"[daemon] - Inhibitor '{name}'")
+			for name, inhibitor in self.runlevel_inhibitors[RUNLEVEL.SYNCING].items():
+				self.logger.info(f"[daemon] - Inhibitor '{name}' (waited {time_monotonic()-inhibitor['since']:.3f} seconds)")
 			self.logger.critical(f"[daemon] Daemon.runlevel_syncing(): {type(e).__name__} => {str(e)}")
 			from traceback import format_exc as traceback_format_exc
 			self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] {traceback_format_exc()}")
@@ -230,25 +306,19 @@ class Daemon(object):
 	async def runlevel_preparing(self) -> dict:
 		self.logger.info(f"[daemon] Runlevel: {RUNLEVEL.PREPARING}")
 		self.plugins['brain'].runlevel = RUNLEVEL.PREPARING, CommitPhase.COMMIT
-		self.logger.debug(f"[daemon] STATUS in runlevel '{self.plugins['brain'].runlevel}' = {self}")
+		self.logger.debug("[daemon] STATUS in runlevel '{runlevel}' = {daemon}", runlevel=self.plugins['brain'].runlevel, daemon=self)
 		try:
 			self.logger.info(f"[daemon] Inhibitors in runlevel '{RUNLEVEL.PREPARING}':")
 			for name in self.runlevel_inhibitors[RUNLEVEL.PREPARING].keys():
 				self.logger.info(f"[daemon] - Inhibitor '{name}'")
 			self.logger.info(f"[daemon] Waiting for these inhibitors to finish...")
-			while len(self.runlevel_inhibitors[RUNLEVEL.PREPARING]) > 0:
-				if self.plugins['brain'].status == STATUS.DYING:
-					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for inhibitors " \
-					                  f"in runlevel '{RUNLEVEL.PREPARING}'")
-					raise RuntimeError(STATUS.DYING)
-				await self.evaluate_runlevel_inhibitors(RUNLEVEL.PREPARING)
-				await asyncio_sleep(0.1)
+			await self.wait_for_runlevel_inhibitors(RUNLEVEL.PREPARING)
 			self.logger.info(f"[daemon] ...all inhibitors in runlevel '{RUNLEVEL.PREPARING}' have finished")
-			self.logger.debug(f"[daemon] STATUS after runlevel '{RUNLEVEL.PREPARING}' = {self}")
+			self.logger.debug("[daemon] STATUS after runlevel '{runlevel}' = {daemon}", runlevel=RUNLEVEL.PREPARING, daemon=self)
 		except Exception as e:
 			self.logger.info(f"[daemon] Execution of runlevel '{RUNLEVEL.PREPARING}' aborted, remaining inhibitors that haven't finished: ")
-			for name in list(self.runlevel_inhibitors[RUNLEVEL.PREPARING].keys()):
-				self.logger.info(f"[daemon] - Inhibitor '{name}'")
+			for name, inhibitor in self.runlevel_inhibitors[RUNLEVEL.PREPARING].items():
+				self.logger.info(f"[daemon] - Inhibitor '{name}' (waited {time_monotonic()-inhibitor['since']:.3f} seconds)")
 			self.logger.critical(f"[daemon] Daemon.runlevel_preparing(): {type(e).__name__} => {str(e)}")
 			from traceback import format_exc as traceback_format_exc
 			self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] {traceback_format_exc()}")
@@ -262,11 +332,11 @@ class Daemon(object):
 	async def runlevel_running(self) -> dict:
 		self.logger.info(f"[daemon] Runlevel: {RUNLEVEL.RUNNING}")
 		self.plugins['brain'].runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
-		self.logger.debug(f"[daemon] STATUS in runlevel '{self.plugins['brain'].runlevel}' = {self}")
+		self.logger.debug("[daemon] STATUS in runlevel '{runlevel}' = {daemon}", runlevel=self.plugins['brain'].runlevel, daemon=self)
 		try:
 			while self.plugins['brain'].runlevel == RUNLEVEL.RUNNING and self.plugins['brain'].status != STATUS.DYING:
-				await asyncio_sleep(0.1)
-			self.logger.debug(f"[daemon] STATUS after runlevel '{self.plugins['brain'].runlevel}' = {self}")
+				await self.changes.wait()
+			self.logger.debug("[daemon] STATUS after runlevel '{runlevel}' = {daemon}", runlevel=self.plugins['brain'].runlevel, daemon=self)
 		except Exception as e:
 			self.logger.critical(f"[daemon] Daemon.runlevel_running(): {type(e).__name__} => {str(e)}")
 			from traceback import format_exc as traceback_format_exc
@@ -278,10 +348,12 @@ class Daemon(object):
 		return {}
 
 
-	def add_runlevel_inhibitor(self, runlevel: str, name: str, callback) -> None:
+	def add_runlevel_inhibitor(self, runlevel: str, name: str, callback, dependencies: list | None = None) -> None:
 		if runlevel in self.runlevel_inhibitors:
 			if name not in self.runlevel_inhibitors[runlevel]:
-				self.runlevel_inhibitors[runlevel][name] = callback
+				self.runlevel_inhibitors[runlevel][name] = {'callback': callback, \
+				                                            'dependencies': set(dependencies) if dependencies is not None else None, \
+				                                            'pending': True, 'since': time_monotonic()}
 
 
 	def remove_runlevel_inhibitor(self, runlevel: str, name: str) -> None:
@@ -291,10 +363,44 @@ class Daemon(object):
 
 
 	async def evaluate_runlevel_inhibitors(self, runlevel: str) -> None:
-		for name, callback in self.runlevel_inhibitors[runlevel].copy().items():
-			if await callback() is True:
-				self.logger.info(f"[daemon] - Inhibitor '{name}' has finished")
-				del self.runlevel_inhibitors[runlevel][name]
+		for name, inhibitor in self.runlevel_inhibitors[runlevel].copy().items():
+			if inhibitor['pending'] is True:
+				inhibitor['pending'] = False
+				if await inhibitor['callback']() is True:
+					self.logger.info(f"[daemon] - Inhibitor '{name}' has finished (after {time_monotonic()-inhibitor['since']:.3f} seconds)")
+					del self.runlevel_inhibitors[runlevel][name]
+
+
+	async def wait_for_runlevel_inhibitors(self, runlevel: str) -> None:
+		for inhibitor in self.runlevel_inhibitors[runlevel].values():
+			inhibitor['since'] = time_monotonic()
+		while len(self.runlevel_inhibitors[runlevel]) > 0:
+			changes = self.changes # changes during evaluation must trigger another evaluation
+			await self.evaluate_runlevel_inhibitors(runlevel)
+			if len(self.runlevel_inhibitors[runlevel]) > 0:
+				if self.plugins['brain'].status == STATUS.DYING:
+					self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for inhibitors in runlevel '{runlevel}'")
+					raise RuntimeError(STATUS.DYING)
+				await changes.wait()
+
+
+	async def wait_until(self, condition: typing_Callable[[], bool], description: str) -> None:
+		while condition() is False:
+			if self.plugins['brain'].status == STATUS.DYING:
+				self.logger.debug(f"[daemon] status changed to 'dying', raising exception while waiting for {description}")
+				raise RuntimeError(STATUS.DYING)
+			await self.changes.wait()
+
+
+	def notify_changes(self, plugin_name: str = None, key: str = None) -> None:
+		if plugin_name is not None and key is not None:
+			for inhibitors in self.runlevel_inhibitors.values():
+				for inhibitor in inhibitors.values():
+					dependencies = inhibitor['dependencies']
+					if dependencies is None or f'{plugin_name}.{key}' in dependencies or f'*.{key}' in dependencies:
+						inhibitor['pending'] = True
+		changes, self.changes = self.changes, asyncio_Event()
+		changes.set()
 
 
 	async def runlevel_inhibitor_starting_plugins(self) -> bool:
@@ -305,22 +411,25 @@ class Daemon(object):
 
 
 	def on_plugin_callback(self, plugin: HAL9000_Plugin, key: str, old_value, new_value, phase: CommitPhase) -> bool:
-		log_function = logging_getLogger().info
+		log_level = logging_INFO
 		match self.plugins['brain'].runlevel:
 			case RUNLEVEL.STARTING:
-				log_function = logging_getLogger().debug
+				log_level = logging_DEBUG
 			case RUNLEVEL.SYNCING:
-				log_function = logging_getLogger().debug
+				log_level = logging_DEBUG
 			case RUNLEVEL.PREPARING:
-				log_function = logging_getLogger().debug
+				log_level = logging_DEBUG
 			case RUNLEVEL.RUNNING:
 				if plugin.module.hidden is True or (plugin.module.id == 'action:brain:default' and key == 'runlevel' and new_value == RUNLEVEL.RUNNING):
-					log_function = logging_getLogger().debug
+					log_level = logging_DEBUG
 		match phase:
 			case CommitPhase.REMOTE_REQUESTED:
-				log_function(f"[daemon] Plugin '{plugin.module.id}': {key} is requested to change from '{old_value}' to '{new_value}'")
+				self.logger.log(log_level, "[daemon] Plugin '{plugin}': {key} is requested to change from '{old_value}' to '{new_value}'",
+				                plugin=plugin.module.id, key=key, old_value=old_value, new_value=new_value)
 			case CommitPhase.COMMIT:
-				log_function(f"[daemon] Plugin '{plugin.module.id}': {key} changes from '{old_value}' to '{new_value}'")
+				self.logger.log(log_level, "[daemon] Plugin '{plugin}': {key} changes from '{old_value}' to '{new_value}'",
+				                plugin=plugin.module.id, key=key, old_value=old_value, new_value=new_value)
+				self.notify_changes(plugin.module.name, key)
 		return True
 
 
@@ -328,9 +437,12 @@ class Daemon(object):
 		self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt_subscriber() running")
 		try:
 			async for message in mqtt.messages:
+				if self.signal_queue.overflow == OVERFLOW.BLOCK:
+					await self.signal_queue.wait_for_space() # backpressure: stop reading MQTT messages while the signal queue is full
 				topic = message.topic.value
-				payload = message.payload.decode('utf-8', 'surrogateescape')
-				self.logger.debug(f"[daemon] MQTT received: {topic} => {str(chr(0x27))+str(chr(0x27)) if payload == '' else payload}")
+				message = TopicMessage(topic, message.payload) # parsed (lazily) only once for all triggers
+				payload = message.text
+				self.logger.debug("[daemon] MQTT received: {topic} => {payload}", topic=topic, payload=payload if payload != '' else "''")
 				match topic:
 					case 'hal9000/command/brain/runlevel':
 						match payload:
@@ -347,18 +459,21 @@ class Daemon(object):
 									self.plugins['brain'].status = payload
 					case other:
 						signals = {}
-						if topic in self.callbacks['mqtt']:
-							triggers = self.callbacks['mqtt'][topic]
-							if self.plugins['brain'].status == STATUS.ASLEEP:
-								triggers = [trigger for trigger in triggers if trigger.module.sleepless is True]
-							self.logger.debug(f"[daemon] TRIGGERS: {','.join(x.module.id for x in triggers)}")
-							self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt_subscriber() STATUS before triggers = " \
-							                                       f"{self.plugins}")
+						lane = LANE.INTERACTIVE if len(self.signal_lanes.match(topic, True)) > 0 else LANE.DEFAULT
+						asleep = self.plugins['brain'].status == STATUS.ASLEEP
+						triggers = self.callbacks['mqtt'].match(topic, asleep)
+						if len(triggers) > 0:
+							self.logger.debug("[daemon] TRIGGERS: {triggers}", triggers=lambda: ','.join(x.module.id for x in triggers))
+							self.logger.trace("[daemon] Daemon.task_mqtt_subscriber() STATUS before triggers = {plugins}", plugins=self.plugins)
+							if self.config['mqtt:trigger-regex-dispatch'] == 'combined' and len(triggers) > 1:
+								message.regex_matches = self.get_mqtt_regex_dispatcher(topic, asleep, triggers).match(message.text)
 							for trigger in triggers:
+								if message.regex_matches is not None and message.regex_matches.get(trigger.module.id, True) is None:
+									continue # a regex trigger (see HAL9000_Trigger.regex()) whose pattern didn't match
 								signal = trigger.handle(message)
 								if signal is not None and len(signal) > 0:
 									signals[trigger.module.id] = signal
-						self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt_subscriber() SIGNALS generated by TRIGGERS: {signals}")
+						self.logger.trace("[daemon] Daemon.task_mqtt_subscriber() SIGNALS generated by TRIGGERS: {signals}", signals=signals)
 						for trigger_id, signal in signals.items():
 							plugin_name = signal[0]
 							signal = signal[1]
@@ -366,10 +481,10 @@ class Daemon(object):
 								self.logger.warning(f"[daemon] SIGNAL for unknown plugin '{plugin_name}' " \
 								                    f"generated by trigger '{trigger_id}: '{signal}'")
 							else:
-								self.logger.debug(f"[daemon] SIGNAL for plugin '{plugin_name}' " \
-								                  f"generated by trigger '{trigger_id}': '{signal}'")
-								self.queue_signal(plugin_name, signal)
-						self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt_subscriber() STATUS after signals   = {self.plugins}")
+								self.logger.debug("[daemon] SIGNAL for plugin '{plugin}' generated by trigger '{trigger}': '{signal}'", \
+								                  plugin=plugin_name, trigger=trigger_id, signal=signal)
+								self.queue_signal(plugin_name, signal, lane)
+						self.logger.trace("[daemon] Daemon.task_mqtt_subscriber() STATUS after signals   = {plugins}", plugins=self.plugins)
 		except asyncio_CancelledError as e:
 			pass
 		except Exception as e:
@@ -381,12 +496,22 @@ class Daemon(object):
 			self.plugins['brain'].status = STATUS.DYING
 
 
+	def get_mqtt_regex_dispatcher(self, topic: str, asleep: bool, triggers: list) -> RegexDispatcher:
+		cached = self.mqtt_regex_dispatchers.get((topic, asleep))
+		if cached is None or cached[0] is not triggers: # a new list whenever the topic trie changed
+			if len(self.mqtt_regex_dispatchers) >= TopicTrie.CACHE_SIZE_MAX:
+				self.mqtt_regex_dispatchers.clear()
+			patterns = {trigger.module.id: trigger.regex() for trigger in triggers if trigger.regex() is not None}
+			cached = self.mqtt_regex_dispatchers[(topic, asleep)] = (triggers, RegexDispatcher(patterns))
+		return cached[1]
+
+
 	async def task_mqtt_publisher(self, mqtt: aiomqtt_Client) -> None:
 		self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt_publisher() running")
 		try:
 			while self.plugins['brain'].status != STATUS.DYING:
-				if self.mqtt_publish_queue.empty() is False:
-					data = await self.mqtt_publish_queue.get()
+				data = await self.mqtt_publish_queue.get() # blocks until a message is queued (no polling)
+				while True: # drains all pending messages, each is only taken off the queue right before it is published
 					if isinstance(data, dict) is True and 'topic' in data and 'payload' in data:
 						topic = data['topic']
 						payload = data['payload']
@@ -394,7 +519,12 @@ class Daemon(object):
 							payload = json_dumps(payload)
 						await mqtt.publish(topic, payload)
 						self.logger.debug(f"[daemon] MQTT published: {topic} => {str(chr(0x27))+str(chr(0x27)) if payload == '' else payload}")
-				await asyncio_sleep(0.01)
+					else:
+						self.logger.warning(f"[daemon] Ignoring invalid MQTT message '{str(data)}' from mqtt_publish_queue")
+					self.mqtt_publish_queue.task_done()
+					if self.mqtt_publish_queue.empty() is True:
+						break
+					data = self.mqtt_publish_queue.get_nowait() # (still) queued messages remain subject to coalescing
 		except asyncio_CancelledError as e:
 			pass
 		finally:
@@ -412,14 +542,16 @@ class Daemon(object):
 				self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt() MQTT.subscribe('hal9000/command/brain/status') for plugin 'brain'")
 				await mqtt.subscribe('hal9000/command/brain/runlevel')
 				await mqtt.subscribe('hal9000/command/brain/status')
-				for mqtt_topic, trigger in self.callbacks['mqtt'].items():
+				for mqtt_topic, triggers in self.callbacks['mqtt'].filters().items():
 					await mqtt.subscribe(mqtt_topic)
-					self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt() MQTT.subscribe('{mqtt_topic}') for trigger '{str(trigger)}'")
+					self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_mqtt() MQTT.subscribe('{mqtt_topic}') for triggers " \
+					                                       f"'{','.join(trigger.module.id for trigger in triggers)}'")
 				self.tasks['mqtt:publisher'] = asyncio_create_task(self.task_mqtt_publisher(mqtt))
 				self.tasks['mqtt:subscriber'] = asyncio_create_task(self.task_mqtt_subscriber(mqtt))
+				self.notify_changes()
 				try:
 					while self.plugins['brain'].status != STATUS.DYING:
-						await asyncio_sleep(0.1)
+						await self.changes.wait()
 				finally:
 					await mqtt.publish('hal9000/event/brain/runlevel', 'killed') # aiomqtt's will=... somehow doesn't work
 		except asyncio_CancelledError as e:
@@ -436,28 +568,23 @@ class Daemon(object):
 		self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_signal() running")
 		try:
 			while self.plugins['brain'].status != STATUS.DYING:
-				if self.signal_queue.empty() is False:
-					data = await self.signal_queue.get()
-					if isinstance(data, dict) is True and 'plugin' in data and 'signal' in data:
-						plugin = data['plugin']
-						signal = data['signal']
-						self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_signal() SIGNAL for plugin '{plugin}': '{signal}'")
-						if plugin == '*':
-							for plugin in self.plugins.keys():
-								try:
-									await self.plugins[plugin].signal(signal)
-								except Exception as e:
-									self.logger.error(f"[daemon] SIGNAL '{signal}' for plugin '{plugin}' raised an exception: {str(e)}")
-						elif plugin in self.plugins:
-							try:
-								await self.plugins[plugin].signal(signal)
-							except Exception as e:
-								self.logger.error(f"[daemon] SIGNAL '{signal}' for plugin '{plugin}' raised an exception: {str(e)}")
-						else:
-							self.logger.warning(f"[daemon] Ignoring SIGNAL for unknown plugin '{plugin}' - ignoring it (=> BUG)")
+				data = await self.signal_queue.get() # blocks until a signal is queued (no polling)
+				if isinstance(data, dict) is True and 'plugin' in data and 'signal' in data:
+					plugin = data['plugin']
+					signal = data['signal']
+					lane = data['lane']
+					SIGNAL_LANE.set(lane) # for inline dispatching
+					self.logger.log(Daemon.LOGLEVEL_TRACE, f"[daemon] Daemon.task_signal() SIGNAL for plugin '{plugin}': '{signal}'")
+					if plugin == '*':
+						for plugin in list(self.plugins.keys()):
+							await self.dispatch_signal(plugin, signal.copy(), lane) # the handlers of different plugins run concurrently
+					elif plugin in self.plugins:
+						await self.dispatch_signal(plugin, signal, lane)
 					else:
-						self.logger.warning(f"[daemon] Ignoring invalid SIGNAL '{str(signal)}' from signal_queue")
-				await asyncio_sleep(0.01)
+						self.logger.warning(f"[daemon] Ignoring SIGNAL for unknown plugin '{plugin}' - ignoring it (=> BUG)")
+				else:
+					self.logger.warning(f"[daemon] Ignoring invalid SIGNAL '{str(data)}' from signal_queue")
+				self.signal_queue.task_done()
 		except asyncio_CancelledError as e:
 			self.signal_queue = None
 		except Exception as e:
@@ -471,8 +598,63 @@ class Daemon(object):
 			self.plugins['brain'].status = STATUS.DYING
 
 
-	async def on_scheduler(self, plugin: str, signal: dict) -> None:
-		self.queue_signal(plugin, signal)
+	async def dispatch_signal(self, plugin: str, signal: Signal, lane: LANE = LANE.DEFAULT) -> None:
+		if self.config.get('signals:dispatch', 'workers') == 'workers':
+			module = self.plugins[plugin].module
+			if len(module.callbacks_signal) == 0 and len(module.callbacks_signal_keys) == 0:
+				return
+			if self.get_signal_worker(plugin).put(signal, lane) is False:
+				self.logger.warning(f"[daemon] Overflow of signal queue for plugin '{plugin}' (signal-queue-limit reached) at SIGNAL '{signal}'")
+			return
+		try:
+			await self.plugins[plugin].signal(signal)
+		except Exception as e:
+			self.logger.error(f"[daemon] SIGNAL '{signal}' for plugin '{plugin}' raised an exception: {str(e)}")
+
+
+	def get_signal_worker(self, plugin: str) -> SignalWorker:
+		worker = self.signal_workers.get(plugin)
+		if worker is None:
+			worker = SignalWorker(self.plugins[plugin], \
+			                      self.config.get(f'signals:{plugin}:queue-limit', self.config.get('signals:queue-limit', SignalWorker.QUEUE_LIMIT)), \
+			                      self.config.get(f'signals:{plugin}:handler-timeout', self.config.get('signals:handler-timeout', SignalWorker.HANDLER_TIMEOUT)), \
+			                      self.config.get(f'signals:{plugin}:queue-overflow', self.config.get('signals:queue-overflow', SignalWorker.QUEUE_OVERFLOW)), \
+			                      self.signal_queue.coalesce)
+			self.signal_workers[plugin] = worker
+			self.tasks[f'signals:{plugin}'] = asyncio_create_task(worker.run())
+		return worker
+
+
+	def get_signal_coalesce_key(self, data: dict) -> tuple | None:
+		path = data['signal'].path()
+		family = path
+		while family != '':
+			if family in self.signal_coalesce:
+				return data.get('plugin'), path, data['lane']
+			family = family.rpartition('/')[0]
+		return None
+
+
+	def get_mqtt_publish_coalesce_key(self, message: dict) -> tuple | None:
+		if len(self.mqtt_publish_coalesce.match(message['topic'])) > 0:
+			return message['topic'], message['payload'] in [None, ''] # requests (empty payload) only supersede requests
+		return None
+
+
+	def get_metrics(self) -> dict:
+		metrics = {'queues': {'signal': self.signal_queue.get_metrics(), 'mqtt-publish': self.mqtt_publish_queue.get_metrics()}, 'signals': {}, \
+		           'timers': self.timers.get_metrics(), 'network': self.network.get_metrics()}
+		for plugin, worker in self.signal_workers.items():
+			metrics['signals'][plugin] = worker.get_metrics()
+		return metrics
+
+
+	async def on_scheduler(self, plugin: str, signal: Signal) -> None:
+		self.queue_signal(plugin, signal, LANE.BACKGROUND)
+
+
+	def on_timer(self, plugin: str, signal: Signal) -> None:
+		self.queue_signal(plugin, signal, LANE.BACKGROUND)
 
 
 	def import_plugin(self, plugin_name: str, class_name: str) -> HAL9000_Plugin:
@@ -486,59 +668,60 @@ class Daemon(object):
 		self.logger.log(logging_getLevelNamesMapping().get(level.upper(), 'ERROR'), f"[daemon] ERROR #{id}: {title} => {details}")
 		if self.plugins['brain'].runlevel == RUNLEVEL.RUNNING and self.plugins['brain'].status == STATUS.AWAKE:
 			url = self.substitute_vars(self.config['help:error-url'], {'error_id': id})
-			self.queue_signal('*', {'error': {'id': id, 'url': url, 'title': title, 'details': details}})
+			self.queue_signal('*', {'error': {'id': id, 'url': url, 'title': title, 'details': details}}, LANE.BACKGROUND)
 
 
-	def queue_signal(self, plugin: str, signal: dict) -> None:
+	def queue_signal(self, plugin: str, signal: Signal | dict, lane: LANE | None = None) -> None:
+		signal = Signal.from_dict(signal) # plain dicts (from triggers and configured menu actions) are classified once here
 		if self.logger.isEnabledFor(Daemon.LOGLEVEL_TRACE) is True:
 			self.add_caller_trace(signal)
-		self.signal_queue.put_nowait({'plugin': plugin, 'signal': signal})
+		if lane is None:
+			lane = SIGNAL_LANE.get() # inherited from the signal (if any) that is currently being handled
+		self.signal_queue.put_nowait({'plugin': plugin, 'signal': signal, 'lane': lane})
 
 
-	def create_scheduled_signal(self, seconds: float, plugin: str, signal: dict, id: str | None = None, mode: str = 'single') -> None:
+	def create_scheduled_signal(self, seconds: float, plugin: str, signal: Signal | dict, id: str | None = None, mode: str = 'single') -> None:
+		signal = Signal.from_dict(signal)
 		if self.logger.isEnabledFor(Daemon.LOGLEVEL_TRACE) is True:
 			self.add_caller_trace(signal, f"scheduled as '{mode}' with id='{id}'")
 		match mode:
 			case 'single':
-				run_date = datetime_datetime.now() + datetime_timedelta(seconds=int(seconds), microseconds=int((seconds - int(seconds)) * 1000000))
-				self.scheduler.add_job(self.on_scheduler, 'date', run_date=run_date, args=[plugin, signal], id=id, name=id, replace_existing=True)
+				self.timers.schedule(seconds, plugin, signal, id)
 			case 'interval':
-				self.scheduler.add_job(self.on_scheduler, 'interval', seconds=int(seconds), args=[plugin, signal], id=id, name=id, replace_existing=True)
+				self.timers.schedule(seconds, plugin, signal, id, True)
 			case 'cron':
 				hour=int(seconds/3600)
 				minute=int((seconds%3600)/60)
 				self.scheduler.add_job(self.on_scheduler, 'cron', hour=hour, minute=minute, args=[plugin, signal], id=id, name=id, replace_existing=True)
 			case other:
-				logging_getLogger().error(f"unsupported schedule mode '{mode}' in Daemon.create_scheduled_signal()")
+				self.logger.error(f"[daemon] unsupported schedule mode '{mode}' in Daemon.create_scheduled_signal()")
 
 
 	def remove_scheduled_signal(self, id: str) -> None:
+		if self.timers.cancel(id) is True:
+			return
 		if self.scheduler.get_job(id) is not None:
 			self.scheduler.remove_job(id)
 
 
 	async def get_system_ipv4(self) -> str:
-		bus = await MessageBus(None, BusType.SYSTEM, AuthExternal(UID_NOT_SPECIFIED)).connect()
-		introspection = await bus.introspect('org.freedesktop.NetworkManager', '/org/freedesktop/NetworkManager')
-		obj = bus.get_proxy_object('org.freedesktop.NetworkManager', '/org/freedesktop/NetworkManager', introspection)
-		nm = obj.get_interface('org.freedesktop.NetworkManager')
-		for connection in await nm.get_active_connections():
-			introspection2 = await bus.introspect('org.freedesktop.NetworkManager', connection)
-			obj2 = bus.get_proxy_object('org.freedesktop.NetworkManager', connection, introspection2)
-			conf = obj2.get_interface('org.freedesktop.NetworkManager.Connection.Active')
-			if await conf.get_default() is True:
-				ip4config = await conf.get_ip4_config()
-				introspection3 = await bus.introspect('org.freedesktop.NetworkManager', ip4config)
-				obj3 = bus.get_proxy_object('org.freedesktop.NetworkManager', ip4config, introspection3)
-				data= obj3.get_interface('org.freedesktop.NetworkManager.IP4Config')
-				address_data = await data.get_address_data()
-				return address_data[0]['address'].value
-		return '127.0.0.1'
+		return await self.network.get_ipv4()
 
 
 	def on_posix_signal(self, number: int, frame) -> None:
-		logging_getLogger().info(f"[Daemon] Received signal {number} ({signal_strsignal(number).upper()}), preparing to exit")
+		self.logger.info(f"[daemon] Received signal {number} ({signal_strsignal(number).upper()}), preparing to exit")
 		self.plugins['brain'].status = STATUS.DYING
+		try:
+			asyncio_get_running_loop().call_soon_threadsafe(lambda: None) # wake up the event loop (posix signal handlers don't)
+		except RuntimeError:
+			pass
+
+
+	def on_posix_signal_dump(self, number: int, frame) -> None:
+		count = RingBufferHandler.dump_all()
+		self.logger.info("[daemon] Received signal {number} ({name}), dumped {count} buffered log records",
+		                 number=number, name=lambda: signal_strsignal(number).upper(), count=count)
+		self.logger.info("[daemon] METRICS = {metrics}", metrics=lambda: json_dumps(self.get_metrics()))
 
 
 	def __repr__(self) -> str:
@@ -550,35 +733,44 @@ class Daemon(object):
 		return ', '.join(result)
 
 
+	def compile_template(self, data: Any) -> Template:
+		return Template(data, self.logger)
+
+
 	def substitute_vars(self, data: Any, vars: dict) -> Any:
-		try:
-			if isinstance(data, list) is True:
-				for index, value in enumerate(data):
-					data[index] = self.substitute_vars(value, vars)
-			if isinstance(data, dict) is True:
-				for key, value in data.items():
-					data[key] = self.substitute_vars(value, vars)
-			if isinstance(data, str) is True:
-				data = data.format(**vars)
-		except KeyError as e:
-			if str(e).isidentifier() is True:
-				logging_getLogger().warn(f"encountered unknown variable '{str(e)}' during substition")
-				logging_getLogger().debug(f"substition data (type={type(data)}): {str(data)}")
-				logging_getLogger().debug(f"substition vars (type={type(vars)}): {str(vars)}")
-		return data
+		# returns a new structure (data is not modified); templates that are used repeatedly should be compiled once
+		# with compile_template() by the caller, only (configured) strings are compiled once here
+		if isinstance(data, str) is True:
+			template = self.templates.get(data)
+			if template is None:
+				template = self.templates[data] = self.compile_template(data)
+			return template.render(vars)
+		return self.compile_template(data).render(vars)
 
 
 	def add_caller_trace(self, signal: dict, trace_notice: str = '', stack_offset: int = 2) -> None:
 		if isinstance(signal, dict) is True:
-			stack = inspect_stack()
-			if stack_offset < len(stack):
-				fi = stack.pop(stack_offset)
-				caller = fi.function
-				if 'self' in fi.frame.f_locals:
-					if hasattr(fi.frame.f_locals['self'], 'module'):
-						caller = f"{fi.frame.f_locals['self'].module.id}<{fi.function}>"
-				signal['trace'] = caller
-				if trace_notice != '':
-					signal['trace'] += f' ({trace_notice})'
-			del stack # cycle breaking for GC
+			sampling = self.trace_sampling
+			sampling['credit'] += sampling['rate']
+			if sampling['credit'] < 1.0:
+				sampling['skipped'] += 1
+				return
+			sampling['credit'] -= 1.0
+			start = time_perf_counter()
+			try:
+				frame = sys_getframe(stack_offset) # only the caller's frame, no source (line) lookups like inspect.stack()
+			except ValueError:
+				return
+			code = frame.f_code
+			caller = code.co_name
+			if code.co_argcount > 0 and code.co_varnames[0] == 'self':
+				instance = frame.f_locals.get('self')
+				if hasattr(instance, 'module') is True:
+					caller = f"{instance.module.id}<{code.co_name}>"
+			del frame # cycle breaking for GC
+			signal['trace'] = caller
+			if trace_notice != '':
+				signal['trace'] += f' ({trace_notice})'
+			sampling['traced'] += 1
+			sampling['seconds'] += time_perf_counter() - start
 
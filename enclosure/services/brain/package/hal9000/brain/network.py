@@ -0,0 +1,116 @@
+from asyncio import Lock as asyncio_Lock, \
+                    create_task as asyncio_create_task
+
+from dbus_fast import Message, MessageType
+from dbus_fast.aio import MessageBus
+from dbus_fast.auth import AuthExternal, UID_NOT_SPECIFIED
+from dbus_fast.constants import BusType
+
+from hal9000.logger import Logger
+
+
+class SystemNetwork(object):
+	# one long-lived system bus connection to NetworkManager: the IPv4 address of the default connection is looked up
+	# once and cached, NetworkManager's PropertiesChanged signals (of any of its objects) mark it for a refresh
+	SERVICE = 'org.freedesktop.NetworkManager'
+	PATH = '/org/freedesktop/NetworkManager'
+	IPV4_FALLBACK = '127.0.0.1'
+	PROPERTIES = frozenset(['ActiveConnections', 'PrimaryConnection', 'Default', 'Ip4Config', 'AddressData'])
+
+	def __init__(self, logger: Logger) -> None:
+		self.logger = logger
+		self.bus = None
+		self.introspections = {}
+		self.lock = asyncio_Lock()
+		self.refresh_task = None
+		self.ipv4 = None
+		self.stale = False
+		self.metrics = {'connects': 0, 'lookups': 0, 'refreshes': 0, 'changes': 0}
+
+
+	async def get_bus(self) -> MessageBus:
+		if self.bus is None or self.bus.connected is False:
+			self.introspections.clear()
+			self.ipv4 = None
+			self.bus = await MessageBus(None, BusType.SYSTEM, AuthExternal(UID_NOT_SPECIFIED)).connect()
+			self.bus.add_message_handler(self.on_message)
+			await self.bus.call(Message(destination='org.freedesktop.DBus', path='/org/freedesktop/DBus', interface='org.freedesktop.DBus',
+			                            member='AddMatch', signature='s',
+			                            body=[f"type='signal',sender='{SystemNetwork.SERVICE}'," \
+			                                  f"interface='org.freedesktop.DBus.Properties',member='PropertiesChanged'"]))
+			self.metrics['connects'] += 1
+		return self.bus
+
+
+	def shutdown(self) -> None:
+		if self.refresh_task is not None:
+			self.refresh_task.cancel()
+		if self.bus is not None:
+			self.bus.disconnect()
+		self.bus = None
+		self.ipv4 = None
+
+
+	def on_message(self, message: Message) -> None:
+		if message.message_type == MessageType.SIGNAL and message.member == 'PropertiesChanged' \
+		   and message.path is not None and message.path.startswith(SystemNetwork.PATH):
+			interface, changed, invalidated = message.body
+			if SystemNetwork.PROPERTIES.isdisjoint(changed.keys()) is False or SystemNetwork.PROPERTIES.isdisjoint(invalidated) is False:
+				self.metrics['changes'] += 1
+				self.stale = True
+				if self.ipv4 is not None and self.lock.locked() is False:
+					self.refresh_task = asyncio_create_task(self.refresh_background())
+
+
+	async def get_ipv4(self) -> str:
+		self.metrics['lookups'] += 1
+		if self.ipv4 is None or self.bus is None or self.bus.connected is False:
+			return await self.refresh()
+		return self.ipv4
+
+
+	async def refresh(self) -> str:
+		async with self.lock:
+			self.stale = True
+			while self.stale is True: # changes signalled during the lookup require another lookup
+				self.stale = False
+				ipv4 = await self.lookup_ipv4(await self.get_bus())
+				self.metrics['refreshes'] += 1
+			self.ipv4 = ipv4
+			self.logger.debug(f"[network] IPv4 address of default connection: {self.ipv4}")
+			return self.ipv4
+
+
+	async def refresh_background(self) -> None:
+		try:
+			await self.refresh()
+		except Exception as e:
+			self.ipv4 = None # next lookup retries (and reports the error to its caller)
+			self.logger.warning(f"[network] refreshing IPv4 address failed: {type(e).__name__} => {str(e)}")
+
+
+	async def get_interface(self, bus: MessageBus, kind: str, path: str, interface: str):
+		# introspection data is identical for all objects of a kind (active connections, IP4 configs): introspected once
+		introspection = self.introspections.get(kind)
+		if introspection is None:
+			introspection = await bus.introspect(SystemNetwork.SERVICE, path)
+			self.introspections[kind] = introspection
+		return bus.get_proxy_object(SystemNetwork.SERVICE, path, introspection).get_interface(interface)
+
+
+	async def lookup_ipv4(self, bus: MessageBus) -> str:
+		nm = await self.get_interface(bus, 'manager', SystemNetwork.PATH, 'org.freedesktop.NetworkManager')
+		for connection in await nm.get_active_connections():
+			conf = await self.get_interface(bus, 'active-connection', connection, 'org.freedesktop.NetworkManager.Connection.Active')
+			if await conf.get_default() is True:
+				ip4config = await conf.get_ip4_config()
+				data = await self.get_interface(bus, 'ip4config', ip4config, 'org.freedesktop.NetworkManager.IP4Config')
+				address_data = await data.get_address_data()
+				if len(address_data) > 0:
+					return address_data[0]['address'].value
+		return SystemNetwork.IPV4_FALLBACK
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, connected=self.bus is not None and self.bus.connected is True, ipv4=self.ipv4)
+
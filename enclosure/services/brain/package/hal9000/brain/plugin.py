@@ -2,9 +2,12 @@ from __future__ import annotations
 from enum import Enum as enum_Enum, \
                  StrEnum as enum_StrEnum
 from typing import Callable as typing_Callable
+from re import Pattern as re_Pattern
 from configparser import ConfigParser as configparser_ConfigParser
 from logging import getLogger as logging_getLogger
-from aiomqtt import Message as aiomqtt_Message
+
+from .topic import TopicMessage
+from .signals import Signal
 
 
 class RUNLEVEL(enum_StrEnum):
@@ -14,6 +17,8 @@ class RUNLEVEL(enum_StrEnum):
 	RUNNING   = "running"
 	KILLED    = "killed"
 
+RUNLEVEL_VALUES = frozenset(RUNLEVEL)
+
 
 class CommitPhase(enum_Enum):
 	LOCAL_REQUESTED = 0
@@ -25,6 +30,8 @@ class DataInvalid(enum_StrEnum):
 	UNINITIALIZED = '<uninitialized>'
 	UNKNOWN       = '<unknown>'
 
+DATAINVALID_VALUES = frozenset(DataInvalid)
+
 
 class SPECIAL_NAMES(enum_StrEnum):
 	DATA = 'module'
@@ -32,6 +39,10 @@ class SPECIAL_NAMES(enum_StrEnum):
 	REMOTES = 'remotes'
 	CALLBACKS_NAME = 'callbacks_name'
 	CALLBACKS_SIGNAL = 'callbacks_signal'
+	CALLBACKS_DISPATCH = 'callbacks_dispatch'
+	CALLBACKS_SIGNAL_KEYS = 'callbacks_signal_keys'
+
+SPECIAL_NAMES_VALUES = frozenset(SPECIAL_NAMES)
 
 
 class HAL9000_Plugin_Module(object):
@@ -45,18 +56,21 @@ class HAL9000_Plugin(object):
 		self.module.id = id
 		self.module.hidden = kwargs.get('hidden', False)
 		self.module.daemon = kwargs.get('daemon')
-		self.module.daemon.plugins[id.split(':',2).pop(1) if id.endswith(':default') else id.split(':',2).pop(0)] = self
-		self.module.locals = ['runlevel', 'status']
-		self.module.locals.extend(kwargs.get('locals', []))
+		self.module.name = id.split(':',2).pop(1) if id.endswith(':default') else id.split(':',2).pop(0)
+		self.module.daemon.plugins[self.module.name] = self
+		self.module.locals = dict.fromkeys(['runlevel', 'status'])
+		self.module.locals.update(dict.fromkeys(kwargs.get('locals', [])))
 		self.module.remotes = {}
 		self.module.remotes.update({x: DataInvalid.UNINITIALIZED for x in kwargs.get('remotes', [])})
-		for name in self.module.locals + list(self.module.remotes.keys()):
+		for name in list(self.module.locals.keys()) + list(self.module.remotes.keys()):
 			super().__setattr__(name, kwargs.get(name, DataInvalid.UNINITIALIZED))
 		for name, value in kwargs.items():
 			if name in self.module.locals or name in self.module.remotes:
 				super().__setattr__(name, value)
 		self.module.callbacks_name = {'*': set()}
+		self.module.callbacks_dispatch = {'*': tuple()}
 		self.module.callbacks_signal = set()
+		self.module.callbacks_signal_keys = {}
 
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
@@ -65,14 +79,14 @@ class HAL9000_Plugin(object):
 
 	def addLocalNames(self, locals: list) -> None:
 		for local in locals:
-			if local not in list(SPECIAL_NAMES):
-				self.module.locals.append(local)
+			if local not in SPECIAL_NAMES_VALUES:
+				self.module.locals[local] = None
 				super().__setattr__(local, DataInvalid.UNINITIALIZED)
 
 
 	def addRemoteNames(self, remotes: list) -> None:
 		for remote in remotes:
-			if remote not in list(SPECIAL_NAMES):
+			if remote not in SPECIAL_NAMES_VALUES:
 				self.module.remotes[remote] = DataInvalid.UNINITIALIZED
 				super().__setattr__(remote, DataInvalid.UNINITIALIZED)
 
@@ -95,23 +109,52 @@ class HAL9000_Plugin(object):
 		if name not in self.module.callbacks_name:
 			self.module.callbacks_name[name] = set()
 		self.module.callbacks_name[name].add(callback)
+		self.updateNameCallbacks()
 
 
 	def delNameCallback(self, callback: typing_Callable[[str, str, str, bool], bool], name: str = '*') -> None:
 		if name in self.module.callbacks_name:
 			self.module.callbacks_name[name].remove(callback)
+			self.updateNameCallbacks()
 
 
-	def addSignalHandler(self, callback: typing_Callable[[HAL9000_Plugin_Data, dict], None]) -> None:
-		self.module.callbacks_signal.add(callback)
+	def updateNameCallbacks(self) -> None:
+		callbacks_any = tuple(self.module.callbacks_name['*'])
+		self.module.callbacks_dispatch = {'*': callbacks_any}
+		for name, callbacks in self.module.callbacks_name.items():
+			if name != '*':
+				self.module.callbacks_dispatch[name] = callbacks_any + tuple(callbacks)
 
 
-	def delSignalHandler(self, callback: typing_Callable[[HAL9000_Plugin_Data, dict], None], name: str = '*') -> None:
-		self.module.callbacks_signal.remove(callback)
+	def addSignalHandler(self, callback: typing_Callable[[HAL9000_Plugin_Data, dict], None], keys: list | None = None) -> None:
+		if keys is None:
+			self.module.callbacks_signal.add(callback)
+			return
+		for key in keys:
+			if key not in self.module.callbacks_signal_keys:
+				self.module.callbacks_signal_keys[key] = set()
+			self.module.callbacks_signal_keys[key].add(callback)
 
 
-	async def signal(self, signal: dict) -> None:
-		for callback in self.module.callbacks_signal:
+	def delSignalHandler(self, callback: typing_Callable[[HAL9000_Plugin_Data, dict], None], keys: list | None = None) -> None:
+		if keys is None:
+			self.module.callbacks_signal.remove(callback)
+			return
+		for key in keys:
+			if key in self.module.callbacks_signal_keys:
+				self.module.callbacks_signal_keys[key].discard(callback)
+				if len(self.module.callbacks_signal_keys[key]) == 0:
+					del self.module.callbacks_signal_keys[key]
+
+
+	async def signal(self, signal: Signal | dict) -> None:
+		signal = Signal.from_dict(signal)
+		callbacks = dict.fromkeys(self.module.callbacks_signal) # catch-all handlers (registered without keys)
+		if len(self.module.callbacks_signal_keys) > 0:
+			for key in signal.keys():
+				if key in self.module.callbacks_signal_keys:
+					callbacks.update(dict.fromkeys(self.module.callbacks_signal_keys[key]))
+		for callback in callbacks:
 			await callback(self, signal)
 
 
@@ -123,63 +166,56 @@ class HAL9000_Plugin(object):
 
 
 	def __setattr__(self, name: str, new_value) -> None:
-		if name in list(SPECIAL_NAMES):
+		if name in SPECIAL_NAMES_VALUES:
 			super().__setattr__(name, new_value)
 			return
-		if name not in self.module.locals and name not in self.module.remotes:
+		module = self.module
+		is_remote = name in module.remotes
+		if is_remote is False and name not in module.locals:
 			raise Exception(f"HAL9000_Plugin_Data.__setattr__('{name}', '{new_value}'): '{name}' is not a registered attribute name")
 		commit_phase = CommitPhase.LOCAL_REQUESTED
-		if name in self.module.remotes:
-			if new_value == self.module.remotes[name]:
-				commit_phase = CommitPhase.COMMIT
 		if isinstance(new_value, tuple) is True:
 			if len(new_value) != 2:
 				raise Exception(f"HAL9000_Plugin_Data.__setattr__('{name}', '{new_value}'): valid tuples must be a value as the 1st item and " \
 				                f"either CommitPhase.REMOTE_REQUESTED or CommitPhase.COMMIT as the 2nd item")
-			if new_value[1] not in CommitPhase:
+			if isinstance(new_value[1], CommitPhase) is False:
 				raise Exception(f"HAL9000_Plugin_Data.__setattr__('{name}', '{new_value}'): 2nd item of tuple must be of enum CommitPhase")
 			commit_phase = new_value[1]
 			new_value = new_value[0]
-		old_value = DataInvalid.UNINITIALIZED
-		if hasattr(self, name) is True:
-			old_value = getattr(self, name)
+		elif is_remote is True and new_value == module.remotes[name]:
+			commit_phase = CommitPhase.COMMIT
+		old_value = self.__dict__.get(name, DataInvalid.UNINITIALIZED)
 		if new_value is None:
 			new_value = DataInvalid.UNINITIALIZED
 		if old_value != new_value:
+			callbacks = module.callbacks_dispatch.get(name, module.callbacks_dispatch['*'])
 			if commit_phase == CommitPhase.LOCAL_REQUESTED:
 				commit_value = True
-				for callback_name in ['*', name]:
-					if callback_name in self.module.callbacks_name:
-						for callback in self.module.callbacks_name[callback_name]:
-							result = callback(self, name, old_value, new_value, CommitPhase.LOCAL_REQUESTED)
-							if result is None:
-								raise Exception(f"HAL9000_Plugin_Data.__setattr__('{name}', '{new_value}'): a registerd callback " \
-								                f"returned <None> instead of a boolean value (BUG!) => {callback}")
-							if result is False:
-								from hal9000.brain.daemon import Daemon # late import due to partially initialized module (circular imports)
-								log_func = self.module.daemon.logger.debug
-								if self.module.daemon.plugins['brain'].runlevel == RUNLEVEL.RUNNING:
-									log_func = self.module.daemon.logger.info
-								log_func(f"[{self.module.id}] callback '{callback.__self__.module.id}<{callback.__func__.__name__}>' " \
-								         f"declined change of {name} from '{old_value}' to '{new_value}'")
-							commit_value &= result
+				for callback in callbacks:
+					result = callback(self, name, old_value, new_value, CommitPhase.LOCAL_REQUESTED)
+					if result is None:
+						raise Exception(f"HAL9000_Plugin_Data.__setattr__('{name}', '{new_value}'): a registerd callback " \
+						                f"returned <None> instead of a boolean value (BUG!) => {callback}")
+					if result is False:
+						log_func = module.daemon.logger.debug
+						if module.daemon.plugins['brain'].runlevel == RUNLEVEL.RUNNING:
+							log_func = module.daemon.logger.info
+						log_func(f"[{module.id}] callback '{callback.__self__.module.id}<{callback.__func__.__name__}>' " \
+						         f"declined change of {name} from '{old_value}' to '{new_value}'")
+					commit_value &= result
 				if commit_value is True:
-					commit_phase = CommitPhase.COMMIT if name not in self.module.remotes else CommitPhase.REMOTE_REQUESTED
+					commit_phase = CommitPhase.COMMIT if is_remote is False else CommitPhase.REMOTE_REQUESTED
 			if commit_phase == CommitPhase.REMOTE_REQUESTED:
-				if name in self.module.remotes:
-					self.module.remotes[name] = new_value
-					for callback_name in ['*', name]:
-						if callback_name in self.module.callbacks_name:
-							for callback in self.module.callbacks_name[callback_name]:
-								callback(self, name, old_value, new_value, CommitPhase.REMOTE_REQUESTED)
+				if is_remote is True:
+					module.remotes[name] = new_value
+					for callback in callbacks:
+						callback(self, name, old_value, new_value, CommitPhase.REMOTE_REQUESTED)
 			if commit_phase == CommitPhase.COMMIT:
 				super().__setattr__(name, new_value)
-				if name in self.module.remotes:
-					self.module.remotes[name] = new_value
-				for callback_name in ['*', name]:
-					if callback_name in self.module.callbacks_name:
-						for callback in self.module.callbacks_name[callback_name]:
-							callback(self, name, old_value, new_value, CommitPhase.COMMIT)
+				if is_remote is True:
+					module.remotes[name] = new_value
+				for callback in callbacks:
+					callback(self, name, old_value, new_value, CommitPhase.COMMIT)
 
 
 	def __repr__(self) -> str:
@@ -223,6 +259,12 @@ class HAL9000_Trigger(HAL9000_Plugin):
 		self.module.sleepless = configuration.getboolean(section_name, 'sleepless', fallback=False)
 
 
-	def handle(self, module: aiomqtt_Message) -> dict:
+	def regex(self) -> re_Pattern | None:
+		# a trigger that never creates a signal unless its payload regex matches returns that regex: the daemon may
+		# then match it combined with the other triggers of a topic (see TopicMessage.regex_matches) and skip handle()
+		return None
+
+
+	def handle(self, message: TopicMessage) -> dict:
 		return {}
 
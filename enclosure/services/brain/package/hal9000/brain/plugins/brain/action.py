@@ -1,10 +1,12 @@
 from typing import Any
 from enum import StrEnum as enum_StrEnum
-from os.path import exists as os_path_exists
+from asyncio import create_task as asyncio_create_task
 from configparser import ConfigParser as configparser_ConfigParser
 from logging import getLogger as logging_getLogger
 
-from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, CommitPhase, DataInvalid
+from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, CommitPhase, DataInvalid, DATAINVALID_VALUES
+from hal9000.brain.signals import Signal, TAG, LANE
+from .timesync import TimeSyncWatcher
 
 
 class STATUS(enum_StrEnum):
@@ -29,21 +31,28 @@ class Action(HAL9000_Action):
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
-		self.addSignalHandler(self.on_brain_signal)
+		self.addSignalHandler(self.on_brain_signal, ['runlevel', 'status', 'time'])
 		self.addNameCallback(self.on_brain_runlevel_callback, 'runlevel')
 		self.addNameCallback(self.on_brain_status_callback, 'status')
 		self.addNameCallback(self.on_brain_time_callback, 'time')
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'brain: brain.time==unknown', self.runlevel_inhibitor_syncing_time)
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'brain: brain.time==unknown', self.runlevel_inhibitor_syncing_time, ['brain.time'])
+		self.module.config['time-sync-watcher'] = configuration.getstring(section_name, 'time-sync-watcher', fallback='auto')
+		if self.module.config['time-sync-watcher'] not in ['auto'] + TimeSyncWatcher.METHODS:
+			self.module.daemon.logger.warning(f"[brain] invalid value '{self.module.config['time-sync-watcher']}' for 'time-sync-watcher' " \
+			                                  f"in section '{section_name}', using 'auto' instead")
+			self.module.config['time-sync-watcher'] = 'auto'
+		self.module.timesync = TimeSyncWatcher(self.on_brain_timesync, self.module.daemon.logger, self.module.config['time-sync-watcher'],
+		                                       get_bus=self.module.daemon.network.get_bus)
 
 
 	async def runlevel_inhibitor_syncing_time(self) -> bool:
-		if self.time in list(DataInvalid):
+		if self.time in DATAINVALID_VALUES:
 			return False
 		return True
 
 
-	async def on_brain_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
-		if 'runlevel' in signal:
+	async def on_brain_signal(self, plugin: HAL9000_Plugin, signal: Signal) -> None:
+		if TAG.RUNLEVEL in signal.tags:
 			match self.runlevel:
 				case RUNLEVEL.STARTING | RUNLEVEL.SYNCING | RUNLEVEL.PREPARING:
 					self.runlevel = signal['runlevel']
@@ -52,18 +61,25 @@ class Action(HAL9000_Action):
 					                                f"(current runlevel='{RUNLEVEL.RUNNING}')")
 				case other:
 					self.module.daemon.logger.error(f"[brain] unexpected current runlevel '{self.runlevel}'")
-		if 'status' in signal:
+		if TAG.STATUS in signal.tags:
 			match self.status:
 				case STATUS.LAUNCHING | STATUS.AWAKE | STATUS.ASLEEP:
 					self.status = signal['status']
 				case STATUS.DYING:
 					pass
-		if 'time' in signal:
-			match os_path_exists('/run/systemd/timesync/synchronized'):
-				case True:
-					self.time = Action.TIME_SYNCHRONIZED
-				case False:
-					self.time = Action.TIME_UNSYNCHRONIZED
+		if TAG.TIME in signal.tags:
+			if isinstance(signal['time'], dict) is True and 'synced' in signal['time']:
+				match signal['time']['synced']:
+					case True:
+						self.time = Action.TIME_SYNCHRONIZED
+					case False:
+						self.time = Action.TIME_UNSYNCHRONIZED
+			elif 'brain:timesync' not in self.module.daemon.tasks:
+				self.module.daemon.tasks['brain:timesync'] = asyncio_create_task(self.module.timesync.run())
+
+
+	def on_brain_timesync(self, synced: bool) -> None:
+		self.module.daemon.queue_signal('brain', {'time': {'synced': synced}}, LANE.BACKGROUND)
 
 
 	def on_brain_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
@@ -86,7 +102,8 @@ class Action(HAL9000_Action):
 						self.module.daemon.logger.info(f"[brain] preventing (invalid) change of runlevel from '{old_runlevel}' to '{new_runlevel}'")
 						return False
 			case CommitPhase.COMMIT:
-				self.module.daemon.logger.debug(f"[brain] STATUS at runlevel change from '{old_runlevel}' to '{new_runlevel}': {self.module.daemon}")
+				self.module.daemon.logger.debug("[brain] STATUS at runlevel change from '{old_runlevel}' to '{new_runlevel}': {daemon}",
+				                                old_runlevel=old_runlevel, new_runlevel=new_runlevel, daemon=self.module.daemon)
 				self.module.daemon.mqtt_publish_queue.put_nowait({'topic': f'hal9000/event/brain/runlevel', 'payload': new_runlevel})
 		return True
 
@@ -98,7 +115,8 @@ class Action(HAL9000_Action):
 					self.module.daemon.logger.info(f"[brain] inhibiting change from status '{old_status}' to '{new_status}'")
 					return False
 			case CommitPhase.COMMIT:
-				self.module.daemon.logger.debug(f"[brain] STATUS at status change from '{old_status}' to '{new_status}': {self.module.daemon}")
+				self.module.daemon.logger.debug("[brain] STATUS at status change from '{old_status}' to '{new_status}': {daemon}",
+				                                old_status=old_status, new_status=new_status, daemon=self.module.daemon)
 				self.module.daemon.mqtt_publish_queue.put_nowait({'topic': f'hal9000/event/brain/status', 'payload': new_status})
 		return True
 
@@ -109,11 +127,5 @@ class Action(HAL9000_Action):
 				if new_time not in [Action.TIME_UNSYNCHRONIZED, Action.TIME_SYNCHRONIZED]:
 					self.module.daemon.logger.info(f"[brain] inhibiting change from time '{old_time}' to '{new_time}'")
 					return False
-			case CommitPhase.COMMIT:
-				match new_time:
-					case Action.TIME_UNSYNCHRONIZED:
-						self.module.daemon.create_scheduled_signal(   1, 'brain', {'time': {}}, 'scheduler://brain/time', 'interval')
-					case Action.TIME_SYNCHRONIZED:
-						self.module.daemon.create_scheduled_signal(3600, 'brain', {'time': {}}, 'scheduler://brain/time', 'interval')
 		return True
 
@@ -0,0 +1,170 @@
+from typing import Callable as typing_Callable, \
+                   Awaitable as typing_Awaitable
+from os import read as os_read, \
+               close as os_close, \
+               fsencode as os_fsencode, \
+               strerror as os_strerror
+from os.path import exists as os_path_exists, \
+                    dirname as os_path_dirname
+from ctypes import CDLL as ctypes_CDLL, \
+                   get_errno as ctypes_get_errno
+from ctypes.util import find_library as ctypes_util_find_library
+from asyncio import Event as asyncio_Event, \
+                    sleep as asyncio_sleep, \
+                    wait_for as asyncio_wait_for, \
+                    get_running_loop as asyncio_get_running_loop, \
+                    TimeoutError as asyncio_TimeoutError
+
+from dbus_fast import Message, MessageType, MessageFlag
+from dbus_fast.aio import MessageBus
+
+from hal9000.logger import Logger
+
+
+class TimeSyncWatcher(object):
+	PATH = '/run/systemd/timesync/synchronized' # created (and touched) by systemd-timesyncd once the clock is synchronized
+	METHODS = ['inotify', 'dbus', 'poll']
+	IN_NONBLOCK = 0o4000
+	IN_CLOEXEC = 0o2000000
+	IN_EVENTS = 0x00000004 | 0x00000040 | 0x00000080 | 0x00000100 | 0x00000200 # ATTRIB, MOVED_FROM, MOVED_TO, CREATE, DELETE
+	TIMEDATE_SERVICE = 'org.freedesktop.timedate1'
+	TIMEDATE_PATH = '/org/freedesktop/timedate1'
+	TIMEDATE_MATCH = f"type='signal',sender='{TIMEDATE_SERVICE}',path='{TIMEDATE_PATH}'," \
+	                 f"interface='org.freedesktop.DBus.Properties',member='PropertiesChanged'"
+
+	def __init__(self, callback: typing_Callable[[bool], None], logger: Logger, method: str = 'auto', poll_intervals: tuple = (1, 60, 3600),
+	                   get_bus: typing_Callable[[], typing_Awaitable[MessageBus]] | None = None) -> None:
+		self.callback = callback
+		self.logger = logger
+		self.methods = TimeSyncWatcher.METHODS if method == 'auto' else [method]
+		self.poll_intervals = poll_intervals
+		self.get_bus = get_bus
+		self.method = None
+		self.synced = None
+
+
+	def report(self, synced: bool) -> None:
+		if synced != self.synced:
+			self.synced = synced
+			self.callback(synced)
+
+
+	def poll_interval(self, unsynced_interval: float) -> tuple:
+		# returns the time to wait until the next check and the next unsynced interval: poll_intervals are (first unsynced,
+		# maximum unsynced, synced) and the unsynced interval doubles with each check (the clock may never get synchronized)
+		if self.synced is True:
+			return self.poll_intervals[2], self.poll_intervals[0]
+		return unsynced_interval, min(unsynced_interval * 2, self.poll_intervals[1])
+
+
+	async def run(self) -> None:
+		for method in self.methods:
+			self.method = method
+			try:
+				match method:
+					case 'inotify':
+						await self.watch_inotify()
+					case 'dbus':
+						await self.watch_dbus()
+					case 'poll':
+						await self.watch_poll()
+					case other:
+						self.logger.error(f"[brain] unknown time-sync watcher method '{method}'")
+			except Exception as e:
+				self.logger.info(f"[brain] time-sync watcher '{method}' not available: {type(e).__name__} => {str(e)}")
+		self.method = None
+
+
+	async def watch_inotify(self) -> None:
+		libc = ctypes_CDLL(ctypes_util_find_library('c'), use_errno=True)
+		fd = libc.inotify_init1(TimeSyncWatcher.IN_NONBLOCK | TimeSyncWatcher.IN_CLOEXEC)
+		if fd < 0:
+			raise OSError(ctypes_get_errno(), os_strerror(ctypes_get_errno()))
+		loop = asyncio_get_running_loop()
+		try:
+			if libc.inotify_add_watch(fd, os_fsencode(os_path_dirname(TimeSyncWatcher.PATH)), TimeSyncWatcher.IN_EVENTS) < 0:
+				raise OSError(ctypes_get_errno(), f"{os_strerror(ctypes_get_errno())}: '{os_path_dirname(TimeSyncWatcher.PATH)}'")
+			changes = asyncio_Event()
+			loop.add_reader(fd, self.on_inotify_readable, fd, changes)
+			try:
+				self.logger.debug(f"[brain] time-sync watcher: inotify on '{os_path_dirname(TimeSyncWatcher.PATH)}'")
+				while True:
+					changes.clear()
+					self.report(os_path_exists(TimeSyncWatcher.PATH))
+					await changes.wait()
+			finally:
+				loop.remove_reader(fd)
+		finally:
+			os_close(fd)
+
+
+	def on_inotify_readable(self, fd: int, changes: asyncio_Event) -> None:
+		try:
+			while len(os_read(fd, 4096)) > 0: # events are only drained, the file is checked afterwards
+				pass
+		except BlockingIOError:
+			pass
+		changes.set()
+
+
+	async def watch_dbus(self) -> None:
+		# timedated emits no PropertiesChanged for NTPSynchronized (and exits when idle): the property is re-read with the
+		# poll intervals, its PropertiesChanged signals (like NTP being enabled) only trigger an earlier re-read
+		if self.get_bus is None:
+			raise RuntimeError("no D-Bus connection provided")
+		changes = asyncio_Event()
+		handler = lambda message: self.on_dbus_message(message, changes)
+		bus = None
+		unsynced_interval = self.poll_intervals[0]
+		try:
+			self.logger.debug(f"[brain] time-sync watcher: D-Bus property 'NTPSynchronized' of '{TimeSyncWatcher.TIMEDATE_SERVICE}'")
+			while True:
+				if bus is None or bus.connected is False:
+					bus = await self.get_bus() # the daemon's (shared) system bus connection, reconnected if needed
+					bus.add_message_handler(handler)
+					await self.add_dbus_match(bus)
+				changes.clear()
+				self.report(await self.get_ntp_synchronized(bus))
+				interval, unsynced_interval = self.poll_interval(unsynced_interval)
+				try:
+					await asyncio_wait_for(changes.wait(), interval)
+					unsynced_interval = self.poll_intervals[0] # something changed (like NTP being enabled): check soon again
+				except asyncio_TimeoutError:
+					pass
+		finally:
+			if bus is not None and bus.connected is True:
+				bus.remove_message_handler(handler)
+				bus.send(Message(destination='org.freedesktop.DBus', path='/org/freedesktop/DBus', interface='org.freedesktop.DBus',
+				                 member='RemoveMatch', signature='s', body=[TimeSyncWatcher.TIMEDATE_MATCH], flags=MessageFlag.NO_REPLY_EXPECTED))
+
+
+	def on_dbus_message(self, message: Message, changes: asyncio_Event) -> None:
+		if message.message_type == MessageType.SIGNAL and message.member == 'PropertiesChanged' and message.path == TimeSyncWatcher.TIMEDATE_PATH:
+			changes.set()
+
+
+	async def add_dbus_match(self, bus: MessageBus) -> None:
+		reply = await bus.call(Message(destination='org.freedesktop.DBus', path='/org/freedesktop/DBus', interface='org.freedesktop.DBus',
+		                               member='AddMatch', signature='s', body=[TimeSyncWatcher.TIMEDATE_MATCH]))
+		if reply.message_type == MessageType.ERROR:
+			raise RuntimeError(f"{reply.error_name}: {reply.body}")
+
+
+	async def get_ntp_synchronized(self, bus: MessageBus) -> bool:
+		# a plain Properties.Get (no proxy object): timedated is (re-)activated by the call if it exited meanwhile
+		reply = await bus.call(Message(destination=TimeSyncWatcher.TIMEDATE_SERVICE, path=TimeSyncWatcher.TIMEDATE_PATH,
+		                               interface='org.freedesktop.DBus.Properties', member='Get', signature='ss',
+		                               body=[TimeSyncWatcher.TIMEDATE_SERVICE, 'NTPSynchronized']))
+		if reply.message_type == MessageType.ERROR:
+			raise RuntimeError(f"{reply.error_name}: {reply.body}")
+		return reply.body[0].value
+
+
+	async def watch_poll(self) -> None:
+		self.logger.debug(f"[brain] time-sync watcher: polling '{TimeSyncWatcher.PATH}'")
+		unsynced_interval = self.poll_intervals[0]
+		while True:
+			self.report(os_path_exists(TimeSyncWatcher.PATH))
+			interval, unsynced_interval = self.poll_interval(unsynced_interval)
+			await asyncio_sleep(interval)
+
@@ -1,23 +1,22 @@
-from os.path import basename as os_path_basename, \
-                    dirname as os_path_dirname, \
-                    abspath as os_path_abspath
 from configparser import ConfigParser as configparser_ConfigParser
-from json import load as json_load, \
-                 loads as json_loads
-from subprocess import run as subprocess_run
-from requests import get as requests_get
-from jinja2 import Environment as jinja2_Environment, \
-                   FileSystemLoader as jinja2_FileSystemLoader, \
-                   select_autoescape as jinja2_select_autoescape
-
-from hal9000.brain.plugin import HAL9000_Plugin, DataInvalid, CommitPhase
+from json import loads as json_loads
+from asyncio import Semaphore as asyncio_Semaphore, \
+                    create_task as asyncio_create_task, \
+                    gather as asyncio_gather
+
+from hal9000.brain.plugin import HAL9000_Plugin
+from hal9000.brain.signals import Signal
 from hal9000.brain.plugins.enclosure import EnclosureComponent
+from hal9000.brain.plugins.enclosure.menus import MenuCache, Menu
 
 
 class Control(EnclosureComponent):
 	def __init__(self, **kwargs) -> None:
 		super().__init__('trigger:enclosure:control', **kwargs)
 		self.menu = None
+		self.menus = None
+		self.prefetch_task = None
+		self.metrics = {'prefetch-hits': 0, 'prefetch-misses': 0}
 
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
@@ -27,96 +26,132 @@ class Control(EnclosureComponent):
 		self.config['menu:default-loader-source'] = configuration.get('enclosure:control', self.config['menu:default-loader'], fallback=None)
 		self.config['menu:default-processor'] = configuration.get('enclosure:control', 'processor', fallback='none')
 		self.config['menu:default-processor-source'] = configuration.get('enclosure:control', self.config['menu:default-processor'], fallback=None)
-		self.daemon.plugins['enclosure'].addSignalHandler(self.on_enclosure_signal)
+		self.config['menu:cache-ttl'] = configuration.getfloat('enclosure:control', 'cache-ttl', fallback=60)
+		self.menus = MenuCache(self.daemon.logger, self.config['menu:cache-ttl'])
+		self.config['menu:prefetch-concurrency'] = configuration.getint('enclosure:control', 'prefetch-concurrency', fallback=2)
+		self.config['menu:prefetch-loaders'] = []
+		for loader in configuration.getlist('enclosure:control', 'prefetch-loaders', fallback=['file', 'url']): # 'command' only by opt-in
+			if loader in MenuCache.LOADERS:
+				self.config['menu:prefetch-loaders'].append(loader)
+			elif loader != '':
+				self.daemon.logger.warning(f"[enclosure:control] invalid menu loader '{loader}' in 'prefetch-loaders' " \
+				                           f"(section 'enclosure:control'), skipping it")
+		self.daemon.plugins['enclosure'].addSignalHandler(self.on_enclosure_signal, ['control'])
 
 
-	def menu_load(self, id: str, loader: str = None, loader_source: str = None, processor: str = None, processor_source: str = None) -> bool:
-		menu = {}
+	def menu_source(self, id: str, loader: str = None, loader_source: str = None, processor: str = None, processor_source: str = None) -> tuple | None:
 		if loader_source is None and self.config['menu:default-loader-source'] is None:
 			self.daemon.logger.error(f"[enclosure:control] no loader-source provided for menu '{id}' and no default value configured (missing key " \
 			                         f"'{self.config['menu:default-loader']}' in section 'enclosure:control')")
-			return False
+			return None
 		if processor is not None or self.config['menu:default-processor'] != 'none':
 			if processor_source is None and self.config['menu:default-processor-source'] is None:
 				self.daemon.logger.error(f"[enclosure:control] no processor-source provided for menu '{id}' and no default value configured (missing key " \
 				                         f"'{self.config['menu:default-processor']}' in section 'enclosure:control')")
-				return False
+				return None
 		loader = loader if loader is not None else self.config['menu:default-loader']
 		loader_source = loader_source.format(id=id) if loader_source is not None else self.config['menu:default-loader-source'].format(id=id) if self.config['menu:default-loader-source'] is not None else None
 		processor = processor if processor is not None else self.config['menu:default-processor']
 		processor_source = processor_source.format(id=id) if processor_source is not None else self.config['menu:default-processor-source'].format(id=id) if self.config['menu:default-processor-source'] is not None else None
-		match loader:
-			case 'file':
-				try:
-					with open(loader_source) as file:
-						menu = json_load(file)
-				except Exception as e:
-					self.daemon.logger.error(f"[enclosure:control] error while loading file '{loader_source}': {e}")
-					return False
-			case 'url':
-				try:
-					response = requests_get(loader_source, timeout=5)
-					if response.ok is True:
-						menu = response.json()
-				except Exception as e:
-					self.daemon.logger.error(f"[enclosure:control] error while loading url '{loader_source}': {e}")
-					return False
-			case 'command':
-				try:
-					menu = subprocess_run(loader_source, check=True, capture_output=True, text=True, timeout=5).stdout
-				except Exception as e:
-					self.daemon.logger.error(f"[enclosure:control] error trying to execute command '{loader_source}': {e}")
-					return False
-			case other:
-				self.daemon.logger.error(f"[enclosure:control] invalid menu loader '{loader}' for '{loader_source}'")
-				return False
+		if loader not in MenuCache.LOADERS:
+			self.daemon.logger.error(f"[enclosure:control] invalid menu loader '{loader}' for '{loader_source}'")
+			return None
+		return loader, loader_source, processor, processor_source
+
+
+	def menu_action_args(self, item: dict, action: dict) -> tuple:
+		id = action['data']['id'] if 'id' in action['data'] else item['id']
+		loader = action['data']['loader'] if 'loader' in action['data'] else None
+		loader_source = action['data'][loader] if loader in action['data'] else None
+		processor = action['data']['processor'] if 'processor' in action['data'] else None
+		processor_source = action['data'][processor] if processor in action['data'] else None
+		return id, loader, loader_source, processor, processor_source
+
+
+	async def menu_load(self, id: str, loader: str = None, loader_source: str = None, processor: str = None, processor_source: str = None) -> bool:
+		source = self.menu_source(id, loader, loader_source, processor, processor_source)
+		if source is None:
+			return False
+		loader, loader_source, processor, processor_source = source
+		try:
+			menu = await self.menus.load(loader, loader_source)
+			if isinstance(menu, dict) is False:
+				raise ValueError(f"menu is not a JSON object (but '{type(menu).__name__}')")
+		except Exception as e:
+			self.daemon.logger.error(f"[enclosure:control] error while loading menu with loader '{loader}' from '{loader_source}': {e}")
+			return False
 		match processor:
 			case 'none' | None:
-				self.menu = menu
+				pass
 			case 'jinja2':
 				try:
-					processor_source_dir = os_path_dirname(os_path_abspath(processor_source))
-					jinja2_env = jinja2_Environment(loader=jinja2_FileSystemLoader(processor_source_dir), autoescape=jinja2_select_autoescape())
-					jinja2_tmpl = jinja2_env.get_template(os_path_basename(processor_source))
-					self.menu = json_loads(jinja2_tmpl.render(menu))
+					menu = json_loads(self.menus.get_template(processor_source).render(menu))
 				except Exception as e:
 					self.daemon.logger.error(f"[enclosure:control] exception in processor 'jinja2' while loading menu '{loader_source}': {e}")
+					return False
 			case other:
-				self.daemon.logger.error(f"[enclosure:control] invalid menu processor '{processor}' for '{self.menu['id']}'='{self.menu['text']}'")
+				self.daemon.logger.error(f"[enclosure:control] invalid menu processor '{processor}' for menu '{id}' (loaded from {loader}='{loader_source}')")
 				return False
-		if 'id' not in self.menu or 'text' not in self.menu or 'items' not in self.menu or len(self.menu['items']) == 0:
-			self.daemon.logger.error(f"[enclosure:control] invalid menu loaded from {loader}='{loader_source.format(id=id)}'")
+		menu = Menu.from_data(menu, self.daemon.logger, f"{loader}='{loader_source}'")
+		if menu is None:
 			self.menu_exit()
 			return False
-		for item_index, item in enumerate(self.menu['items'].copy()):
-			if 'actions' not in item:
-				self.daemon.logger.error(f"[enclosure:control] removing invalid menu item '{item['id']}' (missing 'actions') " \
-			                         f"in menu '{id}' (loaded from {loader}='{loader_source.format(id=id)}')")
-				self.menu['items'].remove(item)
-		for item_index, item in enumerate(self.menu['items']):
-			for action_index, action in enumerate(item['actions'].copy()):
-				if 'handler' not in action or 'data' not in action:
-					if item in self.menu['items']:
-						self.daemon.logger.error(f"[enclosure:control] removing invalid menu item '{item['id']}' (invalid 'actions') " \
-					                         f"in menu '{id}' (loaded from {loader}='{loader_source.format(id=id)}')")
-						self.menu['items'].remove(item)
+		self.menu = menu
+		self.menu_prefetch()
 		return True
 
 
+	def menu_prefetch(self) -> None:
+		# loads the submenus of the current menu's 'menu' actions in the background (into the menu cache), only
+		# for the loaders in 'prefetch-loaders': by default not for 'command' (which runs the command just in case)
+		if self.prefetch_task is not None:
+			self.prefetch_task.cancel()
+			self.prefetch_task = None
+			self.daemon.tasks.pop('enclosure:control:prefetch', None)
+		if self.config['menu:prefetch-concurrency'] <= 0:
+			return
+		sources = {}
+		for item in self.menu.items:
+			for action in item['actions']:
+				if action['handler'] == 'menu':
+					source = self.menu_source(*self.menu_action_args(item, action))
+					if source is not None and source[0] in self.config['menu:prefetch-loaders']:
+						sources[source[0:2]] = source
+		if len(sources) > 0:
+			self.prefetch_task = asyncio_create_task(self.menu_prefetch_run(list(sources.values())))
+			self.daemon.tasks['enclosure:control:prefetch'] = self.prefetch_task # cancelled (and gathered) by the daemon on shutdown
+
+
+	async def menu_prefetch_run(self, sources: list) -> None:
+		concurrency = asyncio_Semaphore(self.config['menu:prefetch-concurrency'])
+		async def prefetch(loader: str, loader_source: str, processor: str, processor_source: str) -> None:
+			async with concurrency:
+				try:
+					await self.menus.load(loader, loader_source)
+					if processor == 'jinja2':
+						self.menus.get_template(processor_source)
+				except Exception as e:
+					self.daemon.logger.debug(f"[enclosure:control] prefetching menu from {loader}='{loader_source}' failed: {e}")
+		await asyncio_gather(*[prefetch(*source) for source in sources])
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, cache=self.menus.get_metrics())
+
+
 	def menu_update_frontend(self, item_position) -> None:
-		menu_id   = self.menu['id']
-		menu_text = self.menu['text']
-		item_id   = self.menu['items'][item_position]['id']
-		item_text = self.menu['items'][item_position]['text']
-		self.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'menu', \
-		                                                         'parameter': {'name': f'{menu_id}/{item_id}', 'title': menu_text, 'text': item_text}}}})
-		self.daemon.create_scheduled_signal(self.config['menu:timeout'], 'frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}}, \
+		menu_id   = self.menu.id
+		menu_text = self.menu.text
+		item_id   = self.menu.items[item_position]['id']
+		item_text = self.menu.items[item_position]['text']
+		self.daemon.queue_signal('frontend', Signal.gui_screen('menu', {'name': f'{menu_id}/{item_id}', 'title': menu_text, 'text': item_text}))
+		self.daemon.create_scheduled_signal(self.config['menu:timeout'], 'frontend', Signal.gui_screen('idle'), \
 		                                    'scheduler://enclosure:control/menu:timeout')
 
 	def menu_exit(self) -> None:
 		self.menu = None
 		self.daemon.remove_scheduled_signal('scheduler://enclosure:control/menu:timeout')
-		self.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
+		self.daemon.queue_signal('frontend', Signal.gui_screen('idle'))
 
 
 	async def on_enclosure_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
@@ -124,57 +159,64 @@ class Control(EnclosureComponent):
 			match self.daemon.plugins['frontend'].screen.split(':', 1).pop(0):
 				case 'idle':
 					if 'delta' in signal['control']:
-						match self.menu_load('main'):
+						match await self.menu_load('main'):
 							case True:
 								self.menu_update_frontend(0)
 							case False:
 								pass # TODO: error screen
 				case 'menu':
 					menu_id, item_id = self.daemon.plugins['frontend'].screen.split(':', 1).pop(1).split('/', 1)
-					if menu_id != self.menu['id']:
-						self.daemon.logger.error(f"[enclosure:control] BUG: shown menu '{menu_id}' is not loaded ('{self.menu['id']}')")
+					if self.menu is None or menu_id != self.menu.id:
+						self.daemon.logger.error(f"[enclosure:control] BUG: shown menu '{menu_id}' is not loaded " \
+						                         f"('{self.menu.id if self.menu is not None else None}')")
 						self.menu_exit()
 						return
-					if len(list(filter(lambda item: item['id'] == item_id, self.menu['items']))) == 0:
-						self.daemon.logger.error(f"[enclosure:control] BUG: shown menu item '{item_id}' is not in menu '{self.menu['id']}'")
+					item_position = self.menu.positions.get(item_id)
+					if item_position is None:
+						self.daemon.logger.error(f"[enclosure:control] BUG: shown menu item '{item_id}' is not in menu '{self.menu.id}'")
 						self.menu_exit()
 						return
 					if 'delta' in signal['control']:
-						item = list(filter(lambda item: item['id'] == item_id, self.menu['items'])).pop(0)
-						item_position = self.menu['items'].index(item)
 						item_position += int(signal['control']['delta'])
-						item_position %= len(self.menu['items'])
+						item_position %= len(self.menu.items)
 						self.menu_update_frontend(item_position)
 					if 'select' in signal['control']:
 						self.daemon.remove_scheduled_signal('scheduler://enclosure:control/menu:timeout')
-						item = list(filter(lambda item: item['id'] == item_id, self.menu['items'])).pop(0)
-						for action in item['actions']:
+						item = self.menu.get_item(item_id)
+						for action_index, action in enumerate(item['actions']):
 							match action['handler']:
 								case 'menu':
-									id = action['data']['id'] if 'id' in action['data'] else item['id']
-									loader = action['data']['loader'] if 'loader' in action['data'] else None
-									loader_source = action['data'][loader] if loader in action['data'] else None
-									processor = action['data']['processor'] if 'processor' in action['data'] else None
-									processor_source = action['data'][processor] if processor in action['data'] else None
-									match self.menu_load(id, loader, loader_source, processor, processor_source):
+									args = self.menu_action_args(item, action)
+									source = self.menu_source(*args)
+									if source is not None:
+										match self.menus.is_cached(*source[0:2]):
+											case True:
+												self.metrics['prefetch-hits'] += 1
+											case False:
+												self.metrics['prefetch-misses'] += 1
+										self.daemon.logger.debug("[enclosure:control] menu prefetching: {metrics}", metrics=self.get_metrics)
+									match await self.menu_load(*args):
 										case True:
 											self.menu_update_frontend(0) #TODO iterating after menu reload?
 										case False: #TODO
-											self.daemon.logger.error(f"[enclosure:control] menu_load({id},{loader},{loader_source},{processor},{processor_source}) failed")
+											self.daemon.logger.error(f"[enclosure:control] menu_load({','.join(str(arg) for arg in args)}) failed")
 											self.menu_exit()
 											return
 								case 'signal':
-									plugin = action['data']['plugin']
-									signal = self.daemon.substitute_vars(action['data']['signal'], \
-									                                     {'ipv4': await self.daemon.get_system_ipv4()})
-									self.daemon.queue_signal(plugin, signal)
+									template = self.menu.get_template(item_id, action_index) # compiled when the menu was loaded
+									if 'plugin' not in action['data'] or template is None:
+										self.daemon.logger.warning(f"[enclosure:control] invalid 'signal' action (missing 'plugin' or 'signal') " \
+										                           f"for menu item '{menu_id}/{item_id}', ignoring")
+										continue
+									signal = template.render(await template.resolve({'ipv4': self.daemon.get_system_ipv4}))
+									self.daemon.queue_signal(action['data']['plugin'], signal)
 								case other:
 									self.daemon.logger.warning(f"[enclosure:control] invalid action handler '{action['handler']}' " \
 									                           f"for menu item '{menu_id}/{item_id}', ignoring")
 				case 'error':
 					if 'select' in signal['control']: # TODO and not critical
-						self.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
+						self.daemon.queue_signal('frontend', Signal.gui_screen('idle'))
 				case 'qrcode':
 					if 'select' in signal['control']:
-						self.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
+						self.daemon.queue_signal('frontend', Signal.gui_screen('idle'))
 
@@ -0,0 +1,200 @@
+from os import stat as os_stat
+from os.path import basename as os_path_basename, \
+                    dirname as os_path_dirname, \
+                    abspath as os_path_abspath
+from shlex import split as shlex_split
+from time import monotonic as time_monotonic
+from json import load as json_load, \
+                 loads as json_loads
+from asyncio import to_thread as asyncio_to_thread, \
+                    create_task as asyncio_create_task, \
+                    shield as asyncio_shield, \
+                    create_subprocess_exec as asyncio_create_subprocess_exec, \
+                    wait_for as asyncio_wait_for, \
+                    TimeoutError as asyncio_TimeoutError
+from asyncio.subprocess import PIPE as asyncio_subprocess_PIPE
+from requests import Session as requests_Session
+from jinja2 import Environment as jinja2_Environment, \
+                   FileSystemLoader as jinja2_FileSystemLoader, \
+                   Template as jinja2_Template, \
+                   select_autoescape as jinja2_select_autoescape
+
+from hal9000.logger import Logger
+from hal9000.brain.templates import Template
+
+
+class MenuCache(object):
+	# loaded (unprocessed) menus by loader+source, validated by mtime (file), ETag/Last-Modified (url, after the TTL)
+	# or TTL (command); cached menus are shared: callers must not modify them. Jinja2 environments are created once
+	# per template directory (their compiled templates are cached and reloaded if the template file changes).
+	# A 'command' source is split like a shell command line (quoting, no shell features like pipes or variables) and
+	# executed directly, its output must be a JSON menu.
+	LOADERS = ['file', 'url', 'command']
+	TIMEOUT = 5
+
+	def __init__(self, logger: Logger, ttl: float = 60) -> None:
+		self.logger = logger
+		self.ttl = ttl
+		self.entries = {}
+		self.loading = {}
+		self.environments = {}
+		self.session = requests_Session()
+		self.metrics = {'hits': 0, 'misses': 0, 'joined': 0, 'revalidated': 0}
+
+
+	def is_cached(self, loader: str, source: str) -> bool:
+		entry = self.entries.get((loader, source))
+		if entry is None:
+			return False
+		match loader:
+			case 'file':
+				try:
+					return entry['mtime'] == os_stat(source).st_mtime_ns
+				except OSError:
+					return False
+			case 'url' | 'command':
+				return entry['expires'] > time_monotonic()
+		return False
+
+
+	async def load(self, loader: str, source: str) -> dict:
+		if loader not in MenuCache.LOADERS:
+			raise ValueError(f"invalid menu loader '{loader}'")
+		if self.is_cached(loader, source) is True:
+			self.metrics['hits'] += 1
+			return self.entries[(loader, source)]['menu']
+		task = self.loading.get((loader, source))
+		if task is None:
+			self.metrics['misses'] += 1
+			task = asyncio_create_task(self.refresh(loader, source))
+			self.loading[(loader, source)] = task
+			task.add_done_callback(lambda task: self.on_loaded(loader, source, task))
+		else:
+			self.metrics['joined'] += 1 # already being loaded (by a prefetch)
+		return await asyncio_shield(task) # a cancelled (prefetching) caller doesn't cancel the load for other callers
+
+
+	def on_loaded(self, loader: str, source: str, task) -> None:
+		self.loading.pop((loader, source), None)
+		if task.cancelled() is False and task.exception() is not None: # also reported to the waiting callers (if any)
+			self.logger.debug(f"[enclosure:control] loading menu with loader '{loader}' from '{source}' failed: {task.exception()}")
+
+
+	async def refresh(self, loader: str, source: str) -> dict:
+		entry = self.entries.get((loader, source))
+		match loader:
+			case 'file':
+				mtime = os_stat(source).st_mtime_ns
+				with open(source) as file:
+					entry = {'menu': json_load(file), 'mtime': mtime}
+			case 'url':
+				entry = await self.load_url(source, entry)
+				if entry is None:
+					raise ValueError(f"no menu in response of url '{source}'")
+			case 'command':
+				entry = {'menu': await self.load_command(source), 'expires': time_monotonic() + self.ttl}
+		self.entries[(loader, source)] = entry
+		return entry['menu']
+
+
+	async def load_url(self, source: str, entry: dict | None) -> dict | None:
+		headers = {}
+		if entry is not None:
+			if entry['etag'] is not None:
+				headers['If-None-Match'] = entry['etag']
+			if entry['last-modified'] is not None:
+				headers['If-Modified-Since'] = entry['last-modified']
+		response = await asyncio_to_thread(self.session.get, source, headers=headers, timeout=MenuCache.TIMEOUT)
+		if response.status_code == 304 and entry is not None:
+			self.metrics['revalidated'] += 1
+			return dict(entry, expires=time_monotonic() + self.ttl)
+		if response.ok is False:
+			return None
+		return {'menu': response.json(), 'etag': response.headers.get('ETag'), 'last-modified': response.headers.get('Last-Modified'),
+		        'expires': time_monotonic() + self.ttl}
+
+
+	async def load_command(self, source: str) -> dict:
+		process = await asyncio_create_subprocess_exec(*shlex_split(source), stdout=asyncio_subprocess_PIPE, stderr=asyncio_subprocess_PIPE)
+		try:
+			stdout, stderr = await asyncio_wait_for(process.communicate(), MenuCache.TIMEOUT)
+		except asyncio_TimeoutError:
+			process.kill()
+			await process.communicate()
+			raise
+		if process.returncode != 0:
+			raise RuntimeError(f"command exited with status {process.returncode}: {stderr.decode(errors='replace')}")
+		try:
+			return json_loads(stdout)
+		except ValueError as e:
+			raise ValueError(f"command output is not a JSON menu ({str(e)}): {stdout[:80].decode(errors='replace')}")
+
+
+	def get_template(self, source: str) -> jinja2_Template:
+		directory = os_path_dirname(os_path_abspath(source))
+		environment = self.environments.get(directory)
+		if environment is None:
+			environment = jinja2_Environment(loader=jinja2_FileSystemLoader(directory), autoescape=jinja2_select_autoescape(), auto_reload=True)
+			self.environments[directory] = environment
+		return environment.get_template(os_path_basename(source))
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, entries=len(self.entries), loading=len(self.loading), environments=len(self.environments))
+
+
+
+class Menu(object):
+	# a validated menu: the (valid) items in their order, an index of their positions by id and the compiled
+	# templates of their 'signal' actions (per item, by action index; None for other actions)
+	__slots__ = ('id', 'text', 'items', 'positions', 'templates')
+
+	def __init__(self, id: str, text: str, items: list, templates: list) -> None:
+		self.id = id
+		self.text = text
+		self.items = items
+		self.positions = {item['id']: position for position, item in enumerate(items)}
+		self.templates = templates
+
+
+	@staticmethod
+	def from_data(data: dict, logger: Logger, origin: str) -> 'Menu | None':
+		# the data isn't modified (it may be a cached menu), invalid items are skipped
+		if isinstance(data, dict) is False or 'id' not in data or 'text' not in data \
+		   or isinstance(data.get('items'), list) is False or len(data['items']) == 0:
+			logger.error(f"[enclosure:control] invalid menu loaded from {origin}")
+			return None
+		items = []
+		item_ids = set()
+		templates = []
+		for item in data['items']:
+			if isinstance(item, dict) is False or 'id' not in item or 'text' not in item:
+				logger.error(f"[enclosure:control] removing invalid menu item (missing 'id' or 'text') in menu '{data['id']}' (loaded from {origin})")
+			elif isinstance(item.get('actions'), list) is False:
+				logger.error(f"[enclosure:control] removing invalid menu item '{item['id']}' (missing 'actions') " \
+				             f"in menu '{data['id']}' (loaded from {origin})")
+			elif any(isinstance(action, dict) is False or 'handler' not in action or 'data' not in action for action in item['actions']) is True:
+				logger.error(f"[enclosure:control] removing invalid menu item '{item['id']}' (invalid 'actions') " \
+				             f"in menu '{data['id']}' (loaded from {origin})")
+			elif item['id'] in item_ids:
+				logger.error(f"[enclosure:control] removing invalid menu item '{item['id']}' (duplicate id) " \
+				             f"in menu '{data['id']}' (loaded from {origin})")
+			else:
+				item_ids.add(item['id'])
+				items.append(item)
+				templates.append([Template(action['data']['signal'], logger) if action['handler'] == 'signal' and isinstance(action['data'], dict) is True \
+				                                                                and 'signal' in action['data'] else None for action in item['actions']])
+		if len(items) == 0:
+			logger.error(f"[enclosure:control] invalid menu '{data['id']}' (no valid items) loaded from {origin}")
+			return None
+		return Menu(data['id'], data['text'], items, templates)
+
+
+	def get_item(self, item_id: str) -> dict | None:
+		position = self.positions.get(item_id)
+		return self.items[position] if position is not None else None
+
+
+	def get_template(self, item_id: str, action_index: int) -> Template | None:
+		position = self.positions.get(item_id)
+		return self.templates[position][action_index] if position is not None else None
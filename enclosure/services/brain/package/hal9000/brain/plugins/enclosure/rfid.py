@@ -13,7 +13,7 @@ class RFID(EnclosureComponent):
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
 		self.daemon.plugins['enclosure'].addNameCallback(self.on_enclosure_rfid_callback, 'rfid')
-		self.daemon.plugins['enclosure'].addSignalHandler(self.on_enclosure_signal)
+		self.daemon.plugins['enclosure'].addSignalHandler(self.on_enclosure_signal, ['rfid'])
 		self.daemon.plugins['enclosure'].rfid = None
 
 
@@ -6,7 +6,8 @@ from datetime import datetime as datetime_datetime, \
                      timedelta as datetime_timedelta
 from configparser import ConfigParser as configparser_ConfigParser
 
-from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, DataInvalid, RUNLEVEL, CommitPhase
+from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, DataInvalid, DATAINVALID_VALUES, RUNLEVEL, RUNLEVEL_VALUES, CommitPhase
+from hal9000.brain.signals import Signal, TAG
 from hal9000.brain.plugins.brain.action import STATUS as BRAIN_STATUS
 from hal9000.brain.plugins.kalliope.action import STATUS as KALLIOPE_STATUS
 
@@ -15,6 +16,8 @@ class STATUS(enum_StrEnum):
 	OFFLINE = 'offline'
 	ONLINE  = 'online'
 
+STATUS_VALUES = frozenset(STATUS)
+
 
 class DISPLAY(enum_StrEnum):
 	ON = 'on'
@@ -33,13 +36,13 @@ class Action(HAL9000_Action):
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
 		self.module.config['frontend-command-mqtt-prefix'] = configuration.get(section_name, 'frontend-command-mqtt-prefix', fallback='hal9000/command/frontend')
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.status!=online',  self.runlevel_inhibitor_syncing_status)
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.display==unknown',  self.runlevel_inhibitor_syncing_display)
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.screen==unknown',  self.runlevel_inhibitor_syncing_screen)
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.overlay==unknown',  self.runlevel_inhibitor_syncing_overlay)
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.PREPARING, 'frontend: frontend.screen!=none',  self.runlevel_inhibitor_preparing_screen)
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.PREPARING, 'frontend: frontend.overlay!=none',  self.runlevel_inhibitor_preparing_overlay)
-		self.module.daemon.plugins['frontend'].addSignalHandler(self.on_frontend_signal)
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.status!=online',  self.runlevel_inhibitor_syncing_status, ['frontend.status'])
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.display==unknown',  self.runlevel_inhibitor_syncing_display, ['frontend.display'])
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.screen==unknown',  self.runlevel_inhibitor_syncing_screen, ['frontend.screen'])
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'frontend: frontend.overlay==unknown',  self.runlevel_inhibitor_syncing_overlay, ['frontend.overlay'])
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.PREPARING, 'frontend: frontend.screen!=none',  self.runlevel_inhibitor_preparing_screen, ['frontend.screen'])
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.PREPARING, 'frontend: frontend.overlay!=none',  self.runlevel_inhibitor_preparing_overlay, ['frontend.overlay'])
+		self.module.daemon.plugins['frontend'].addSignalHandler(self.on_frontend_signal, ['runlevel', 'status', 'error', 'system', 'gui'])
 		self.module.daemon.plugins['frontend'].addNameCallback(self.on_frontend_runlevel_callback, 'runlevel')
 		self.module.daemon.plugins['frontend'].addNameCallback(self.on_frontend_status_callback, 'status')
 		self.module.daemon.plugins['frontend'].addNameCallback(self.on_frontend_display_callback, 'display')
@@ -59,19 +62,19 @@ class Action(HAL9000_Action):
 
 
 	async def runlevel_inhibitor_syncing_display(self) -> bool:
-		if self.display in list(DataInvalid):
+		if self.display in DATAINVALID_VALUES:
 			return False
 		return True
 
 
 	async def runlevel_inhibitor_syncing_screen(self) -> bool:
-		if self.screen in list(DataInvalid):
+		if self.screen in DATAINVALID_VALUES:
 			return False
 		return True
 
 
 	async def runlevel_inhibitor_syncing_overlay(self) -> bool:
-		if self.overlay in list(DataInvalid):
+		if self.overlay in DATAINVALID_VALUES:
 			return False
 		return True
 
@@ -79,7 +82,7 @@ class Action(HAL9000_Action):
 	async def runlevel_inhibitor_preparing_screen(self) -> bool:
 		if self.screen != 'none':
 			return False
-		await self.signal({'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
+		await self.signal(Signal.gui_screen('idle'))
 		return True
 
 
@@ -89,8 +92,8 @@ class Action(HAL9000_Action):
 		return True
 
 
-	async def on_frontend_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
-		if 'runlevel' in signal:
+	async def on_frontend_signal(self, plugin: HAL9000_Plugin, signal: Signal) -> None:
+		if TAG.RUNLEVEL in signal.tags:
 			match signal['runlevel']:
 				case None | '':
 					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/runlevel', 'payload': None})
@@ -98,20 +101,20 @@ class Action(HAL9000_Action):
 					self.runlevel = RUNLEVEL.KILLED, CommitPhase.COMMIT
 				case other:
 					self.runlevel = signal['runlevel']
-		if 'status' in signal:
+		if TAG.STATUS in signal.tags:
 			match signal['status']:
 				case None | '':
 					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/status', 'payload': None})
 				case other:
 					self.status = signal['status']
-		if 'error' in signal:
+		if TAG.ERROR in signal.tags:
 			if self.status == STATUS.ONLINE:
 				error = {'level': 'error', 'id': '000', 'title': 'UNEXPECTED ERROR', 'details': ''}
 				for field in error.keys():
 					if field in signal['error']:
 						error[field] = signal['error'][field]
-				await self.module.daemon.plugins['frontend'].signal({'gui': {'screen': {'name': 'error', 'parameter': error}}})
-		if 'system' in signal:
+				await self.module.daemon.plugins['frontend'].signal(Signal.gui_screen('error', error))
+		if TAG.SYSTEM in signal.tags:
 			if 'environment' in signal['system']:
 				if self.status == STATUS.ONLINE:
 					if 'set' in signal['system']['environment']:
@@ -147,45 +150,45 @@ class Action(HAL9000_Action):
 					for field in error.keys():
 						if field in signal['system']['error']:
 							error[field] = signal['system']['error'][field]
-					await self.module.daemon.plugins['frontend'].signal({'gui': {'screen': {'name': 'error', 'parameter': error}}})
-		if 'gui' in signal:
-			if self.status == STATUS.ONLINE:
-				if 'screen' in signal['gui']:
-					screen_name = signal['gui']['screen']['name']
-					screen_desc = signal['gui']['screen']['name']
-					if 'parameter' in signal['gui']['screen'] and 'name' in signal['gui']['screen']['parameter']:
-						screen_desc += ':' + signal['gui']['screen']['parameter']['name']
-					elif 'parameter' in signal['gui']['screen'] and 'id' in signal['gui']['screen']['parameter']:
-						screen_desc += ':' + signal['gui']['screen']['parameter']['id']
-					if 'origin' in signal and signal['origin'].startswith('frontend') == True:
-						self.screen = screen_name, CommitPhase.COMMIT
-					else:
-						self.screen = screen_desc
-						if self.getRemotePendingValue('screen') == screen_desc:
-							self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/gui/screen', \
-							                                         'payload': {screen_name: signal['gui']['screen']['parameter']}})
-				if 'overlay' in signal['gui']:
-					overlay_name = signal['gui']['overlay']['name']
-					overlay_desc = signal['gui']['overlay']['name']
-					if 'parameter' in signal['gui']['overlay'] and 'name' in signal['gui']['overlay']['parameter']:
-						overlay_desc += ':' + signal['gui']['overlay']['parameter']['name']
-					elif 'parameter' in signal['gui']['overlay'] and 'id' in signal['gui']['overlay']['parameter']:
-						overlay_desc += ':' + signal['gui']['overlay']['parameter']['id']
-					if 'origin' in signal and signal['origin'].startswith('frontend') == True:
-						self.overlay = overlay_name, CommitPhase.COMMIT
-					else:
-						self.overlay = overlay_desc
-						if self.getRemotePendingValue('overlay') == overlay_desc:
-							self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/gui/overlay', \
-							                                         'payload': {overlay_name: signal['gui']['overlay']['parameter']}})
+					await self.module.daemon.plugins['frontend'].signal(Signal.gui_screen('error', error))
+		if TAG.GUI_SCREEN in signal.tags and self.status == STATUS.ONLINE:
+			screen = signal['gui']['screen']
+			screen_name = screen['name']
+			screen_desc = screen['name']
+			if 'parameter' in screen and 'name' in screen['parameter']:
+				screen_desc += ':' + screen['parameter']['name']
+			elif 'parameter' in screen and 'id' in screen['parameter']:
+				screen_desc += ':' + screen['parameter']['id']
+			if 'origin' in signal and signal['origin'].startswith('frontend') == True:
+				self.screen = screen_name, CommitPhase.COMMIT
+			else:
+				self.screen = screen_desc
+				if self.getRemotePendingValue('screen') == screen_desc:
+					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/gui/screen', \
+					                                         'payload': {screen_name: screen['parameter']}})
+		if TAG.GUI_OVERLAY in signal.tags and self.status == STATUS.ONLINE:
+			overlay = signal['gui']['overlay']
+			overlay_name = overlay['name']
+			overlay_desc = overlay['name']
+			if 'parameter' in overlay and 'name' in overlay['parameter']:
+				overlay_desc += ':' + overlay['parameter']['name']
+			elif 'parameter' in overlay and 'id' in overlay['parameter']:
+				overlay_desc += ':' + overlay['parameter']['id']
+			if 'origin' in signal and signal['origin'].startswith('frontend') == True:
+				self.overlay = overlay_name, CommitPhase.COMMIT
+			else:
+				self.overlay = overlay_desc
+				if self.getRemotePendingValue('overlay') == overlay_desc:
+					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/gui/overlay', \
+					                                         'payload': {overlay_name: overlay['parameter']}})
 
 
 	def on_frontend_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
-		if new_runlevel in list(DataInvalid):
+		if new_runlevel in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
-				if new_runlevel not in list(RUNLEVEL):
+				if new_runlevel not in RUNLEVEL_VALUES:
 					return False
 			case CommitPhase.COMMIT:
 				if old_runlevel == RUNLEVEL.KILLED:
@@ -201,11 +204,11 @@ class Action(HAL9000_Action):
 
 
 	def on_frontend_status_callback(self, plugin: HAL9000_Plugin, key: str, old_status: str, new_status: str, phase: CommitPhase) -> bool:
-		if new_status in list(DataInvalid):
+		if new_status in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
-				if new_status not in list(STATUS):
+				if new_status not in STATUS_VALUES:
 					return False
 			case CommitPhase.COMMIT:
 				if old_status == DataInvalid.UNKNOWN:
@@ -230,7 +233,7 @@ class Action(HAL9000_Action):
 
 
 	def on_frontend_display_callback(self, plugin: HAL9000_Plugin, key: str, old_display: str, new_display: str, phase: CommitPhase) -> bool:
-		if new_display in list(DataInvalid):
+		if new_display in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
@@ -244,7 +247,7 @@ class Action(HAL9000_Action):
 
 	def on_frontend_screen_callback(self, plugin: HAL9000_Plugin, key: str, old_screen: str, new_screen: str, phase: CommitPhase) -> bool:
 		if phase == CommitPhase.COMMIT:
-			self.module.daemon.logger.debug(f"[frontend] STATUS at screen transition = {self.module.daemon}")
+			self.module.daemon.logger.debug("[frontend] STATUS at screen transition = {daemon}", daemon=self.module.daemon)
 		return True
 
 
@@ -260,8 +263,8 @@ class Action(HAL9000_Action):
 							self.module.daemon.queue_signal('frontend', {'system': {'environment': {'set': {'key': 'gui/screen:animations/loop', \
 							                                                                                'value': animation}}}})
 						case other:
-							self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'none', 'parameter': {}}}})
-							self.module.daemon.queue_signal('frontend', {'gui': {'overlay': {'name': 'none', 'parameter': {}}}})
+							self.module.daemon.queue_signal('frontend', Signal.gui_screen('none'))
+							self.module.daemon.queue_signal('frontend', Signal.gui_overlay('none'))
 				case RUNLEVEL.RUNNING:
 					match self.module.daemon.plugins['brain'].status:
 						case BRAIN_STATUS.AWAKE:
@@ -272,7 +275,7 @@ class Action(HAL9000_Action):
 
 
 	def on_brain_status_callback(self, plugin: HAL9000_Plugin, key: str, old_status: str, new_status: str, phase: CommitPhase) -> bool:
-		if new_status in list(DataInvalid):
+		if new_status in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT:
 			match new_status:
@@ -286,7 +289,7 @@ class Action(HAL9000_Action):
 
 
 	def on_brain_time_callback(self, plugin: HAL9000_Plugin, key: str, old_time: str, new_time: str, phase: CommitPhase) -> bool:
-		if new_time in list(DataInvalid):
+		if new_time in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT:
 			if self.status == STATUS.ONLINE:
@@ -299,21 +302,21 @@ class Action(HAL9000_Action):
 
 
 	def on_kalliope_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
-		if new_runlevel in list(DataInvalid):
+		if new_runlevel in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT and old_runlevel == RUNLEVEL.KILLED:
-			self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
-			self.module.daemon.queue_signal('frontend', {'gui': {'overlay': {'name': 'none', 'parameter': {}}}})
+			self.module.daemon.queue_signal('frontend', Signal.gui_screen('idle'))
+			self.module.daemon.queue_signal('frontend', Signal.gui_overlay('none'))
 		return True
 
 
 	def on_kalliope_status_callback(self, plugin: HAL9000_Plugin, key: str, old_status: str, new_status: str, phase: CommitPhase) -> bool:
-		if new_status in list(DataInvalid):
+		if new_status in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT:
 			if self.status == STATUS.ONLINE:
 				if old_status == KALLIOPE_STATUS.WAITING and new_status in [KALLIOPE_STATUS.LISTENING, KALLIOPE_STATUS.SPEAKING]:
-					self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'animations', 'parameter': {'name': 'hal9000'}}}})
+					self.module.daemon.queue_signal('frontend', Signal.gui_screen('animations', {'name': 'hal9000'}))
 				if self.screen == 'animations:hal9000' and new_status == KALLIOPE_STATUS.WAITING:
 					self.module.daemon.queue_signal('frontend', {'system': {'environment': {'set': {'key': 'gui/screen:animations/loop', \
 					                                                                                'value': 'hal9000'}}}})
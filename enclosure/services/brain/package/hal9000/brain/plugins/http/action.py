@@ -1,38 +1,92 @@
-from json import dumps as json_dumps
 from configparser import ConfigParser as configparser_ConfigParser
-from requests import get as requests_get, \
-                     put as requests_put
+from concurrent.futures import ThreadPoolExecutor as concurrent_futures_ThreadPoolExecutor
+from asyncio import create_task as asyncio_create_task, \
+                    get_running_loop as asyncio_get_running_loop
+from requests import Session as requests_Session
+from requests.adapters import HTTPAdapter as requests_adapters_HTTPAdapter
+from urllib3.util.retry import Retry as urllib3_util_retry_Retry
 
 from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, CommitPhase
 
 
 class Action(HAL9000_Action):
+	# requests are executed by a thread pool (of 'max-in-flight' threads) on a shared session: keep-alive connection
+	# pools per host, timeouts and retries (by urllib3); the signal handler only starts the request and returns
+	# immediately, requests beyond 'max-in-flight' (running or waiting for a thread) are rejected
+	METHODS = ['GET', 'PUT']
 
 	def __init__(self, action_instance: str, **kwargs) -> None:
 		super().__init__('http', **kwargs)
 		self.module.hidden = True
+		self.module.session = None
+		self.module.executor = None
+		self.module.requests = set()
 		self.runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
 
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
+		self.module.config['timeout'] = self.get_config_positive(configuration, section_name, 'timeout', 5.0)
+		self.module.config['retries'] = configuration.getint(section_name, 'retries', fallback=2)
+		self.module.config['max-in-flight'] = int(self.get_config_positive(configuration, section_name, 'max-in-flight', 4))
+		self.module.config['pool-size'] = int(self.get_config_positive(configuration, section_name, 'pool-size', 2))
+		self.module.config['response-limit'] = configuration.getint(section_name, 'response-limit', fallback=4096)
+		retry = urllib3_util_retry_Retry(total=max(self.module.config['retries'], 0), backoff_factor=0.2, status_forcelist=[502, 503, 504],
+		                                 allowed_methods=frozenset(Action.METHODS), raise_on_status=False)
+		adapter = requests_adapters_HTTPAdapter(pool_connections=8, pool_maxsize=self.module.config['pool-size'], max_retries=retry)
+		self.module.session = requests_Session()
+		self.module.session.mount('http://', adapter)
+		self.module.session.mount('https://', adapter)
+		self.module.executor = concurrent_futures_ThreadPoolExecutor(max_workers=self.module.config['max-in-flight'], thread_name_prefix='http')
 		self.module.daemon.plugins['http'].addSignalHandler(self.on_http_signal)
 
 
+	def get_config_positive(self, configuration: configparser_ConfigParser, section_name: str, option: str, fallback: float) -> float:
+		value = configuration.getfloat(section_name, option, fallback=fallback)
+		if value <= 0:
+			self.module.daemon.logger.warning(f"[http] invalid value '{value}' for '{option}' in section '{section_name}', using '{fallback}' instead")
+			value = fallback
+		return value
+
+
 	async def on_http_signal(self, plugin: str, signal: dict) -> None:
-		requests_method = requests_get
+		method = 'GET'
 		if 'method' in signal:
-			match signal['method'].upper():
-				case 'GET':
-					requests_method = requests_get
-				case 'PUT':
-					requests_method = requests_put
-				case other:
-					self.module.daemon.logger.error(f"[http] unexpected http method '{signal['method']}'")
-					return
+			method = signal['method'].upper()
+			if method not in Action.METHODS:
+				self.module.daemon.logger.error(f"[http] unexpected http method '{signal['method']}'")
+				return
 		if 'url' in signal:
-			try:
-				requests_method(signal['url'])
-			except Exception as e:
-				self.module.daemon.logger.error(f"[http] {str(e)}")
+			if len(self.module.requests) >= self.module.config['max-in-flight']:
+				self.module.daemon.logger.warning(f"[http] {method} '{signal['url']}' rejected: {len(self.module.requests)} requests " \
+				                                  f"in flight (max-in-flight)")
+				if signal.get('response') is not None:
+					self.module.daemon.queue_signal(signal['response'], {'http': {'response': {'method': method, 'url': signal['url'], 'status': None, \
+					                                                                           'error': 'too many requests in flight'}}})
+				return
+			task = asyncio_create_task(self.request(method, signal['url'], signal.get('data'), signal.get('response')))
+			self.module.requests.add(task) # strong reference until done
+			task.add_done_callback(self.module.requests.discard)
+
+
+	async def request(self, method: str, url: str, data: dict | str | None, response_plugin: str | None) -> None:
+		result = {'method': method, 'url': url, 'status': None}
+		try:
+			response = await asyncio_get_running_loop().run_in_executor(self.module.executor, self.send, method, url, data)
+			result['status'] = response.status_code
+			result['text'] = response.text[:self.module.config['response-limit']]
+			if response.ok is False:
+				self.module.daemon.logger.warning(f"[http] {method} '{url}' => HTTP status {response.status_code}")
+		except Exception as e:
+			result['error'] = str(e)
+			self.module.daemon.logger.error(f"[http] {method} '{url}' => {str(e)}")
+		if response_plugin is not None:
+			self.module.daemon.queue_signal(response_plugin, {'http': {'response': result}})
+
+
+	def send(self, method: str, url: str, data: dict | str | None):
+		# runs in the executor: the (non-streamed) response is read completely, so the connection is back in its pool
+		if isinstance(data, dict) is True or isinstance(data, list) is True:
+			return self.module.session.request(method, url, json=data, timeout=self.module.config['timeout'])
+		return self.module.session.request(method, url, data=data, timeout=self.module.config['timeout'])
 
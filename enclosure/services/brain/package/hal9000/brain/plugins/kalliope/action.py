@@ -1,7 +1,8 @@
 from configparser import ConfigParser as configparser_ConfigParser
 from enum import StrEnum as enum_StrEnum
 
-from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, DataInvalid, RUNLEVEL, CommitPhase
+from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, DataInvalid, DATAINVALID_VALUES, RUNLEVEL, RUNLEVEL_VALUES, CommitPhase
+from hal9000.brain.signals import Signal, TAG
 from hal9000.brain.plugins.brain import STATUS as BRAIN_STATUS
 
 
@@ -12,6 +13,8 @@ class STATUS(enum_StrEnum):
 	SPEAKING  = 'speaking'
 	SLEEPING  = 'sleeping'
 
+STATUS_VALUES = frozenset(STATUS)
+
 
 class Action(HAL9000_Action):
 
@@ -28,8 +31,8 @@ class Action(HAL9000_Action):
 		self.module.config['initial-volume'] = configuration.getint(section_name, 'initial-volume', fallback=50)
 		self.module.config['trigger-mqtt-topic'] = configuration.get(section_name, 'trigger-mqtt-topic', fallback=None)
 		self.module.config['command-mqtt-topic-prefix'] = configuration.get(section_name, 'command-mqtt-topic-prefix', fallback='hal9000/command/kalliope')
-		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'kalliope: kalliope.status==unknown',  self.runlevel_inhibitor_syncing_status)
-		self.module.daemon.plugins['kalliope'].addSignalHandler(self.on_kalliope_signal)
+		self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'kalliope: kalliope.status==unknown',  self.runlevel_inhibitor_syncing_status, ['kalliope.status'])
+		self.module.daemon.plugins['kalliope'].addSignalHandler(self.on_kalliope_signal, ['runlevel', 'status', 'command', 'volume'])
 		self.module.daemon.plugins['kalliope'].addNameCallback(self.on_kalliope_runlevel_callback, 'runlevel')
 		self.module.daemon.plugins['kalliope'].addNameCallback(self.on_kalliope_status_callback, 'status')
 		self.module.daemon.plugins['kalliope'].addNameCallback(self.on_kalliope_volume_callback, 'volume')
@@ -40,13 +43,13 @@ class Action(HAL9000_Action):
 
 
 	async def runlevel_inhibitor_syncing_status(self) -> bool:
-		if self.status not in list(STATUS):
+		if self.status not in STATUS_VALUES:
 			return False
 		return True
 
 
-	async def on_kalliope_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
-		if 'runlevel' in signal:
+	async def on_kalliope_signal(self, plugin: HAL9000_Plugin, signal: Signal) -> None:
+		if TAG.RUNLEVEL in signal.tags:
 			match signal['runlevel']:
 				case None | '':
 					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/runlevel', 'payload': None})
@@ -54,20 +57,20 @@ class Action(HAL9000_Action):
 					self.runlevel = RUNLEVEL.KILLED, CommitPhase.COMMIT
 				case other:
 					self.runlevel = signal['runlevel']
-		if 'status' in signal:
+		if TAG.STATUS in signal.tags:
 			match signal['status']:
 				case None | '':
 					self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/status', 'payload': None})
 				case other:
 					self.status = signal['status']
-		if 'command' in signal:
+		if TAG.COMMAND in signal.tags:
 			if 'name' in signal['command']:
 				command_name = signal['command']['name']
 				self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/{command_name}', \
 				                                         'payload': signal['command']['parameter'] if 'parameter' in signal['command'] else None})
-		if 'volume' in signal:
+		if TAG.VOLUME in signal.tags:
 			if 'level' in signal['volume']:
-				if signal['volume']['level'] not in list(DataInvalid):
+				if signal['volume']['level'] not in DATAINVALID_VALUES:
 					if int(signal['volume']['level']) >= 0 and int(signal['volume']['level']) <= 100:
 						if 'origin' in signal and signal['origin'].startswith('frontend') == True:
 							if int(signal['volume']['level']) > 0 or self.mute == 'false':
@@ -76,23 +79,23 @@ class Action(HAL9000_Action):
 						else:
 							self.volume = str(signal['volume']['level'])
 			if 'mute' in signal['volume']:
-				if signal['volume']['mute'] not in list(DataInvalid):
+				if signal['volume']['mute'] not in DATAINVALID_VALUES:
 					self.mute = str(signal['volume']['mute']).lower(), CommitPhase.COMMIT
 					match self.mute:
 						case 'true':
 							self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/volume', 'payload': {'level': 0}})
 						case 'false':
-							if self.volume not in list(DataInvalid):
+							if self.volume not in DATAINVALID_VALUES:
 								self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/volume', \
 								                                         'payload': {'level': int(self.volume)}})
 
 
 	def on_kalliope_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
-		if new_runlevel in list(DataInvalid):
+		if new_runlevel in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
-				if new_runlevel not in list(RUNLEVEL):
+				if new_runlevel not in RUNLEVEL_VALUES:
 					return False
 			case CommitPhase.COMMIT:
 				if old_runlevel == RUNLEVEL.KILLED:
@@ -107,14 +110,14 @@ class Action(HAL9000_Action):
 
 
 	def on_kalliope_status_callback(self, plugin: HAL9000_Plugin, key: str, old_status: str, new_status: str, phase: CommitPhase) -> bool:
-		if new_status in list(DataInvalid):
+		if new_status in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
-				if new_status not in list(STATUS):
+				if new_status not in STATUS_VALUES:
 					return False
 			case CommitPhase.COMMIT:
-				if old_status in list(DataInvalid) and new_status in list(STATUS):
+				if old_status in DATAINVALID_VALUES and new_status in STATUS_VALUES:
 					self.mute = 'false'
 					self.volume = str(self.module.config['initial-volume'])
 				match new_status:
@@ -128,7 +131,7 @@ class Action(HAL9000_Action):
 
 
 	def on_kalliope_volume_callback(self, plugin: HAL9000_Plugin, key: str, old_volume: str, new_volume: str, phase: CommitPhase) -> bool:
-		if new_volume in list(DataInvalid):
+		if new_volume in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
@@ -144,7 +147,7 @@ class Action(HAL9000_Action):
 
 
 	def on_kalliope_mute_callback(self, plugin: HAL9000_Plugin, key: str, old_mute: str, new_mute: str, phase: CommitPhase) -> bool:
-		if new_mute in list(DataInvalid):
+		if new_mute in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
@@ -156,7 +159,7 @@ class Action(HAL9000_Action):
 						self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/volume', \
 						                                         'payload': {'level': 0}})
 					case 'false':
-						if self.volume not in list(DataInvalid):
+						if self.volume not in DATAINVALID_VALUES:
 							self.module.daemon.queue_signal('mqtt', {'topic': f'{self.module.mqtt_prefix}/volume', \
 							                                         'payload': {'level': int(self.volume)}})
 		return True
@@ -164,7 +167,7 @@ class Action(HAL9000_Action):
 
 	def on_brain_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
 		if phase == CommitPhase.COMMIT and new_runlevel == RUNLEVEL.SYNCING:
-			self.module.daemon.queue_signal('kalliope', {'volume': {'level': self.module.config['initial-volume'], 'mute': False}})
+			self.module.daemon.queue_signal('kalliope', Signal.volume(level=self.module.config['initial-volume'], mute=False))
 		return True
 
 
@@ -172,8 +175,8 @@ class Action(HAL9000_Action):
 		if phase == CommitPhase.COMMIT:
 			match new_status:
 				case BRAIN_STATUS.AWAKE:
-					self.module.daemon.queue_signal('kalliope', {'status': str(STATUS.WAITING)})
+					self.module.daemon.queue_signal('kalliope', Signal.status(str(STATUS.WAITING)))
 				case BRAIN_STATUS.ASLEEP:
-					self.module.daemon.queue_signal('kalliope', {'status': str(STATUS.SLEEPING)})
+					self.module.daemon.queue_signal('kalliope', Signal.status(str(STATUS.SLEEPING)))
 		return True
 
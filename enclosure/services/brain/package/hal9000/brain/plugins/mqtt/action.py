@@ -14,7 +14,7 @@ class Action(HAL9000_Action):
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
-		self.module.daemon.plugins['mqtt'].addSignalHandler(self.on_mqtt_signal)
+		self.module.daemon.plugins['mqtt'].addSignalHandler(self.on_mqtt_signal, ['topic'])
 
 
 	async def on_mqtt_signal(self, plugin: str, signal: dict) -> None:
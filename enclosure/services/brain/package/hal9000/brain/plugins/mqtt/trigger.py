@@ -1,19 +1,146 @@
-from re import match as re_match
+from re import compile as re_compile, \
+               Pattern as re_Pattern
 from json import loads as json_loads, \
                  dumps as json_dumps
+from typing import Any, \
+                   Callable as typing_Callable
 from jsonpath_ng.ext import parse as jsonpath_ng_ext_parse
 from configparser import ConfigParser as configparser_ConfigParser
-from aiomqtt import Message as aiomqtt_Message
 
 from hal9000.brain.daemon import Daemon
 from hal9000.brain.plugin import HAL9000_Trigger, RUNLEVEL, CommitPhase
+from hal9000.brain.topic import TopicMessage
+
+
+def copy_json(data: Any) -> Any:
+	if isinstance(data, dict) is True:
+		return {key: copy_json(value) for key, value in data.items()}
+	if isinstance(data, list) is True:
+		return [copy_json(value) for value in data]
+	return data
+
+
+def json_text(data: Any) -> str:
+	if isinstance(data, str) is True:
+		return data
+	return json_dumps(data)
+
+
+class SignalBuilder(object):
+	PLACEHOLDER_BEGIN = '\ue000'
+	PLACEHOLDER_END   = '\ue001'
+
+	def __init__(self, formatter: str) -> None:
+		self.formatter = formatter
+		self.names = []
+		self.bare_positions = set()
+		self.build_signal = self.compile(json_loads(self.preprocess(formatter)))
+
+
+	def preprocess(self, formatter: str) -> str:
+		result = []
+		in_string = False
+		index = 0
+		while index < len(formatter):
+			char = formatter[index]
+			if char == '\\' and in_string is True:
+				result.append(formatter[index:index+2])
+				index += 2
+				continue
+			if char == '"':
+				in_string = not in_string
+			if char == '%':
+				if formatter[index+1:index+2] == '%':
+					result.append('%')
+					index += 2
+					continue
+				if formatter[index+1:index+2] != '(' or formatter.find(')', index) < 0:
+					raise ValueError(f"unsupported format specifier at position {index} in '{formatter}'")
+				end = formatter.find(')', index)
+				if formatter[end+1:end+2] != 's':
+					raise ValueError(f"unsupported conversion '%{formatter[end+1:end+2]}' at position {index} in '{formatter}'")
+				name = formatter[index+2:end]
+				placeholder = f'{SignalBuilder.PLACEHOLDER_BEGIN}{len(self.names)}{SignalBuilder.PLACEHOLDER_END}'
+				self.names.append(name)
+				if in_string is True:
+					result.append(placeholder)
+				else:
+					self.bare_positions.add(len(self.names)-1)
+					result.append(f'"{placeholder}"')
+				index = end + 2
+				continue
+			result.append(char)
+			index += 1
+		return ''.join(result)
+
+
+	def compile(self, template: Any) -> typing_Callable[[dict, typing_Callable, typing_Callable], Any]:
+		# returns a tree of closures (walked by build()) that mirrors the template: containers are created anew for each
+		# message (so no copying is needed), constants are shared (they are immutable) and only placeholders look up values
+		if isinstance(template, dict) is True:
+			items = tuple(self.compile_item(key) + self.compile_item(value) for key, value in template.items())
+			def build_dict(values: dict, bare: typing_Callable, text: typing_Callable) -> dict:
+				result = {} # a plain loop: a comprehension would cost another frame per container
+				for key_node, key, value_node, value in items:
+					result[key if key_node is None else key_node(values, bare, text)] = value if value_node is None else value_node(values, bare, text)
+				return result
+			return build_dict
+		if isinstance(template, list) is True:
+			items = tuple(self.compile_item(value) for value in template)
+			def build_list(values: dict, bare: typing_Callable, text: typing_Callable) -> list:
+				result = []
+				for node, value in items:
+					result.append(value if node is None else node(values, bare, text))
+				return result
+			return build_list
+		if isinstance(template, str) is True and SignalBuilder.PLACEHOLDER_BEGIN in template:
+			parts = []
+			for part in template.split(SignalBuilder.PLACEHOLDER_BEGIN):
+				if SignalBuilder.PLACEHOLDER_END in part:
+					position, suffix = part.split(SignalBuilder.PLACEHOLDER_END, 1)
+					parts.append(int(position))
+					if suffix != '':
+						parts.append(suffix)
+				elif part != '':
+					parts.append(part)
+			if len(parts) == 1 and isinstance(parts[0], int) is True:
+				name = self.names[parts[0]]
+				if parts[0] in self.bare_positions:
+					def build_bare(values: dict, bare: typing_Callable, text: typing_Callable) -> Any:
+						return bare(values[name])
+					return build_bare
+				def build_text(values: dict, bare: typing_Callable, text: typing_Callable) -> str:
+					return text(values[name])
+				return build_text
+			parts = tuple((self.names[part], None) if isinstance(part, int) is True else (None, part) for part in parts)
+			def build_concat(values: dict, bare: typing_Callable, text: typing_Callable) -> str:
+				return ''.join([text(values[name]) if name is not None else constant for name, constant in parts])
+			return build_concat
+		def build_constant(values: dict, bare: typing_Callable, text: typing_Callable) -> Any:
+			return template
+		return build_constant
+
+
+	def compile_item(self, template: Any) -> tuple:
+		# returns (None, constant) for scalar constants (inlined into their container's closure), else (closure, None)
+		if isinstance(template, (dict, list)) is False:
+			if isinstance(template, str) is False or SignalBuilder.PLACEHOLDER_BEGIN not in template:
+				return None, template
+		return self.compile(template), None
+
+
+	def build(self, values: dict, bare: typing_Callable[[Any], Any], text: typing_Callable[[Any], str]) -> Any:
+		return self.build_signal(values, bare, text)
+
 
 
 class Trigger(HAL9000_Trigger):
 
 	def __init__(self, trigger_name: str, **kwargs) -> None:
 		super().__init__('mqtt', trigger_name, **kwargs)
+		self.module.payload_regex = None
 		self.module.payload_jsonpath_parser = None
+		self.module.signal_builder = None
 		self.runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
 
 
@@ -23,8 +150,16 @@ class Trigger(HAL9000_Trigger):
 		self.module.config['payload-regex'] = configuration.getstring(section_name, 'mqtt-payload-regex', fallback=None)
 		self.module.config['payload-jsonpath'] = configuration.getstring(section_name, 'mqtt-payload-jsonpath', fallback=None)
 		self.module.config['signal-json-formatter'] = configuration.getstring(section_name, 'signal-json-formatter', fallback=None)
+		if self.module.config['payload-regex'] is not None:
+			self.module.payload_regex = re_compile(self.module.config['payload-regex'])
 		if self.module.config['payload-jsonpath'] is not None:
 			self.module.payload_jsonpath_parser = jsonpath_ng_ext_parse(self.module.config['payload-jsonpath'])
+		if self.module.config['signal-json-formatter'] is not None:
+			try:
+				self.module.signal_builder = SignalBuilder(self.module.config['signal-json-formatter'])
+			except Exception as e:
+				self.module.daemon.logger.warning(f"[trigger:mqtt] '{self.module.id}': signal-json-formatter can't be precompiled, " \
+				                                  f"using (slower) text formatting instead: {str(e)}")
 
 
 	def callbacks(self) -> dict:
@@ -34,23 +169,41 @@ class Trigger(HAL9000_Trigger):
 		return result
 
 
-	def handle(self, message: aiomqtt_Message) -> dict:
+	def regex(self) -> re_Pattern | None:
+		if self.module.payload_jsonpath_parser is not None:
+			return None # also creates signals from the payload's json
+		return self.module.payload_regex
+
+
+	def handle(self, message: TopicMessage) -> dict:
 		signal = None
 		if self.module.config['signal-json-formatter'] is not None:
+			trace = self.module.daemon.logger.isEnabledFor(Daemon.LOGLEVEL_TRACE)
 			try:
-				self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): {message.topic} => {message.payload}")
-				payload = message.payload.decode('utf-8', 'surrogateescape')
-				if self.module.config['payload-regex'] is not None:
-					matches = re_match(self.module.config['payload-regex'], payload)
-					if matches is not None:
-						signal = json_loads(self.module.config['signal-json-formatter'] % matches.groupdict())
-				if self.module.config['payload-jsonpath'] is not None:
-					self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): payload-jsonpath (from brain.ini) = " \
-					                                                     f"'{self.module.config['payload-jsonpath']}'")
-					for match in self.module.payload_jsonpath_parser.find(json_loads(f'[{payload}]')):
-						signal_json = self.module.config['signal-json-formatter'] % {'jsonpath': json_dumps(match.value)}
-						self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): generated signal json = {signal_json}")
-						signal = json_loads(signal_json)
+				if trace is True:
+					self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): {message.topic} => {message.payload}")
+				if self.module.payload_regex is not None:
+					if message.regex_matches is not None and self.module.id in message.regex_matches:
+						groups = message.regex_matches[self.module.id] # matched by the daemon, combined with the topic's other triggers
+					else:
+						matches = self.module.payload_regex.match(message.text)
+						groups = matches.groupdict() if matches is not None else None
+					if groups is not None:
+						if self.module.signal_builder is not None:
+							signal = self.module.signal_builder.build(groups, json_loads, str)
+						else:
+							signal = json_loads(self.module.config['signal-json-formatter'] % groups)
+				if self.module.payload_jsonpath_parser is not None:
+					if trace is True:
+						self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): payload-jsonpath (from brain.ini) = " \
+						                                                     f"'{self.module.config['payload-jsonpath']}'")
+					for value in message.jsonpath(self.module.config['payload-jsonpath'], self.module.payload_jsonpath_parser):
+						if self.module.signal_builder is not None:
+							signal = self.module.signal_builder.build({'jsonpath': value}, copy_json, json_text)
+						else:
+							signal = json_loads(self.module.config['signal-json-formatter'] % {'jsonpath': json_dumps(value)})
+						if trace is True:
+							self.module.daemon.logger.log(Daemon.LOGLEVEL_TRACE, f"[mqtt] Trigger.handle(): generated signal = {signal}")
 			except Exception as e:
 				self.module.daemon.logger.error(f"Exception in MQTT.Trigger.handle(): {type(e)} => {str(e)}")
 			if signal is not None:
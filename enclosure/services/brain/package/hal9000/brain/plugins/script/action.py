@@ -1,30 +1,79 @@
-from os import system as os_system
+from os import killpg as os_killpg
 from os.path import exists as os_path_exists
+from signal import SIGKILL as signal_SIGKILL
 from configparser import ConfigParser as configparser_ConfigParser
+from asyncio import AbstractEventLoop as asyncio_AbstractEventLoop, \
+                    Semaphore as asyncio_Semaphore, \
+                    StreamReader as asyncio_StreamReader, \
+                    create_task as asyncio_create_task, \
+                    get_running_loop as asyncio_get_running_loop, \
+                    shield as asyncio_shield, \
+                    wait as asyncio_wait, \
+                    wait_for as asyncio_wait_for, \
+                    TimeoutError as asyncio_TimeoutError
+from asyncio.subprocess import PIPE as asyncio_subprocess_PIPE, \
+                               SubprocessStreamProtocol as asyncio_subprocess_SubprocessStreamProtocol
 
 from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL
 
 
+class ScriptProtocol(asyncio_subprocess_SubprocessStreamProtocol):
+	# resolves 'exited' once the shell itself has exited: Process.wait() also waits for the pipes to be closed,
+	# which (background) processes started by the script may keep open for as long as they run
+
+	def __init__(self, loop: asyncio_AbstractEventLoop) -> None:
+		super().__init__(limit=65536, loop=loop)
+		self.exited = loop.create_future()
+
+
+	def process_exited(self) -> None:
+		super().process_exited()
+		if self.exited.done() is False:
+			self.exited.set_result(None)
+
+
+
 class Action(HAL9000_Action):
+	# scripts run as (shell) subprocesses in their own process group, the signal handler only starts them;
+	# options with a ':' are per-script settings ('<id>:timeout', '<id>:single-instance'), all others are scripts
+	OPTIONS = frozenset(['plugin', 'hidden', 'timeout', 'max-concurrent', 'output-limit', 'output-timeout', \
+	                     'signal-queue-limit', 'signal-queue-overflow', 'signal-handler-timeout'])
+
 	def __init__(self, action_instance: str, **kwargs) -> None:
 		super().__init__('script', **kwargs)
 		self.module.hidden = True
 		self.module.daemon.plugins['script'].runlevel = RUNLEVEL.RUNNING
 		self.module.scripts = {}
+		self.module.running = {}
+		self.module.tasks = set()
+		self.module.concurrency = None
 
 
 	def configure(self, configuration: configparser_ConfigParser, section_name: str) -> None:
 		super().configure(configuration, section_name)
+		self.module.config['timeout'] = configuration.getfloat(section_name, 'timeout', fallback=0.0)
+		self.module.config['max-concurrent'] = configuration.getint(section_name, 'max-concurrent', fallback=2)
+		if self.module.config['max-concurrent'] <= 0:
+			self.module.daemon.logger.warning(f"[action:script] invalid value '{self.module.config['max-concurrent']}' for 'max-concurrent' " \
+			                                  f"in section '{section_name}', using '2' instead")
+			self.module.config['max-concurrent'] = 2
+		self.module.config['output-limit'] = configuration.getint(section_name, 'output-limit', fallback=4096)
+		self.module.config['output-timeout'] = configuration.getfloat(section_name, 'output-timeout', fallback=1.0)
+		self.module.concurrency = asyncio_Semaphore(self.module.config['max-concurrent'])
 		for option_name in configuration.options(section_name):
-			if option_name != 'plugin':
+			if option_name not in Action.OPTIONS and ':' not in option_name:
 				script_path = configuration.getstring(section_name, option_name, fallback=None)
 				if script_path is not None:
-					match os_path_exists(script_path):
+					match os_path_exists(script_path.split(' ', 1).pop(0)):
 						case True:
-							self.module.scripts[option_name] = script_path
+							self.module.scripts[option_name] = {'path': script_path,
+							                                    'timeout': configuration.getfloat(section_name, f'{option_name}:timeout', \
+							                                                                      fallback=self.module.config['timeout']),
+							                                    'single-instance': configuration.getboolean(section_name, f'{option_name}:single-instance', \
+							                                                                                fallback=False)}
 						case False:
 							self.module.daemon.logger.error(f"[action:script] script '{script_path}' (id '{option_name}') not found, skipping")
-		self.module.daemon.plugins['script'].addSignalHandler(self.on_script_signal)
+		self.module.daemon.plugins['script'].addSignalHandler(self.on_script_signal, ['id'])
 
 
 	async def on_script_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
@@ -33,6 +82,68 @@ class Action(HAL9000_Action):
 			if script_id not in self.module.scripts:
 				self.module.daemon.logger.warning(f"[action:script] ignoring signal with unknown script id '{script_id}'")
 				return
-			self.module.daemon.logger.info(f"[action:script] Executing configured script with id '{script_id}': {self.module.scripts[script_id]}")
-			os_system(self.module.scripts[script_id])
+			if self.module.scripts[script_id]['single-instance'] is True and self.module.running.get(script_id, 0) > 0:
+				self.module.daemon.logger.warning(f"[action:script] ignoring signal for script id '{script_id}' (single-instance, already running)")
+				return
+			self.module.running[script_id] = self.module.running.get(script_id, 0) + 1
+			task = asyncio_create_task(self.execute(script_id, signal.get('response')))
+			self.module.tasks.add(task) # strong reference until done
+			task.add_done_callback(self.module.tasks.discard)
+
+
+	async def execute(self, script_id: str, response_plugin: str | None) -> None:
+		script = self.module.scripts[script_id]
+		result = {'id': script_id, 'status': None, 'timeout': False}
+		transport = None
+		readers = []
+		try:
+			async with self.module.concurrency:
+				self.module.daemon.logger.info(f"[action:script] Executing configured script with id '{script_id}': {script['path']}")
+				loop = asyncio_get_running_loop()
+				transport, protocol = await loop.subprocess_shell(lambda: ScriptProtocol(loop), script['path'], stdin=None,
+				                                                  stdout=asyncio_subprocess_PIPE, stderr=asyncio_subprocess_PIPE, start_new_session=True)
+				stdout, stderr = bytearray(), bytearray()
+				readers = [asyncio_create_task(self.read_limited(protocol.stdout, stdout)), asyncio_create_task(self.read_limited(protocol.stderr, stderr))]
+				try:
+					await asyncio_wait_for(asyncio_shield(protocol.exited), script['timeout'] if script['timeout'] > 0 else None)
+				except asyncio_TimeoutError:
+					result['timeout'] = True
+					try:
+						os_killpg(transport.get_pid(), signal_SIGKILL) # the whole process group: the shell and whatever it started
+					except ProcessLookupError:
+						pass # exited (with all of its processes) just now
+					await protocol.exited
+					self.module.daemon.logger.warning(f"[action:script] script with id '{script_id}' killed after timeout of {script['timeout']}s")
+				result['status'] = transport.get_returncode()
+				done, pending = await asyncio_wait(readers, timeout=self.module.config['output-timeout'])
+				if len(pending) > 0:
+					self.module.daemon.logger.debug(f"[action:script] output of script with id '{script_id}' still open after it exited " \
+					                                f"(background processes?), not waiting for it")
+				result['stdout'] = stdout.decode(errors='replace')
+				result['stderr'] = stderr.decode(errors='replace')
+				if result['status'] != 0 and result['timeout'] is False:
+					self.module.daemon.logger.warning(f"[action:script] script with id '{script_id}' exited with status {result['status']}: " \
+					                                  f"{result['stderr']}")
+		except Exception as e:
+			result['error'] = str(e)
+			self.module.daemon.logger.error(f"[action:script] error while executing script with id '{script_id}': {str(e)}")
+		finally:
+			for reader in readers:
+				reader.cancel()
+			if transport is not None:
+				transport.close() # only our ends of the pipes once the shell has exited (processes it left running aren't killed)
+			self.module.running[script_id] -= 1
+		if response_plugin is not None:
+			self.module.daemon.queue_signal(response_plugin, {'script': result})
+
+
+	async def read_limited(self, stream: asyncio_StreamReader, data: bytearray) -> None:
+		# keeps (at most) the first 'output-limit' bytes but reads everything, a full pipe would block the script;
+		# collected into 'data' (instead of returned): still available if the reader is cancelled
+		while True:
+			chunk = await stream.read(65536)
+			if len(chunk) == 0:
+				return
+			if len(data) < self.module.config['output-limit']:
+				data += chunk[:self.module.config['output-limit'] - len(data)]
 
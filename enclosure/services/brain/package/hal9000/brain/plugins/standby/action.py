@@ -3,7 +3,8 @@ from datetime import time as datetime_time, \
                      datetime as datetime_datetime
 from configparser import ConfigParser as configparser_ConfigParser
 
-from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, DataInvalid, CommitPhase
+from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, DataInvalid, DATAINVALID_VALUES, CommitPhase
+from hal9000.brain.signals import Signal
 from hal9000.brain.plugins.brain import Action as Brain, STATUS as BRAIN_STATUS
 
 
@@ -43,7 +44,7 @@ class Action(HAL9000_Action):
 
 
 	def on_brain_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
-		if new_runlevel in list(DataInvalid):
+		if new_runlevel in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT:
 			match new_runlevel:
@@ -52,21 +53,21 @@ class Action(HAL9000_Action):
 				case RUNLEVEL.RUNNING:
 					if self.time_sleep != DataInvalid.UNINITIALIZED:
 						sleep_secs = (self.time_sleep.hour * 3600) + (self.time_sleep.minute * 60)
-						self.module.daemon.create_scheduled_signal(sleep_secs, 'brain', {'status': str(BRAIN_STATUS.ASLEEP)}, \
+						self.module.daemon.create_scheduled_signal(sleep_secs, 'brain', Signal.status(str(BRAIN_STATUS.ASLEEP)), \
 						                                           'scheduler://brain/time:sleep', 'cron')
 					if self.time_wakeup != DataInvalid.UNINITIALIZED:
 						wakeup_secs = (self.time_wakeup.hour * 3600) + (self.time_wakeup.minute * 60)
-						self.module.daemon.create_scheduled_signal(wakeup_secs, 'brain', {'status': str(BRAIN_STATUS.AWAKE)}, \
+						self.module.daemon.create_scheduled_signal(wakeup_secs, 'brain', Signal.status(str(BRAIN_STATUS.AWAKE)), \
 						                                           'scheduler://brain/time:wakeup', 'cron')
 		return True
 
 
 	def on_brain_status_callback(self, plugin: HAL9000_Plugin, key: str, old_status: str, new_status: str, phase: CommitPhase) -> bool:
-		if new_status in list(DataInvalid):
+		if new_status in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.LOCAL_REQUESTED:
 			if old_status == BRAIN_STATUS.LAUNCHING and new_status != BRAIN_STATUS.DYING:
-				if self.time_sleep not in list(DataInvalid) and self.time_wakeup not in list(DataInvalid):
+				if self.time_sleep not in DATAINVALID_VALUES and self.time_wakeup not in DATAINVALID_VALUES:
 					next_brain_status = BRAIN_STATUS.AWAKE
 					time_now = datetime_datetime.now().time()
 					if self.time_sleep > self.time_wakeup:
@@ -76,13 +77,13 @@ class Action(HAL9000_Action):
 						if time_now > self.time_sleep and time_now < self.time_wakeup:
 							next_brain_status = BRAIN_STATUS.ASLEEP
 					if next_brain_status != new_status:
-						self.module.daemon.queue_signal('brain', {'status': next_brain_status})
+						self.module.daemon.queue_signal('brain', Signal.status(next_brain_status))
 						return False
 		return True
 
 
 	def on_brain_time_callback(self, plugin: HAL9000_Plugin, key: str, old_time: str, new_time: str, phase: CommitPhase) -> bool:
-		if new_time in list(DataInvalid):
+		if new_time in DATAINVALID_VALUES:
 			return True
 		if phase == CommitPhase.COMMIT:
 			if self.module.daemon.plugins['brain'].runlevel == RUNLEVEL.SYNCING:
@@ -96,6 +97,6 @@ class Action(HAL9000_Action):
 						else:
 							if time_now > self.time_sleep and time_now < self.time_wakeup:
 								next_brain_status = BRAIN_STATUS.ASLEEP
-						self.module.daemon.queue_signal('brain', {'status': str(next_brain_status)})
+						self.module.daemon.queue_signal('brain', Signal.status(str(next_brain_status)))
 		return True
 
@@ -3,7 +3,8 @@ from json import dumps as json_dumps
 from datetime import datetime as datetime_datetime
 from configparser import ConfigParser as configparser_ConfigParser
 
-from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, DataInvalid, CommitPhase
+from hal9000.brain.plugin import HAL9000_Action, HAL9000_Plugin, RUNLEVEL, DataInvalid, DATAINVALID_VALUES, CommitPhase
+from hal9000.brain.signals import Signal
 from hal9000.brain.plugins.brain import Action as Brain, STATUS as BRAIN_STATUS
 
 
@@ -27,14 +28,14 @@ class Action(HAL9000_Action):
 		super().configure(configuration, section_name)
 		self.module.config['timeout-starting'] = configuration.getint('startup', 'timeout-starting', fallback=0)
 		self.module.config['require-synced-time'] = configuration.getboolean('startup', 'require-synced-time', fallback=False)
-		self.module.daemon.plugins['startup'].addSignalHandler(self.on_startup_signal)
+		self.module.daemon.plugins['startup'].addSignalHandler(self.on_startup_signal, ['timeout'])
 		self.module.daemon.plugins['brain'].addNameCallback(self.on_brain_runlevel_callback, 'runlevel')
 		self.module.daemon.plugins['frontend'].addNameCallback(self.on_frontend_screen_callback, 'screen')
 		if self.module.config['timeout-starting'] > 0:
 			self.module.daemon.create_scheduled_signal(self.module.config['timeout-starting'], 'startup', {'timeout': 'starting'}, \
 			                                           'scheduler://startup/timeout:starting')
 		if self.module.config['require-synced-time'] is True:
-			self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'startup: brain.time!=synchronized', self.runlevel_inhibitor_syncing_brain_time)
+			self.module.daemon.add_runlevel_inhibitor(RUNLEVEL.SYNCING, 'startup: brain.time!=synchronized', self.runlevel_inhibitor_syncing_brain_time, ['brain.time'])
 		self.runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
 		self.status = STATUS.WAITING_SYNCING, CommitPhase.COMMIT
 
@@ -55,12 +56,12 @@ class Action(HAL9000_Action):
 					                                   f"before startup timeout):")
 					for plugin in starting_plugins:
 						self.module.daemon.logger.critical(f"[startup] - Plugin '{plugin.module.id}'")
-				self.module.daemon.logger.debug(f"[startup] STATUS at startup-timeout = {self.module.daemon}")
+				self.module.daemon.logger.debug("[startup] STATUS at startup-timeout = {daemon}", daemon=self.module.daemon)
 				self.module.daemon.plugins['brain'].status = BRAIN_STATUS.DYING, CommitPhase.COMMIT
 
 
 	def on_brain_runlevel_callback(self, plugin: HAL9000_Plugin, key: str, old_runlevel: str, new_runlevel: str, phase: CommitPhase) -> bool:
-		if new_runlevel in list(DataInvalid):
+		if new_runlevel in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.COMMIT:
@@ -80,14 +81,14 @@ class Action(HAL9000_Action):
 
 
 	def on_frontend_screen_callback(self, plugin: HAL9000_Plugin, key: str, old_screen: str, new_screen: str, phase: CommitPhase) -> bool:
-		if new_screen in list(DataInvalid):
+		if new_screen in DATAINVALID_VALUES:
 			return True
 		match phase:
 			case CommitPhase.LOCAL_REQUESTED:
 				if new_screen == 'idle':
 					if self.module.daemon.plugins['brain'].runlevel == RUNLEVEL.PREPARING:
 						if old_screen != 'none':
-							self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'none', 'parameter': {}}}})
+							self.module.daemon.queue_signal('frontend', Signal.gui_screen('none'))
 						return False
 			case CommitPhase.COMMIT:
 				match new_screen:
@@ -106,15 +107,15 @@ class Action(HAL9000_Action):
 		match self.module.daemon.plugins['brain'].status:
 			case BRAIN_STATUS.AWAKE:
 				self.module.daemon.logger.info(f"[startup] Now presenting welcome message")
-				self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'animations', 'parameter': {'name': 'hal9000'}}}})
-				self.module.daemon.queue_signal('frontend', {'gui': {'overlay': {'name': 'none', 'parameter': {}}}})
+				self.module.daemon.queue_signal('frontend', Signal.gui_screen('animations', {'name': 'hal9000'}))
+				self.module.daemon.queue_signal('frontend', Signal.gui_overlay('none'))
 				self.module.daemon.queue_signal('frontend', {'system': {'features': {'display': {'backlight': True}}}})
-				self.module.daemon.create_scheduled_signal(1.5, 'kalliope', {'command': {'name': 'welcome'}}, 'scheduler://kalliope/welcome:delay)')
+				self.module.daemon.create_scheduled_signal(1.5, 'kalliope', Signal.command('welcome'), 'scheduler://kalliope/welcome:delay)')
 			case BRAIN_STATUS.ASLEEP:
 				self.module.daemon.logger.info(f"[startup] Skipping welcome message (currently in sleep mode)")
 				self.module.daemon.queue_signal('frontend', {'system': {'features': {'display': {'backlight': False}}}})
-				self.module.daemon.queue_signal('frontend', {'gui': {'screen': {'name': 'idle', 'parameter': {}}}})
-				self.module.daemon.queue_signal('frontend', {'gui': {'overlay': {'name': 'none', 'parameter': {}}}})
-				self.module.daemon.queue_signal('kalliope', {'status': 'sleeping'})
+				self.module.daemon.queue_signal('frontend', Signal.gui_screen('idle'))
+				self.module.daemon.queue_signal('frontend', Signal.gui_overlay('none'))
+				self.module.daemon.queue_signal('kalliope', Signal.status('sleeping'))
 		self.status = STATUS.FINISHED
 
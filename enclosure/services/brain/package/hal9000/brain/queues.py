@@ -0,0 +1,76 @@
+from collections import deque as collections_deque
+
+from hal9000.queues import BoundedQueue
+from .signals import LANE
+
+LANE_NAMES = tuple(lane.name.lower() for lane in LANE)
+
+
+class LaneQueue(BoundedQueue):
+	# BoundedQueue of dicts with a 'lane' item: FIFO within a lane, lower lanes (LANE.INTERACTIVE) are always served first;
+	# on overflow the oldest item of the highest non-empty lane is dropped (or the new item, if its lane is higher than all
+	# queued items: a background item never displaces an interactive one) and coalescing is confined to the lane of the new item
+
+	def _init(self, maxsize: int) -> None:
+		self._queue = tuple(collections_deque() for lane in LANE)
+		self._size = 0
+		self.queued = [0] * len(LANE)
+
+
+	def _put(self, item: dict) -> None:
+		lane = item['lane']
+		self._queue[lane].append(item)
+		self._size += 1
+		self.queued[lane] += 1
+
+
+	def _get(self) -> dict:
+		for lane in self._queue:
+			if len(lane) > 0:
+				self._size -= 1
+				return lane.popleft()
+		raise IndexError('LaneQueue._get(): queue is empty')
+
+
+	def _remove(self, item: dict) -> None:
+		lane = self._queue[item['lane']]
+		for index, queued in enumerate(lane):
+			if queued is item:
+				del lane[index]
+				self._size -= 1
+				return
+		raise ValueError('LaneQueue._remove(): item is not queued')
+
+
+	def _oldest(self, item: dict) -> dict:
+		for index in range(len(self._queue)-1, -1, -1):
+			if len(self._queue[index]) > 0:
+				if item['lane'] > index:
+					return item
+				return self._queue[index][0]
+		raise IndexError('LaneQueue._oldest(): queue is empty')
+
+
+	def _superseded(self, item: dict) -> dict | None:
+		key = self.key(item)
+		for queued in reversed(self._queue[item['lane']]):
+			if self.key(queued) == key:
+				return queued
+		return None
+
+
+	def qsize(self) -> int:
+		return self._size
+
+
+	def empty(self) -> bool:
+		return self._size == 0
+
+
+	def get_metrics(self) -> dict:
+		metrics = super().get_metrics()
+		metrics['lanes'] = {}
+		for lane in LANE:
+			metrics['lanes'][LANE_NAMES[lane]] = {'queued': self.queued[lane], 'backlog': len(self._queue[lane])}
+		return metrics
+
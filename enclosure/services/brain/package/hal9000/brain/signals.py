@@ -0,0 +1,189 @@
+from __future__ import annotations
+from enum import StrEnum as enum_StrEnum, \
+                 IntEnum as enum_IntEnum
+from typing import Any
+from copy import deepcopy as copy_deepcopy
+from contextvars import ContextVar as contextvars_ContextVar
+
+
+class TAG(enum_StrEnum):
+	GUI_SCREEN  = 'gui/screen'
+	GUI_OVERLAY = 'gui/overlay'
+	VOLUME      = 'volume'
+	STATUS      = 'status'
+	RUNLEVEL    = 'runlevel'
+	COMMAND     = 'command'
+	ERROR       = 'error'
+	SYSTEM      = 'system'
+	TIME        = 'time'
+
+
+class LANE(enum_IntEnum):
+	INTERACTIVE = 0 # user input (and whatever is signalled while handling it)
+	DEFAULT     = 1
+	BACKGROUND  = 2 # scheduler, errors
+
+# lane of the signal currently being handled: signals queued by its handlers inherit it
+SIGNAL_LANE = contextvars_ContextVar('SIGNAL_LANE', default=LANE.DEFAULT)
+
+
+class Signal(dict):
+	# the tags are classified on first use and again after a change of a top-level key of the SCHEMA (by item
+	# assignment or deletion, update() and the like); nested values are classified by their keys only: replace a
+	# nested dict (e.g. signal['gui']) instead of changing its keys in place
+	__slots__ = ('tags_cache',)
+
+	NO_TAGS          = frozenset()
+	TAGS_GUI_SCREEN  = frozenset([TAG.GUI_SCREEN])
+	TAGS_GUI_OVERLAY = frozenset([TAG.GUI_OVERLAY])
+	TAGS_VOLUME      = frozenset([TAG.VOLUME])
+	TAGS_STATUS      = frozenset([TAG.STATUS])
+	TAGS_RUNLEVEL    = frozenset([TAG.RUNLEVEL])
+	TAGS_COMMAND     = frozenset([TAG.COMMAND])
+	TAGS_ERROR       = frozenset([TAG.ERROR])
+	TAGS_SYSTEM      = frozenset([TAG.SYSTEM])
+	TAGS_TIME        = frozenset([TAG.TIME])
+	SCHEMA = {'gui':      {'screen': TAGS_GUI_SCREEN, 'overlay': TAGS_GUI_OVERLAY},
+	          'volume':   TAGS_VOLUME,
+	          'status':   TAGS_STATUS,
+	          'runlevel': TAGS_RUNLEVEL,
+	          'command':  TAGS_COMMAND,
+	          'error':    TAGS_ERROR,
+	          'system':   TAGS_SYSTEM,
+	          'time':     TAGS_TIME}
+
+	def __init__(self, data: dict | None = None, tags: frozenset | None = None) -> None:
+		if data is not None:
+			super().__init__(data)
+		self.tags_cache = tags
+
+
+	@property
+	def tags(self) -> frozenset:
+		if self.tags_cache is None:
+			self.tags_cache = Signal.classify(self)
+		return self.tags_cache
+
+
+	def __setitem__(self, key: str, value: Any) -> None:
+		super().__setitem__(key, value)
+		if key in Signal.SCHEMA:
+			self.tags_cache = None
+
+
+	def __delitem__(self, key: str) -> None:
+		super().__delitem__(key)
+		if key in Signal.SCHEMA:
+			self.tags_cache = None
+
+
+	def __ior__(self, other: dict) -> Signal:
+		self.update(other)
+		return self
+
+
+	def update(self, *args, **kwargs) -> None:
+		super().update(*args, **kwargs)
+		self.tags_cache = None
+
+
+	def setdefault(self, key: str, default: Any = None) -> Any:
+		if key in Signal.SCHEMA:
+			self.tags_cache = None
+		return super().setdefault(key, default)
+
+
+	def pop(self, *args) -> Any:
+		self.tags_cache = None
+		return super().pop(*args)
+
+
+	def popitem(self) -> tuple:
+		self.tags_cache = None
+		return super().popitem()
+
+
+	def clear(self) -> None:
+		super().clear()
+		self.tags_cache = None
+
+
+	@staticmethod
+	def classify(data: dict) -> frozenset:
+		tags = Signal.NO_TAGS
+		for key, value in data.items():
+			schema = Signal.SCHEMA.get(key)
+			if schema is None:
+				continue
+			if isinstance(schema, dict) is False:
+				tags = schema if tags is Signal.NO_TAGS else tags | schema
+			elif isinstance(value, dict) is True:
+				for sub_key in value.keys():
+					if sub_key in schema:
+						tags = schema[sub_key] if tags is Signal.NO_TAGS else tags | schema[sub_key]
+		return tags
+
+
+	def copy(self) -> Signal:
+		# a deep copy with the same tags: each plugin of a broadcast ('*') gets its own (handlers may change their signal)
+		return Signal(copy_deepcopy(dict(self)), self.tags_cache)
+
+
+	def family(self) -> frozenset | tuple:
+		# identifies signals that supersede each other (for coalescing): the tags or else the top-level keys
+		return self.tags if len(self.tags) > 0 else tuple(self.keys())
+
+
+	def path(self, depth: int = 3) -> str:
+		# the chain of single keys (a top-level 'trace' is ignored), e.g. 'gui/screen' for {'gui': {'screen': {'name': ..., 'parameter': ...}}}
+		keys = [key for key in self.keys() if key != 'trace']
+		if len(keys) != 1:
+			return ''
+		path = keys
+		value = self[keys[0]]
+		while len(path) < depth and isinstance(value, dict) is True and len(value) == 1:
+			key = next(iter(value))
+			path.append(key)
+			value = value[key]
+		return '/'.join(path)
+
+
+	@staticmethod
+	def from_dict(data: dict) -> Signal:
+		if isinstance(data, Signal) is True:
+			return data
+		return Signal(data)
+
+
+	@staticmethod
+	def gui_screen(name: str, parameter: dict | None = None) -> Signal:
+		return Signal({'gui': {'screen': {'name': name, 'parameter': parameter if parameter is not None else {}}}}, Signal.TAGS_GUI_SCREEN)
+
+
+	@staticmethod
+	def gui_overlay(name: str, parameter: dict | None = None) -> Signal:
+		return Signal({'gui': {'overlay': {'name': name, 'parameter': parameter if parameter is not None else {}}}}, Signal.TAGS_GUI_OVERLAY)
+
+
+	@staticmethod
+	def volume(**volume) -> Signal:
+		return Signal({'volume': volume}, Signal.TAGS_VOLUME)
+
+
+	@staticmethod
+	def status(status: str | None) -> Signal:
+		return Signal({'status': status}, Signal.TAGS_STATUS)
+
+
+	@staticmethod
+	def runlevel(runlevel: str | None) -> Signal:
+		return Signal({'runlevel': runlevel}, Signal.TAGS_RUNLEVEL)
+
+
+	@staticmethod
+	def command(name: str, parameter: Any = None) -> Signal:
+		command = {'name': name}
+		if parameter is not None:
+			command['parameter'] = parameter
+		return Signal({'command': command}, Signal.TAGS_COMMAND)
+
@@ -0,0 +1,81 @@
+from typing import Any
+from string import Formatter as string_Formatter
+from inspect import isawaitable as inspect_isawaitable
+
+from hal9000.logger import Logger
+
+
+class Template(object):
+	# a data structure (dicts, lists, strings with str.format() fields) compiled once into a substitution plan:
+	# render() returns a new structure (the compiled data is never modified), only the strings with fields are
+	# formatted and only the variables that are referenced by the template are resolved (see resolve())
+	CONSTANT = 0
+	FORMAT = 1
+	LIST = 2
+	DICT = 3
+
+	formatter = string_Formatter()
+
+	def __init__(self, data: Any, logger: Logger | None = None) -> None:
+		self.data = data
+		self.logger = logger if logger is not None else Logger()
+		self.variables = set()
+		self.plan = self.compile(data)
+		self.variables = frozenset(self.variables)
+
+
+	def compile(self, data: Any) -> tuple:
+		if isinstance(data, list) is True:
+			return Template.LIST, [self.compile(value) for value in data] # always re-built: results never share mutable data
+		if isinstance(data, dict) is True:
+			return Template.DICT, [(key, self.compile(value)) for key, value in data.items()]
+		if isinstance(data, str) is True and ('{' in data or '}' in data):
+			try:
+				fields = [field for text, field, spec, conversion in Template.formatter.parse(data) if field is not None]
+			except ValueError as e:
+				self.logger.warning(f"[template] invalid format string '{data}', not substituting it: {str(e)}")
+				return Template.CONSTANT, data
+			if len(fields) == 0:
+				return Template.CONSTANT, data.format() # just escaped braces
+			for field in fields:
+				self.variables.add(field.split('.', 1)[0].split('[', 1)[0])
+			return Template.FORMAT, data
+		return Template.CONSTANT, data
+
+
+	async def resolve(self, vars: dict) -> dict:
+		# variables may be provided as callables (or coroutine functions), which are only called if referenced
+		result = {}
+		for name in self.variables:
+			if name in vars:
+				value = vars[name]
+				if callable(value) is True:
+					value = value()
+					if inspect_isawaitable(value) is True:
+						value = await value
+				result[name] = value
+		return result
+
+
+	def render(self, vars: dict) -> Any:
+		return self.render_plan(self.plan, vars)
+
+
+	def render_plan(self, plan: tuple, vars: dict) -> Any:
+		kind, data = plan
+		match kind:
+			case Template.CONSTANT:
+				return data
+			case Template.FORMAT:
+				try:
+					return data.format_map(vars)
+				except (KeyError, IndexError, ValueError) as e:
+					self.logger.warning(f"[template] encountered unknown variable {str(e)} during substitution")
+					self.logger.debug("[template] substitution data (type={type}): {data}", type=lambda: type(self.data), data=self.data)
+					self.logger.debug("[template] substitution vars: {vars}", vars=vars)
+					return data
+			case Template.LIST:
+				return [self.render_plan(item, vars) for item in data]
+			case Template.DICT:
+				return {key: self.render_plan(value, vars) for key, value in data}
+
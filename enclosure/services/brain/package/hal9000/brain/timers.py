@@ -0,0 +1,92 @@
+from typing import Callable as typing_Callable
+from asyncio import AbstractEventLoop as asyncio_AbstractEventLoop
+
+from .signals import Signal
+
+
+class Timer(object):
+	__slots__ = ('id', 'seconds', 'plugin', 'signal', 'interval', 'deadline', 'handle')
+
+	def __init__(self, id: str, seconds: float, plugin: str, signal: Signal, interval: bool) -> None:
+		self.id = id
+		self.seconds = seconds
+		self.plugin = plugin
+		self.signal = signal
+		self.interval = interval
+		self.deadline = None
+		self.handle = None
+
+
+class Timers(object):
+	# one-shot and interval timers on top of the event loop's own timers, (re-)armed and cancelled by id:
+	# a timer with an existing id replaces that timer (like APScheduler's replace_existing=True)
+
+	def __init__(self, callback: typing_Callable[[str, Signal], None]) -> None:
+		self.callback = callback
+		self.loop = None
+		self.timers = {}
+		self.sequence = 0
+		self.metrics = {'armed': 0, 'fired': 0, 'cancelled': 0}
+
+
+	def start(self, loop: asyncio_AbstractEventLoop) -> None:
+		self.loop = loop
+		for timer in self.timers.values():
+			if timer.handle is None:
+				self.arm(timer, loop.time() + timer.seconds)
+
+
+	def shutdown(self) -> None:
+		for timer in self.timers.values():
+			if timer.handle is not None:
+				timer.handle.cancel()
+		self.timers.clear()
+		self.loop = None
+
+
+	def schedule(self, seconds: float, plugin: str, signal: Signal, id: str | None = None, interval: bool = False) -> str:
+		if id is None:
+			self.sequence += 1
+			id = f'timer://{self.sequence}'
+		self.cancel(id)
+		timer = Timer(id, max(seconds, 0), plugin, signal, interval)
+		self.timers[id] = timer
+		if self.loop is not None: # else armed by start()
+			self.arm(timer, self.loop.time() + timer.seconds)
+		return id
+
+
+	def cancel(self, id: str) -> bool:
+		timer = self.timers.pop(id, None)
+		if timer is None:
+			return False
+		if timer.handle is not None:
+			timer.handle.cancel()
+			self.metrics['cancelled'] += 1
+		return True
+
+
+	def get_timer(self, id: str) -> Timer | None:
+		return self.timers.get(id)
+
+
+	def arm(self, timer: Timer, deadline: float) -> None:
+		timer.deadline = deadline
+		timer.handle = self.loop.call_at(deadline, self.fire, timer)
+		self.metrics['armed'] += 1
+
+
+	def fire(self, timer: Timer) -> None:
+		if self.timers.get(timer.id) is not timer:
+			return
+		if timer.interval is True and timer.seconds > 0:
+			self.arm(timer, timer.deadline + timer.seconds) # relative to the previous deadline: no drift
+		else:
+			del self.timers[timer.id]
+		self.metrics['fired'] += 1
+		self.callback(timer.plugin, timer.signal)
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, pending=len(self.timers))
+
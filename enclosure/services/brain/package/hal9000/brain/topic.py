@@ -0,0 +1,180 @@
+from typing import Any
+from re import compile as re_compile, \
+               search as re_search, \
+               sub as re_sub, \
+               error as re_error, \
+               Pattern as re_Pattern, \
+               UNICODE as re_UNICODE
+from json import loads as json_loads
+
+
+class TopicTrieNode(object):
+	__slots__ = ('children', 'items', 'items_sleepless')
+
+	def __init__(self) -> None:
+		self.children = {}
+		self.items = []
+		self.items_sleepless = []
+
+
+class TopicTrie(object):
+	CACHE_SIZE_MAX = 1024
+
+	def __init__(self) -> None:
+		self.root = TopicTrieNode()
+		self.topic_filters = {}
+		self.sequence = 0
+		self.cache = {}
+
+
+	def add(self, topic_filter: str, item: Any, sleepless: bool = False) -> None:
+		levels = topic_filter.split('/')
+		for index, level in enumerate(levels):
+			if level == '#' and index != len(levels)-1:
+				raise ValueError(f"TopicTrie.add('{topic_filter}'): '#' is only valid as the last topic level")
+			if level not in ['+', '#'] and ('+' in level or '#' in level):
+				raise ValueError(f"TopicTrie.add('{topic_filter}'): wildcards must occupy an entire topic level")
+		node = self.root
+		for level in levels:
+			if level not in node.children:
+				node.children[level] = TopicTrieNode()
+			node = node.children[level]
+		self.sequence += 1
+		node.items.append((self.sequence, item))
+		if sleepless is True:
+			node.items_sleepless.append((self.sequence, item))
+		self.topic_filters.setdefault(topic_filter, []).append(item)
+		self.cache.clear()
+
+
+	def filters(self) -> dict:
+		return self.topic_filters
+
+
+	def match(self, topic: str, sleepless: bool = False) -> list:
+		key = (topic, sleepless)
+		if key in self.cache:
+			return self.cache[key]
+		matches = []
+		levels = topic.split('/')
+		self.collect(self.root, levels, 0, sleepless, topic.startswith('$'), matches)
+		if len(matches) > 1:
+			matches.sort(key=lambda match: match[0]) # registration order (as with the former per-topic lists)
+		result = [item for sequence, item in matches]
+		if len(self.cache) >= TopicTrie.CACHE_SIZE_MAX:
+			self.cache.clear()
+		self.cache[key] = result
+		return result
+
+
+	def collect(self, node: TopicTrieNode, levels: list, index: int, sleepless: bool, system_topic: bool, matches: list) -> None:
+		wildcards_allowed = index > 0 or system_topic is False # '$SYS/...' topics are not matched by wildcards at the first level
+		if '#' in node.children and wildcards_allowed is True:
+			matches.extend(node.children['#'].items_sleepless if sleepless is True else node.children['#'].items)
+		if index == len(levels):
+			matches.extend(node.items_sleepless if sleepless is True else node.items)
+			return
+		if levels[index] in node.children:
+			self.collect(node.children[levels[index]], levels, index+1, sleepless, system_topic, matches)
+		if '+' in node.children and wildcards_allowed is True:
+			self.collect(node.children['+'], levels, index+1, sleepless, system_topic, matches)
+
+
+	def __len__(self) -> int:
+		return len(self.topic_filters)
+
+
+class TopicMessage(object):
+	__slots__ = ('topic', 'payload', 'text_cache', 'json_cache', 'json_error', 'jsonpath_cache', 'regex_matches')
+
+	def __init__(self, topic: str, payload: bytes) -> None:
+		self.topic = topic
+		self.payload = payload
+		self.text_cache = None
+		self.json_cache = None
+		self.json_error = None
+		self.jsonpath_cache = {}
+		self.regex_matches = None
+
+
+	@property
+	def text(self) -> str:
+		if self.text_cache is None:
+			self.text_cache = self.payload.decode('utf-8', 'surrogateescape')
+		return self.text_cache
+
+
+	@property
+	def json(self) -> list:
+		if self.json_cache is None and self.json_error is None:
+			try:
+				self.json_cache = [json_loads(self.text)] if self.text.strip() != '' else []
+			except ValueError as e:
+				self.json_error = e
+		if self.json_error is not None:
+			raise self.json_error
+		return self.json_cache
+
+
+	def jsonpath(self, expression: str, parser: Any) -> list:
+		if expression not in self.jsonpath_cache:
+			self.jsonpath_cache[expression] = [match.value for match in parser.find(self.json)]
+		return self.jsonpath_cache[expression]
+
+
+class RegexDispatcher(object):
+	# matches the payload regexes of several triggers in a single scan: one alternation of the patterns (named groups
+	# renamed per pattern), each alternative wrapped in a named group that identifies its trigger; match() at position 0
+	# stops at the first matching alternative, the ones after it are then tried (again as one alternation) only if that
+	# alternative was not the last; patterns that can't be combined (global flags, numbered backreferences,
+	# conditionals) are matched individually
+	COMBINABLE_FLAGS = re_UNICODE
+
+	def __init__(self, patterns: dict) -> None:
+		self.results = dict.fromkeys(patterns.keys())
+		self.individual = {}
+		self.groups = {}
+		alternatives = []
+		for key, pattern in patterns.items():
+			source = self.rename_groups(pattern, len(alternatives))
+			if source is None:
+				self.individual[key] = pattern
+				continue
+			self.groups[f'm{len(alternatives)}'] = (len(alternatives), key, {f'p{len(alternatives)}_{name}': name for name in pattern.groupindex.keys()})
+			alternatives.append(f'(?P<m{len(alternatives)}>{source})')
+		self.combined = []
+		try:
+			for index in range(len(alternatives)):
+				self.combined.append(re_compile('|'.join(alternatives[index:]))) # combined[index]: the alternatives from index on
+		except re_error:
+			self.individual = patterns
+			self.groups = {}
+			self.combined = []
+
+
+	def rename_groups(self, pattern: re_Pattern, index: int) -> str | None:
+		source = pattern.pattern
+		if isinstance(source, str) is False or pattern.flags != RegexDispatcher.COMBINABLE_FLAGS:
+			return None # global (inline) flags can't be scoped to one alternative
+		if re_search(r'\\[1-9]|\\g<|\(\?\(|\\\(\?P', source) is not None:
+			return None # numbered backreferences, conditionals or escaped group-like text
+		source = re_sub(r'\(\?P<(\w+)>', lambda match: f'(?P<p{index}_{match.group(1)}>', source)
+		return re_sub(r'\(\?P=(\w+)\)', lambda match: f'(?P=p{index}_{match.group(1)})', source)
+
+
+	def match(self, text: str) -> dict:
+		# returns the groupdict() of each matching pattern (by key), None for the others
+		results = self.results.copy()
+		index = 0
+		while index < len(self.combined):
+			matches = self.combined[index].match(text)
+			if matches is None:
+				break
+			index, key, names = self.groups[matches.lastgroup] # the wrapping group closes last
+			results[key] = {name: matches.group(renamed) for renamed, name in names.items()}
+			index += 1
+		for key, pattern in self.individual.items():
+			matches = pattern.match(text)
+			if matches is not None:
+				results[key] = matches.groupdict()
+		return results
@@ -0,0 +1,62 @@
+from time import perf_counter as time_perf_counter
+from typing import Callable as typing_Callable, \
+                   Hashable as typing_Hashable
+from asyncio import wait_for as asyncio_wait_for, \
+                    TimeoutError as asyncio_TimeoutError
+
+from hal9000.queues import OVERFLOW
+from .plugin import HAL9000_Plugin
+from .signals import Signal, LANE, SIGNAL_LANE
+from .queues import LaneQueue
+
+
+class SignalWorker(object):
+	QUEUE_LIMIT = 100
+	QUEUE_OVERFLOW = OVERFLOW.DROP_NEWEST
+	HANDLER_TIMEOUT = 0.0 # off: a (positive) handler-timeout cancels the handler at whatever it awaits, plugins get no cleanup hook
+	                      # (so only configure it for plugins whose handlers leave no half-applied state when cancelled)
+
+	def __init__(self, plugin: HAL9000_Plugin, queue_limit: int = QUEUE_LIMIT, handler_timeout: float = HANDLER_TIMEOUT,
+	                   queue_overflow: OVERFLOW = QUEUE_OVERFLOW, coalesce: typing_Callable[[dict], typing_Hashable | None] | None = None) -> None:
+		self.plugin = plugin
+		self.queue = LaneQueue(max(queue_limit, 0), queue_overflow, lambda data: data['signal'].family(), coalesce,
+		                       name=f'signals:{plugin.module.name}', logger=plugin.module.daemon.logger)
+		self.handler_timeout = handler_timeout
+		self.metrics = {'queued': 0, 'handled': 0, 'timeouts': 0, 'errors': 0, 'seconds-max': 0.0}
+
+
+	def put(self, signal: Signal, lane: LANE = LANE.DEFAULT) -> bool:
+		overflows = self.queue.metrics['overflows']
+		self.queue.put_nowait({'signal': signal, 'lane': lane})
+		self.metrics['queued'] += 1
+		return self.queue.metrics['overflows'] == overflows
+
+
+	async def run(self) -> None:
+		logger = self.plugin.module.daemon.logger
+		while True:
+			data = await self.queue.get() # blocks until a signal is queued (no polling)
+			signal = data['signal']
+			SIGNAL_LANE.set(data['lane'])
+			start = time_perf_counter()
+			try:
+				if self.handler_timeout > 0:
+					await asyncio_wait_for(self.plugin.signal(signal), self.handler_timeout)
+				else:
+					await self.plugin.signal(signal)
+				self.metrics['handled'] += 1
+			except asyncio_TimeoutError:
+				self.metrics['timeouts'] += 1
+				logger.warning("[daemon] SIGNAL '{signal}' for plugin '{plugin}' cancelled after {timeout}s (handler-timeout)",
+				               signal=signal, plugin=self.plugin.module.name, timeout=self.handler_timeout)
+			except Exception as e:
+				self.metrics['errors'] += 1
+				logger.error(f"[daemon] SIGNAL '{signal}' for plugin '{self.plugin.module.name}' raised an exception: {str(e)}")
+			finally:
+				self.metrics['seconds-max'] = max(self.metrics['seconds-max'], time_perf_counter() - start)
+				self.queue.task_done()
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, queue=self.queue.get_metrics())
+
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+# Unit tests for the bounded queues (BoundedQueue and the brain's LaneQueue) and their overflow policies
+#
+# usage: python3 -m unittest discover -s tests (or: python3 -m pytest tests)
+
+from sys import path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from asyncio import create_task as asyncio_create_task, \
+                    sleep as asyncio_sleep, \
+                    wait_for as asyncio_wait_for
+from unittest import TestCase as unittest_TestCase, \
+                     IsolatedAsyncioTestCase as unittest_IsolatedAsyncioTestCase, \
+                     main as unittest_main
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.logger import Logger
+from hal9000.queues import BoundedQueue, OVERFLOW
+from hal9000.brain.signals import LANE
+from hal9000.brain.queues import LaneQueue
+
+
+def items(queue: BoundedQueue) -> list:
+	result = []
+	while queue.empty() is False:
+		result.append(queue.get_nowait())
+		queue.task_done()
+	return result
+
+
+class BoundedQueueTest(unittest_IsolatedAsyncioTestCase):
+
+	def create(self, limit: int, overflow: OVERFLOW, backpressure: bool = False) -> BoundedQueue:
+		return BoundedQueue(limit, overflow, lambda item: item['key'], name='test', backpressure=backpressure, logger=Logger('test'))
+
+
+	async def test_unbounded(self) -> None:
+		queue = self.create(0, OVERFLOW.DROP_OLDEST)
+		for index in range(100):
+			queue.put_nowait({'key': index})
+		self.assertEqual(queue.qsize(), 100)
+		self.assertFalse(queue.full())
+
+
+	async def test_drop_newest(self) -> None:
+		queue = self.create(2, OVERFLOW.DROP_NEWEST)
+		for index in range(4):
+			queue.put_nowait({'key': index})
+		self.assertEqual([item['key'] for item in items(queue)], [0, 1])
+		self.assertEqual(queue.get_metrics()['dropped'], 2)
+
+
+	async def test_drop_oldest(self) -> None:
+		queue = self.create(2, OVERFLOW.DROP_OLDEST)
+		for index in range(4):
+			queue.put_nowait({'key': index})
+		self.assertEqual([item['key'] for item in items(queue)], [2, 3])
+		self.assertEqual(queue.get_metrics()['dropped'], 2)
+
+
+	async def test_coalesce_by_key(self) -> None:
+		queue = self.create(3, OVERFLOW.COALESCE)
+		for key, value in [('a', 1), ('b', 2), ('c', 3), ('a', 4), ('d', 5)]:
+			queue.put_nowait({'key': key, 'value': value})
+		# 'a' superseded its queued item (queued at the tail), 'd' had no queued item with its key: the oldest was dropped
+		self.assertEqual([item['value'] for item in items(queue)], [3, 4, 5])
+		self.assertEqual(queue.get_metrics()['coalesced'], 1)
+		self.assertEqual(queue.get_metrics()['dropped'], 1)
+
+
+	async def test_block_rejects_put_nowait(self) -> None:
+		queue = self.create(1, OVERFLOW.BLOCK, True)
+		queue.put_nowait({'key': 1})
+		queue.put_nowait({'key': 2})
+		self.assertEqual([item['key'] for item in items(queue)], [1])
+		self.assertEqual(queue.get_metrics()['rejected'], 1)
+
+
+	async def test_block_put_waits(self) -> None:
+		queue = self.create(1, OVERFLOW.BLOCK, True)
+		await queue.put({'key': 1})
+		task = asyncio_create_task(queue.put({'key': 2}))
+		await asyncio_sleep(0)
+		self.assertFalse(task.done())
+		self.assertEqual(queue.get_nowait()['key'], 1)
+		await asyncio_wait_for(task, 1)
+		self.assertEqual(queue.get_nowait()['key'], 2)
+		self.assertEqual(queue.get_metrics()['blocked'], 1)
+
+
+	async def test_wait_for_space(self) -> None:
+		queue = self.create(1, OVERFLOW.BLOCK, True)
+		queue.put_nowait({'key': 1})
+		task = asyncio_create_task(queue.wait_for_space())
+		await asyncio_sleep(0)
+		self.assertFalse(task.done())
+		queue.get_nowait()
+		await asyncio_wait_for(task, 1)
+
+
+	async def test_join_after_drops(self) -> None:
+		for overflow in [OVERFLOW.DROP_OLDEST, OVERFLOW.COALESCE]:
+			queue = self.create(2, overflow)
+			for index in range(5):
+				queue.put_nowait({'key': index % 3})
+			items(queue)
+			await asyncio_wait_for(queue.join(), 1)
+
+
+	def test_configure(self) -> None:
+		queue = self.create(0, OVERFLOW.BLOCK)
+		queue.configure(10, OVERFLOW.DROP_OLDEST)
+		self.assertEqual(queue.maxsize, 10)
+		with self.assertRaises(ValueError):
+			queue.configure(10, 'invalid')
+		with self.assertRaises(ValueError):
+			queue.configure(10, OVERFLOW.BLOCK) # no backpressure
+		queue.configure(0, OVERFLOW.BLOCK)
+		with self.assertRaises(ValueError):
+			BoundedQueue(0, OVERFLOW.BLOCK).configure(10, OVERFLOW.COALESCE) # no key function
+
+
+
+class LaneQueueTest(unittest_TestCase):
+
+	def create(self, limit: int, overflow: OVERFLOW) -> LaneQueue:
+		return LaneQueue(limit, overflow, lambda item: item['key'], name='test', logger=Logger('test'))
+
+
+	def test_lanes_first(self) -> None:
+		queue = self.create(0, OVERFLOW.DROP_OLDEST)
+		for key, lane in [(1, LANE.BACKGROUND), (2, LANE.DEFAULT), (3, LANE.INTERACTIVE), (4, LANE.DEFAULT), (5, LANE.INTERACTIVE)]:
+			queue.put_nowait({'key': key, 'lane': lane})
+		self.assertEqual(queue.qsize(), 5)
+		self.assertEqual([item['key'] for item in items(queue)], [3, 5, 2, 4, 1])
+
+
+	def test_drop_oldest_of_highest_lane(self) -> None:
+		queue = self.create(2, OVERFLOW.DROP_OLDEST)
+		queue.put_nowait({'key': 1, 'lane': LANE.INTERACTIVE})
+		queue.put_nowait({'key': 2, 'lane': LANE.BACKGROUND})
+		queue.put_nowait({'key': 3, 'lane': LANE.DEFAULT})     # displaces the background item
+		queue.put_nowait({'key': 4, 'lane': LANE.BACKGROUND})  # never displaces a lower lane item: dropped itself
+		queue.put_nowait({'key': 5, 'lane': LANE.INTERACTIVE}) # displaces the default item
+		self.assertEqual([item['key'] for item in items(queue)], [1, 5])
+		self.assertEqual(queue.get_metrics()['dropped'], 3)
+
+
+	def test_coalesce_within_lane(self) -> None:
+		queue = self.create(2, OVERFLOW.COALESCE)
+		queue.put_nowait({'key': 'a', 'lane': LANE.DEFAULT, 'value': 1})
+		queue.put_nowait({'key': 'b', 'lane': LANE.DEFAULT, 'value': 2})
+		queue.put_nowait({'key': 'a', 'lane': LANE.DEFAULT, 'value': 3})
+		self.assertEqual([item['value'] for item in items(queue)], [2, 3])
+
+
+
+class CoalesceTest(unittest_IsolatedAsyncioTestCase):
+
+	def create(self, limit: int = 0, overflow: OVERFLOW = OVERFLOW.BLOCK) -> BoundedQueue:
+		# only items with a 'state' are coalesced (by it), like 'gui/screen' signals
+		return BoundedQueue(limit, overflow, lambda item: item['key'], lambda item: item.get('state'), \
+		                    name='test', backpressure=True, logger=Logger('test'))
+
+
+	async def test_merged_and_moved_to_tail(self) -> None:
+		queue = self.create()
+		queue.put_nowait({'key': 1, 'state': 'screen', 'name': 'idle', 'parameter': {}})
+		queue.put_nowait({'key': 2})
+		queue.put_nowait({'key': 3, 'state': 'screen', 'name': 'menu'})
+		self.assertEqual(items(queue), [{'key': 2}, {'key': 3, 'state': 'screen', 'name': 'menu', 'parameter': {}}])
+		self.assertEqual(queue.get_metrics()['coalesced'], 1)
+
+
+	async def test_not_coalesced(self) -> None:
+		queue = self.create()
+		for index in range(3):
+			queue.put_nowait({'key': index})
+		self.assertEqual(queue.qsize(), 3)
+		self.assertEqual(queue.get_metrics()['coalesced'], 0)
+
+
+	async def test_consumed_items_are_forgotten(self) -> None:
+		queue = self.create()
+		queue.put_nowait({'key': 1, 'state': 'screen'})
+		self.assertEqual(len(items(queue)), 1)
+		queue.put_nowait({'key': 2, 'state': 'screen'})
+		self.assertEqual(items(queue), [{'key': 2, 'state': 'screen'}])
+
+
+	async def test_dropped_items_are_forgotten(self) -> None:
+		queue = self.create(1, OVERFLOW.DROP_OLDEST)
+		queue.put_nowait({'key': 1, 'state': 'screen'})
+		queue.put_nowait({'key': 2})
+		queue.put_nowait({'key': 3, 'state': 'screen'})
+		self.assertEqual(items(queue), [{'key': 3, 'state': 'screen'}])
+
+
+	async def test_join(self) -> None:
+		queue = self.create()
+		for index in range(5):
+			queue.put_nowait({'key': index, 'state': 'screen'})
+		self.assertEqual(queue.qsize(), 1)
+		items(queue)
+		await asyncio_wait_for(queue.join(), 1)
+
+
+	async def test_lanes(self) -> None:
+		queue = LaneQueue(0, OVERFLOW.BLOCK, lambda item: item['key'], lambda item: item.get('state'), \
+		                  name='test', backpressure=True, logger=Logger('test'))
+		queue.put_nowait({'key': 1, 'state': 'screen', 'lane': LANE.BACKGROUND})
+		queue.put_nowait({'key': 2, 'lane': LANE.DEFAULT})
+		queue.put_nowait({'key': 3, 'state': 'screen', 'lane': LANE.INTERACTIVE})
+		self.assertEqual([item['key'] for item in items(queue)], [3, 2])
+
+
+if __name__ == '__main__':
+	unittest_main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+# Unit tests for the classification of signals (Signal.tags)
+#
+# usage: python3 -m unittest discover -s tests (or: python3 -m pytest tests)
+
+from sys import path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from unittest import TestCase as unittest_TestCase, \
+                     main as unittest_main
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.signals import Signal, TAG
+
+
+class SignalTest(unittest_TestCase):
+
+	def test_classify(self) -> None:
+		self.assertEqual(Signal({'gui': {'screen': {}, 'overlay': {}}}).tags, frozenset([TAG.GUI_SCREEN, TAG.GUI_OVERLAY]))
+		self.assertEqual(Signal({'volume': {'level': 50}, 'origin': 'frontend'}).tags, frozenset([TAG.VOLUME]))
+		self.assertEqual(Signal({'control': {'delta': 1}}).tags, Signal.NO_TAGS)
+		self.assertEqual(Signal.from_dict({'error': {'id': '100'}}).tags, frozenset([TAG.ERROR]))
+
+
+	def test_factories(self) -> None:
+		self.assertEqual(Signal.gui_screen('idle').tags, Signal.classify(Signal.gui_screen('idle')))
+		self.assertEqual(Signal.command('hello').tags, frozenset([TAG.COMMAND]))
+
+
+	def test_tags_follow_changes(self) -> None:
+		signal = Signal({'volume': {'level': 50}})
+		self.assertEqual(signal.tags, frozenset([TAG.VOLUME]))
+		signal['status'] = 'awake'
+		self.assertEqual(signal.tags, frozenset([TAG.VOLUME, TAG.STATUS]))
+		del signal['volume']
+		self.assertEqual(signal.tags, frozenset([TAG.STATUS]))
+		signal.update({'gui': {'screen': {}}})
+		self.assertEqual(signal.tags, frozenset([TAG.STATUS, TAG.GUI_SCREEN]))
+		signal.pop('status')
+		self.assertEqual(signal.tags, frozenset([TAG.GUI_SCREEN]))
+		signal |= {'time': {}}
+		self.assertEqual(signal.tags, frozenset([TAG.GUI_SCREEN, TAG.TIME]))
+		signal.clear()
+		self.assertEqual(signal.tags, Signal.NO_TAGS)
+
+
+	def test_copy(self) -> None:
+		signal = Signal({'error': {'id': '100'}})
+		copy = signal.copy()
+		copy['error']['id'] = '200'
+		self.assertEqual(signal['error']['id'], '100')
+		self.assertIsInstance(copy, Signal)
+		self.assertEqual(copy.tags, signal.tags)
+
+
+if __name__ == '__main__':
+	unittest_main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Unit tests for the event loop timers of scheduled signals (Timers)
+#
+# usage: python3 -m unittest discover -s tests (or: python3 -m pytest tests)
+
+from sys import path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from asyncio import sleep as asyncio_sleep, \
+                    get_running_loop as asyncio_get_running_loop
+from unittest import IsolatedAsyncioTestCase as unittest_IsolatedAsyncioTestCase, \
+                     main as unittest_main
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.signals import Signal
+from hal9000.brain.timers import Timers
+
+
+class TimersTest(unittest_IsolatedAsyncioTestCase):
+
+	async def asyncSetUp(self) -> None:
+		self.fired = []
+		self.timers = Timers(lambda plugin, signal: self.fired.append((plugin, signal)))
+		self.timers.start(asyncio_get_running_loop())
+
+
+	async def asyncTearDown(self) -> None:
+		self.timers.shutdown()
+
+
+	async def test_single(self) -> None:
+		signal = Signal.gui_screen('idle')
+		id = self.timers.schedule(0.01, 'frontend', signal)
+		self.assertIsNotNone(self.timers.get_timer(id))
+		await asyncio_sleep(0.05)
+		self.assertEqual(self.fired, [('frontend', signal)])
+		self.assertIsNone(self.timers.get_timer(id))
+		self.assertEqual(self.timers.get_metrics()['pending'], 0)
+
+
+	async def test_interval(self) -> None:
+		self.timers.schedule(0.01, 'brain', {'time': {}}, 'timer://interval', True)
+		await asyncio_sleep(0.055)
+		self.assertGreaterEqual(len(self.fired), 3)
+		self.assertTrue(self.timers.cancel('timer://interval'))
+		fired = len(self.fired)
+		await asyncio_sleep(0.03)
+		self.assertEqual(len(self.fired), fired)
+
+
+	async def test_replace_by_id(self) -> None:
+		self.timers.schedule(0.01, 'frontend', {'first': True}, 'scheduler://menu:timeout')
+		self.timers.schedule(0.02, 'frontend', {'second': True}, 'scheduler://menu:timeout')
+		await asyncio_sleep(0.05)
+		self.assertEqual(self.fired, [('frontend', {'second': True})])
+
+
+	async def test_cancel(self) -> None:
+		id = self.timers.schedule(0.01, 'frontend', {})
+		self.assertTrue(self.timers.cancel(id))
+		self.assertFalse(self.timers.cancel(id))
+		await asyncio_sleep(0.03)
+		self.assertEqual(self.fired, [])
+		self.assertEqual(self.timers.get_metrics()['cancelled'], 1)
+
+
+	async def test_armed_by_start(self) -> None:
+		timers = Timers(lambda plugin, signal: self.fired.append((plugin, signal)))
+		timers.schedule(0, 'brain', {'early': True}) # scheduled before the event loop is known
+		await asyncio_sleep(0.01)
+		self.assertEqual(self.fired, [])
+		timers.start(asyncio_get_running_loop())
+		await asyncio_sleep(0.01)
+		self.assertEqual(self.fired, [('brain', {'early': True})])
+
+
+	async def test_negative_seconds(self) -> None:
+		self.timers.schedule(-1, 'brain', {})
+		await asyncio_sleep(0.01)
+		self.assertEqual(len(self.fired), 1)
+
+
+if __name__ == '__main__':
+	unittest_main()
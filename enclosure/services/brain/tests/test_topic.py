@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# Unit tests for the MQTT topic trie (TopicTrie) and the combined payload regex matching (RegexDispatcher)
+#
+# usage: python3 -m unittest discover -s tests (or: python3 -m pytest tests)
+
+from sys import path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from re import compile as re_compile
+from unittest import TestCase as unittest_TestCase, \
+                     main as unittest_main
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.topic import TopicTrie, RegexDispatcher
+
+
+class TopicTrieTest(unittest_TestCase):
+
+	def setUp(self) -> None:
+		self.trie = TopicTrie()
+		self.trie.add('hal9000/event/frontend/device/input', 'exact')
+		self.trie.add('hal9000/event/+/device/input', 'plus')
+		self.trie.add('hal9000/event/#', 'hash')
+		self.trie.add('#', 'all', True)
+
+
+	def test_exact_and_wildcards(self) -> None:
+		self.assertEqual(self.trie.match('hal9000/event/frontend/device/input'), ['exact', 'plus', 'hash', 'all'])
+		self.assertEqual(self.trie.match('hal9000/event/kalliope/device/input'), ['plus', 'hash', 'all'])
+		self.assertEqual(self.trie.match('hal9000/event/frontend/device/input/extra'), ['hash', 'all'])
+		self.assertEqual(self.trie.match('hal9000/command/brain/status'), ['all'])
+
+
+	def test_hash_matches_parent_level(self) -> None:
+		self.assertEqual(self.trie.match('hal9000/event'), ['hash', 'all'])
+
+
+	def test_plus_matches_one_level_only(self) -> None:
+		trie = TopicTrie()
+		trie.add('a/+', 'plus')
+		self.assertEqual(trie.match('a/b'), ['plus'])
+		self.assertEqual(trie.match('a/'), ['plus'])
+		self.assertEqual(trie.match('a/b/c'), [])
+		self.assertEqual(trie.match('a'), [])
+
+
+	def test_system_topics(self) -> None:
+		self.trie.add('$SYS/#', 'sys')
+		self.assertEqual(self.trie.match('$SYS/broker/uptime'), ['sys'])
+
+
+	def test_sleepless(self) -> None:
+		self.assertEqual(self.trie.match('hal9000/event/frontend/device/input', True), ['all'])
+
+
+	def test_registration_order(self) -> None:
+		trie = TopicTrie()
+		trie.add('a/#', 1)
+		trie.add('a/b', 2)
+		trie.add('+/b', 3)
+		self.assertEqual(trie.match('a/b'), [1, 2, 3])
+
+
+	def test_cache_invalidated_by_add(self) -> None:
+		self.assertEqual(self.trie.match('other/topic'), ['all'])
+		self.trie.add('other/+', 'other')
+		self.assertEqual(self.trie.match('other/topic'), ['all', 'other'])
+
+
+	def test_invalid_filters(self) -> None:
+		for topic_filter in ['a/#/b', 'a/b#', 'a/+b']:
+			with self.assertRaises(ValueError):
+				self.trie.add(topic_filter, 'invalid')
+
+
+	def test_filters(self) -> None:
+		self.assertEqual(len(self.trie), 4)
+		self.assertEqual(self.trie.filters()['hal9000/event/#'], ['hash'])
+
+
+
+class RegexDispatcherTest(unittest_TestCase):
+	PATTERNS = {'control':  r'^{"name": "control", "event": {"delta": "(?P<delta>[+-]?[0-9]+)"}}$',
+	            'volume':   r'^{"name": "volume", "event": {"(?P<key>[a-z]+)": "(?P<value>[^"]*)"}}$',
+	            'any':      r'^{"name": "(?P<name>[a-z]+)"',
+	            'flags':    r'(?i)^{"NAME": "VOLUME"',
+	            'backref':  r'^{"(\w+)": "\1"',
+	            'repeated': r'^{"(?P<key>\w+)": "(?P=key)"'}
+	PAYLOADS = ['{"name": "control", "event": {"delta": "-2"}}',
+	            '{"name": "volume", "event": {"mute": "true"}}',
+	            '{"name": "name", "event": {}}',
+	            '{"other": "payload"}',
+	            '']
+
+	def setUp(self) -> None:
+		self.patterns = {key: re_compile(pattern) for key, pattern in RegexDispatcherTest.PATTERNS.items()}
+		self.dispatcher = RegexDispatcher(self.patterns)
+
+
+	def test_same_results_as_individual_matches(self) -> None:
+		for payload in RegexDispatcherTest.PAYLOADS:
+			expected = {}
+			for key, pattern in self.patterns.items():
+				matches = pattern.match(payload)
+				expected[key] = matches.groupdict() if matches is not None else None
+			self.assertEqual(self.dispatcher.match(payload), expected, payload)
+
+
+	def test_multiple_matches(self) -> None:
+		results = self.dispatcher.match('{"name": "volume", "event": {"level": "50"}}')
+		self.assertEqual(results['volume'], {'key': 'level', 'value': '50'})
+		self.assertEqual(results['any'], {'name': 'volume'})
+		self.assertEqual(results['flags'], {})
+		self.assertIsNone(results['control'])
+
+
+	def test_uncombinable_patterns(self) -> None:
+		self.assertEqual(sorted(self.dispatcher.individual.keys()), ['backref', 'flags'])
+		self.assertEqual(len(self.dispatcher.combined), 4)
+
+
+if __name__ == '__main__':
+	unittest_main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# Unit tests for the precompiled signal formatter of mqtt triggers (SignalBuilder)
+#
+# usage: python3 -m unittest discover -s tests (or: python3 -m pytest tests)
+
+from sys import path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from json import loads as json_loads, \
+                 dumps as json_dumps
+from unittest import TestCase as unittest_TestCase, \
+                     main as unittest_main
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.plugins.mqtt.trigger import SignalBuilder, copy_json, json_text
+
+
+class SignalBuilderTest(unittest_TestCase):
+
+	def assertBuildsLikeText(self, formatter: str, values: dict) -> None:
+		# the builder must create exactly what %-formatting plus json_loads() creates from the regex groups
+		self.assertEqual(SignalBuilder(formatter).build(values, json_loads, str), json_loads(formatter % values))
+
+
+	def test_regex_groups(self) -> None:
+		self.assertBuildsLikeText('["enclosure", {"control": {"delta": "%(delta)s"}}]', {'delta': '+1'})
+		self.assertBuildsLikeText('["enclosure", {"control": {"delta": %(delta)s}}]', {'delta': '-3'})
+		self.assertBuildsLikeText('["frontend", {"gui": {"screen": {"name": "x-%(name)s-y", "parameter": {}}}}]', {'name': 'menu'})
+		self.assertBuildsLikeText('["enclosure", {"%(key)s": "%(value)s"}]', {'key': 'rfid', 'value': '04:a2'})
+		self.assertBuildsLikeText('["brain", {"volume": [1, "%(a)s%(b)s", null, true, 1.5]}]', {'a': 'x', 'b': 'y'})
+
+
+	def test_percent_escape(self) -> None:
+		self.assertBuildsLikeText('["kalliope", {"volume": {"text": "%(level)s%%"}}]', {'level': '50'})
+
+
+	def test_jsonpath_values(self) -> None:
+		value = {'delta': '+1', 'list': [1, {'a': 'b'}]}
+		builder = SignalBuilder('["enclosure", {"volume": %(jsonpath)s, "text": "%(jsonpath)s"}]')
+		signal = builder.build({'jsonpath': value}, copy_json, json_text)
+		self.assertEqual(signal, ['enclosure', {'volume': value, 'text': json_dumps(value)}])
+		self.assertIsNot(signal[1]['volume'], value)
+		self.assertIsNot(signal[1]['volume']['list'], value['list'])
+
+
+	def test_new_containers_per_signal(self) -> None:
+		builder = SignalBuilder('["enclosure", {"control": {"delta": %(delta)s, "list": [1, 2]}}]')
+		first = builder.build({'delta': '1'}, json_loads, str)
+		second = builder.build({'delta': '2'}, json_loads, str)
+		first[1]['control']['list'].append(3)
+		self.assertEqual(second, ['enclosure', {'control': {'delta': 2, 'list': [1, 2]}}])
+
+
+	def test_missing_value(self) -> None:
+		with self.assertRaises(KeyError):
+			SignalBuilder('["enclosure", {"control": "%(delta)s"}]').build({}, json_loads, str)
+
+
+	def test_unsupported_formatters(self) -> None:
+		for formatter in ['["enclosure", {"control": "%s"}]', '["enclosure", {"control": %(delta)d}]', '["enclosure", {"control": %(delta']:
+			with self.assertRaises(ValueError):
+				SignalBuilder(formatter)
+
+
+if __name__ == '__main__':
+	unittest_main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Benchmark for coalescing of superseded signals and MQTT publishes during a (simulated) volume knob spin
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_coalesce.py [<STEP-COUNT>]
+#
+# Each knob step queues a 'gui/overlay' volume signal for a plugin whose handler takes 2ms (like the
+# frontend plugin's handler incl. its MQTT publish) and which publishes the overlay via the MQTT publish
+# queue; a knob step is queued every 0.5ms, the MQTT publisher is simulated with 1ms per message.
+# Reports handled signals, published messages and the lag between the last knob step and the last publish.
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from asyncio import run as asyncio_run, \
+                    create_task as asyncio_create_task, \
+                    gather as asyncio_gather, \
+                    sleep as asyncio_sleep
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.plugin import HAL9000_Plugin, RUNLEVEL, CommitPhase
+from hal9000.brain.plugins.brain import Action as Brain, STATUS
+from hal9000.brain.signals import Signal
+
+
+class Benchmark(object):
+
+	def __init__(self, count: int) -> None:
+		self.count = count
+		self.handled = 0
+		self.published = []
+
+
+	async def on_overlay_signal(self, plugin: HAL9000_Plugin, signal: Signal) -> None:
+		await asyncio_sleep(0.002)
+		self.handled += 1
+		plugin.module.daemon.mqtt_publish_queue.put_nowait({'topic': 'hal9000/command/frontend/gui/overlay', \
+		                                                    'payload': signal['gui']['overlay']['parameter']['level']})
+
+
+	async def task_mqtt_publisher(self, daemon: Daemon) -> None:
+		while True:
+			message = await daemon.mqtt_publish_queue.get()
+			await asyncio_sleep(0.001)
+			self.published.append((time_perf_counter(), message['payload']))
+			daemon.mqtt_publish_queue.task_done()
+
+
+	def create_daemon(self, coalesce: bool) -> Daemon:
+		daemon = Daemon()
+		daemon.config['signals:queue-limit'] = 0
+		Brain('default', daemon=daemon)
+		daemon.plugins['brain'].status = STATUS.AWAKE, CommitPhase.COMMIT
+		overlay = HAL9000_Plugin('action:overlay:default', daemon=daemon)
+		overlay.runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
+		overlay.addSignalHandler(self.on_overlay_signal, ['gui'])
+		if coalesce is True:
+			daemon.signal_coalesce = frozenset(['gui/overlay'])
+			daemon.signal_queue.coalesce = daemon.get_signal_coalesce_key
+			daemon.mqtt_publish_coalesce.add('hal9000/command/frontend/gui/overlay', True)
+			daemon.mqtt_publish_queue.coalesce = daemon.get_mqtt_publish_coalesce_key
+		return daemon
+
+
+	async def run(self, coalesce: bool) -> dict:
+		self.handled = 0
+		self.published = []
+		daemon = self.create_daemon(coalesce)
+		tasks = [asyncio_create_task(daemon.task_signal()), asyncio_create_task(self.task_mqtt_publisher(daemon))]
+		for level in range(0, self.count):
+			daemon.queue_signal('overlay', Signal.gui_overlay('volume', {'level': level}))
+			await asyncio_sleep(0.0005)
+		last_step = time_perf_counter()
+		while len(self.published) == 0 or self.published[-1][1] != self.count - 1:
+			await asyncio_sleep(0.001)
+		lag = self.published[-1][0] - last_step
+		for task in tasks + list(daemon.tasks.values()):
+			task.cancel()
+		await asyncio_gather(*tasks, *daemon.tasks.values(), return_exceptions=True)
+		return {'handled': self.handled, 'published': len(self.published), 'lag': lag * 1000}
+
+
+async def main(count: int) -> None:
+	benchmark = Benchmark(count)
+	for name, coalesce in [('no coalescing', False), ('coalescing', True)]:
+		result = await benchmark.run(coalesce)
+		print(f"{name:>16}: {count} knob steps, {result['handled']:5d} signals handled, {result['published']:5d} messages published, " \
+		      f"lag after last step {result['lag']:8.1f}ms")
+
+
+if __name__ == '__main__':
+	asyncio_run(main(int(sys_argv[1]) if len(sys_argv) > 1 else 200))
+
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# Benchmark for Daemon.get_system_ipv4() against the local NetworkManager stand-in (tools/dbus_networkmanager.py)
+#
+# usage: dbus-run-session -- env PYTHONPATH=package python3 tools/benchmark_ipv4.py [<LOOKUP-COUNT>]
+#
+# Compares the former implementation (a new system bus connection plus introspection of every object on each
+# call) with the cached SystemNetwork and checks that an address change is picked up via PropertiesChanged.
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os import environ as os_environ
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from asyncio import run as asyncio_run, \
+                    sleep as asyncio_sleep
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from dbus_fast.aio import MessageBus
+from dbus_fast.auth import AuthExternal, UID_NOT_SPECIFIED
+from dbus_fast.constants import BusType
+
+from hal9000.brain.daemon import Daemon
+from dbus_networkmanager import NetworkManager
+
+
+async def get_system_ipv4_uncached() -> str:
+	bus = await MessageBus(None, BusType.SYSTEM, AuthExternal(UID_NOT_SPECIFIED)).connect()
+	introspection = await bus.introspect('org.freedesktop.NetworkManager', '/org/freedesktop/NetworkManager')
+	obj = bus.get_proxy_object('org.freedesktop.NetworkManager', '/org/freedesktop/NetworkManager', introspection)
+	nm = obj.get_interface('org.freedesktop.NetworkManager')
+	for connection in await nm.get_active_connections():
+		introspection2 = await bus.introspect('org.freedesktop.NetworkManager', connection)
+		obj2 = bus.get_proxy_object('org.freedesktop.NetworkManager', connection, introspection2)
+		conf = obj2.get_interface('org.freedesktop.NetworkManager.Connection.Active')
+		if await conf.get_default() is True:
+			ip4config = await conf.get_ip4_config()
+			introspection3 = await bus.introspect('org.freedesktop.NetworkManager', ip4config)
+			obj3 = bus.get_proxy_object('org.freedesktop.NetworkManager', ip4config, introspection3)
+			data= obj3.get_interface('org.freedesktop.NetworkManager.IP4Config')
+			address_data = await data.get_address_data()
+			bus.disconnect() # the former implementation leaked the connection, not done here to not run out of connections
+			return address_data[0]['address'].value
+	return '127.0.0.1'
+
+
+async def main(count: int) -> None:
+	if 'DBUS_SESSION_BUS_ADDRESS' not in os_environ:
+		raise SystemExit("no session bus available, run with: dbus-run-session -- env PYTHONPATH=package python3 tools/benchmark_ipv4.py")
+	os_environ['DBUS_SYSTEM_BUS_ADDRESS'] = os_environ['DBUS_SESSION_BUS_ADDRESS']
+	network_manager = NetworkManager('192.168.0.42')
+	await network_manager.start()
+	daemon = Daemon()
+	for name, lookup in [('uncached', get_system_ipv4_uncached), ('cached', daemon.get_system_ipv4)]:
+		start = time_perf_counter()
+		for index in range(0, count):
+			ipv4 = await lookup()
+		duration = time_perf_counter() - start
+		print(f"{name:>10}: {duration / count * 1000000:10.2f}us per lookup, {count / duration:10.1f} lookups/sec ({ipv4})")
+	network_manager.set_address('10.0.0.7')
+	start = time_perf_counter()
+	while await daemon.get_system_ipv4() != '10.0.0.7' and time_perf_counter() - start < 5:
+		await asyncio_sleep(0.001)
+	print(f"{'change':>10}: {await daemon.get_system_ipv4()} after {(time_perf_counter() - start) * 1000:.1f}ms, metrics={daemon.network.get_metrics()}")
+	daemon.network.shutdown()
+	network_manager.stop()
+
+
+if __name__ == '__main__':
+	asyncio_run(main(int(sys_argv[1]) if len(sys_argv) > 1 else 200))
+
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# Benchmark for HAL9000_Plugin.__setattr__(): attribute commits/sec with the real plugin set loaded
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_plugin.py [<COMMIT-COUNT>]
+#
+# Loads the action plugins (brain, frontend, kalliope, standby, startup, enclosure, mqtt) through
+# Daemon.configure() - thereby registering all of their name callbacks - and then measures
+# committed (CommitPhase.COMMIT) and locally requested attribute changes on a few attributes;
+# 'bench.status' belongs to a plugin without any callbacks and thus measures the state store alone.
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os import unlink as os_unlink
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from tempfile import NamedTemporaryFile as tempfile_NamedTemporaryFile
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.plugin import HAL9000_Plugin, RUNLEVEL, CommitPhase
+
+
+CONFIGURATION = r'''
+[loggers]
+keys = root
+
+[handlers]
+keys = null
+
+[formatters]
+keys =
+
+[logger_root]
+level = INFO
+handlers = null
+
+[handler_null]
+class = NullHandler
+args = ()
+
+[action:brain]
+plugin = hal9000.brain.plugins.brain
+
+[action:frontend]
+plugin = hal9000.brain.plugins.frontend
+
+[action:kalliope]
+plugin = hal9000.brain.plugins.kalliope
+
+[action:standby]
+plugin = hal9000.brain.plugins.standby
+
+[standby]
+sleep-time = 23:00:00
+wakeup-time = 07:00:00
+
+[action:startup]
+plugin = hal9000.brain.plugins.startup
+
+[action:enclosure]
+plugin = hal9000.brain.plugins.enclosure
+
+[enclosure:components]
+
+[action:mqtt]
+plugin = hal9000.brain.plugins.mqtt
+'''
+
+ATTRIBUTES = [('bench',    'status',  ['idle', 'busy']),
+              ('enclosure','status',  ['idle', 'busy']),
+              ('brain',    'time',    ['synchronized', 'unsynchronized']),
+              ('frontend', 'screen',  ['idle', 'menu']),
+              ('kalliope', 'volume',  ['40', '60']),
+              ('kalliope', 'mute',    ['true', 'false'])]
+
+
+def create_daemon() -> Daemon:
+	daemon = Daemon()
+	with tempfile_NamedTemporaryFile('w', suffix='.ini', delete=False) as file:
+		file.write(CONFIGURATION)
+	try:
+		daemon.configure(file.name)
+	finally:
+		os_unlink(file.name)
+	daemon.plugins['brain'].runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
+	HAL9000_Plugin('action:bench:default', daemon=daemon)
+	return daemon
+
+
+def main(count: int) -> None:
+	daemon = create_daemon()
+	print(f"{'plugins loaded':>24}: {', '.join(daemon.plugins.keys())}")
+	for name, phase in [('commit', CommitPhase.COMMIT), ('local-requested', CommitPhase.LOCAL_REQUESTED)]:
+		for plugin_name, attribute, values in ATTRIBUTES:
+			plugin = daemon.plugins[plugin_name]
+			start = time_perf_counter()
+			for index in range(0, count):
+				if phase == CommitPhase.COMMIT:
+					setattr(plugin, attribute, (values[index % 2], phase))
+				else:
+					setattr(plugin, attribute, values[index % 2])
+			duration = time_perf_counter() - start
+			while daemon.signal_queue.empty() is False:
+				daemon.signal_queue.get_nowait()
+			while daemon.mqtt_publish_queue.empty() is False:
+				daemon.mqtt_publish_queue.get_nowait()
+			print(f"{f'{plugin_name}.{attribute}':>24} {name:>15}: {duration / count * 1000000:8.2f}us per change, {count / duration:10.1f} changes/sec")
+
+
+if __name__ == '__main__':
+	main(int(sys_argv[1]) if len(sys_argv) > 1 else 100000)
+
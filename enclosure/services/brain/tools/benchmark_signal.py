@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# Benchmark for Daemon.task_signal(): signals/sec and queue-to-handler latency (p50/p99)
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_signal.py [<SIGNAL-COUNT>]
+#
+# Runs the signal dispatcher with the former polling loop (10ms sleep between queue checks)
+# and with the event-driven Daemon.task_signal(), the latter with inline dispatching and with
+# per-plugin workers ('signals:dispatch'); the '+slow' runs additionally send every 10th signal
+# to a plugin whose handler takes 5ms (latencies are measured for the 'bench' plugin only); the
+# '+burst' runs queue a 1ms background signal for the 'bench' plugin along with each measured
+# signal, the latter either in the same lane ('workers') or in LANE.INTERACTIVE ('lanes').
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from statistics import quantiles as statistics_quantiles
+from asyncio import run as asyncio_run, \
+                    create_task as asyncio_create_task, \
+                    gather as asyncio_gather, \
+                    sleep as asyncio_sleep, \
+                    Event as asyncio_Event
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.plugin import HAL9000_Plugin, RUNLEVEL, CommitPhase
+from hal9000.brain.signals import LANE
+from hal9000.brain.plugins.brain import Action as Brain, STATUS
+
+
+class Benchmark(object):
+
+	def __init__(self, count: int) -> None:
+		self.count = count
+		self.latencies = []
+		self.finished = asyncio_Event()
+
+
+	async def on_slow_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
+		await asyncio_sleep(0.005)
+
+
+	async def on_bench_signal(self, plugin: HAL9000_Plugin, signal: dict) -> None:
+		if 'queued' not in signal:
+			await asyncio_sleep(0.001) # background work
+			return
+		self.latencies.append(time_perf_counter() - signal['queued'])
+		if len(self.latencies) >= self.count:
+			self.finished.set()
+
+
+	def create_daemon(self, dispatch: str) -> Daemon:
+		daemon = Daemon()
+		daemon.config['signals:dispatch'] = dispatch
+		daemon.config['signals:queue-limit'] = 0
+		Brain('default', daemon=daemon)
+		daemon.plugins['brain'].status = STATUS.AWAKE, CommitPhase.COMMIT
+		bench = HAL9000_Plugin('action:bench:default', daemon=daemon)
+		bench.runlevel = RUNLEVEL.RUNNING, CommitPhase.COMMIT
+		bench.addSignalHandler(self.on_bench_signal)
+		slow = HAL9000_Plugin('action:slow:default', daemon=daemon)
+		slow.addSignalHandler(self.on_slow_signal)
+		return daemon
+
+
+	async def task_signal_polling(self, daemon: Daemon) -> None:
+		while daemon.plugins['brain'].status != STATUS.DYING:
+			if daemon.signal_queue.empty() is False:
+				data = await daemon.signal_queue.get()
+				await daemon.plugins[data['plugin']].signal(data['signal'])
+			await asyncio_sleep(0.01)
+
+
+	async def producer(self, daemon: Daemon, mode: str, load: str) -> None:
+		for index in range(0, self.count):
+			if load == 'burst':
+				daemon.queue_signal('bench', {}, LANE.BACKGROUND if mode == 'lanes' else LANE.DEFAULT)
+			daemon.queue_signal('bench', {'queued': time_perf_counter()}, LANE.INTERACTIVE if mode == 'lanes' else LANE.DEFAULT)
+			if load == 'slow' and index % 10 == 0:
+				daemon.queue_signal('slow', {})
+			if index % 10 == 0:
+				await asyncio_sleep(0) # interleave producer and consumer like MQTT input does
+
+
+	async def run(self, mode: str, load: str) -> dict:
+		self.latencies = []
+		self.finished.clear()
+		daemon = self.create_daemon('inline' if mode in ['polling', 'inline'] else 'workers')
+		match mode:
+			case 'polling':
+				consumer = asyncio_create_task(self.task_signal_polling(daemon))
+			case other:
+				consumer = asyncio_create_task(daemon.task_signal())
+		start = time_perf_counter()
+		await self.producer(daemon, mode, load)
+		await self.finished.wait()
+		duration = time_perf_counter() - start
+		for task in [consumer] + list(daemon.tasks.values()):
+			task.cancel()
+		await asyncio_gather(consumer, *daemon.tasks.values(), return_exceptions=True)
+		percentiles = statistics_quantiles(self.latencies, n=100)
+		return {'signals/sec': self.count / duration, 'p50': percentiles[49] * 1000, 'p99': percentiles[98] * 1000}
+
+
+async def main(count: int) -> None:
+	benchmark = Benchmark(count)
+	for mode, load in [('polling', ''), ('inline', ''), ('workers', ''), ('inline', 'slow'), ('workers', 'slow'), ('workers', 'burst'), ('lanes', 'burst')]:
+		result = await benchmark.run(mode, load)
+		print(f"{mode + ('+' + load if load != '' else ''):>13}: {result['signals/sec']:10.1f} signals/sec, latency p50={result['p50']:8.3f}ms p99={result['p99']:8.3f}ms")
+
+
+if __name__ == '__main__':
+	asyncio_run(main(int(sys_argv[1]) if len(sys_argv) > 1 else 1000))
+
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# Benchmark for the substitution of variables in a (menu action) signal template
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_template.py [<RENDER-COUNT>]
+#
+# Compares the former recursive Daemon.substitute_vars() (which modified the data in place, so a deep
+# copy is needed to keep the menu data intact) with a compiled Template; the 'ipv4' variable is only
+# referenced by one of the two templates (and then resolved by a coroutine function).
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from copy import deepcopy as copy_deepcopy
+from time import perf_counter as time_perf_counter
+from asyncio import run as asyncio_run, \
+                    sleep as asyncio_sleep
+from typing import Any
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.templates import Template
+
+
+def substitute_vars_recursive(data: Any, vars: dict) -> Any:
+	if isinstance(data, list) is True:
+		for index, value in enumerate(data):
+			data[index] = substitute_vars_recursive(value, vars)
+	if isinstance(data, dict) is True:
+		for key, value in data.items():
+			data[key] = substitute_vars_recursive(value, vars)
+	if isinstance(data, str) is True:
+		data = data.format(**vars)
+	return data
+
+
+async def get_system_ipv4() -> str:
+	await asyncio_sleep(0) # a cached lookup, see hal9000.brain.network
+	return '192.168.0.42'
+
+
+async def main(count: int) -> None:
+	signals = {'ipv4': {'gui': {'screen': {'name': 'qrcode', 'parameter': {'title': 'Web-UI', 'url': 'http://{ipv4}:8080/', \
+	                                                                        'hint': 'scan with your phone'}}}},
+	           'none': {'system': {'time': {'ntp': {'sync': True}}, 'features': {'display': {'backlight': 'on', 'brightness': '100'}}}}}
+	for name, signal in signals.items():
+		start = time_perf_counter()
+		for index in range(0, count):
+			result = substitute_vars_recursive(copy_deepcopy(signal), {'ipv4': await get_system_ipv4()})
+		duration_recursive = time_perf_counter() - start
+		template = Template(signal)
+		start = time_perf_counter()
+		for index in range(0, count):
+			result = template.render(await template.resolve({'ipv4': get_system_ipv4}))
+		duration_template = time_perf_counter() - start
+		print(f"{name:>5}: recursive {duration_recursive / count * 1000000:8.2f}us, template {duration_template / count * 1000000:8.2f}us per render")
+
+
+if __name__ == '__main__':
+	asyncio_run(main(int(sys_argv[1]) if len(sys_argv) > 1 else 10000))
+
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Benchmark for re-arming a scheduled signal (like the volume overlay/menu timeouts on every rotary tick)
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_timer.py [<REARM-COUNT>]
+#
+# Compares the former APScheduler based Daemon.create_scheduled_signal() ('date' job with
+# replace_existing=True after remove_job()) with the event loop based Timers.
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from datetime import datetime as datetime_datetime, \
+                     timedelta as datetime_timedelta
+from asyncio import run as asyncio_run, \
+                    get_running_loop as asyncio_get_running_loop
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.signals import Signal
+
+
+def rearm_apscheduler(daemon: Daemon, signal: Signal) -> None:
+	id = 'scheduler://enclosure:volume/gui/overlay:timeout'
+	if daemon.scheduler.get_job(id) is not None:
+		daemon.scheduler.remove_job(id)
+	run_date = datetime_datetime.now() + datetime_timedelta(seconds=3)
+	daemon.scheduler.add_job(daemon.on_scheduler, 'date', run_date=run_date, args=['frontend', signal], id=id, name=id, replace_existing=True)
+
+
+def rearm_timers(daemon: Daemon, signal: Signal) -> None:
+	daemon.remove_scheduled_signal('scheduler://enclosure:volume/gui/overlay:timeout')
+	daemon.create_scheduled_signal(3, 'frontend', signal, 'scheduler://enclosure:volume/gui/overlay:timeout')
+
+
+async def main(count: int) -> None:
+	daemon = Daemon()
+	daemon.scheduler.start()
+	daemon.timers.start(asyncio_get_running_loop())
+	signal = Signal.gui_overlay('none')
+	for name, rearm in [('apscheduler', rearm_apscheduler), ('timers', rearm_timers)]:
+		start = time_perf_counter()
+		for index in range(0, count):
+			rearm(daemon, signal)
+		duration = time_perf_counter() - start
+		print(f"{name:>12}: {duration / count * 1000000:8.2f}us per re-arm, {count / duration:10.1f} re-arms/sec")
+	daemon.scheduler.shutdown()
+	daemon.timers.shutdown()
+
+
+if __name__ == '__main__':
+	asyncio_run(main(int(sys_argv[1]) if len(sys_argv) > 1 else 10000))
+
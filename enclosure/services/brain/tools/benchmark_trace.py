@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# Benchmark for the caller tracing of Daemon.queue_signal() with TRACE logging enabled
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_trace.py [<SIGNAL-COUNT>]
+#
+# Compares the former inspect.stack() based Daemon.add_caller_trace() with the frame-walking
+# one at different sample-rates (queue_signal() calls per second, as issued by a plugin method).
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from time import perf_counter as time_perf_counter
+from inspect import stack as inspect_stack
+from logging import getLogger as logging_getLogger
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.plugin import HAL9000_Plugin
+
+
+def add_caller_trace_inspect(self, signal: dict, trace_notice: str = '', stack_offset: int = 2) -> None:
+	if isinstance(signal, dict) is True:
+		stack = inspect_stack()
+		if stack_offset < len(stack):
+			fi = stack.pop(stack_offset)
+			caller = fi.function
+			if 'self' in fi.frame.f_locals:
+				if hasattr(fi.frame.f_locals['self'], 'module'):
+					caller = f"{fi.frame.f_locals['self'].module.id}<{fi.function}>"
+			signal['trace'] = caller
+			if trace_notice != '':
+				signal['trace'] += f' ({trace_notice})'
+		del stack # cycle breaking for GC
+
+
+class Bench(HAL9000_Plugin):
+
+	def __init__(self, **kwargs) -> None:
+		super().__init__('action:bench:default', **kwargs)
+
+
+	def on_bench_input(self, count: int) -> str:
+		for index in range(0, count):
+			self.module.daemon.queue_signal('bench', {'control': {'delta': '+1'}})
+			signal = self.module.daemon.signal_queue.get_nowait()['signal']
+		return signal.get('trace')
+
+
+def main(count: int) -> None:
+	daemon = Daemon()
+	logging_getLogger().setLevel(Daemon.LOGLEVEL_TRACE)
+	bench = Bench(daemon=daemon)
+	for name, sample_rate in [('disabled', None), ('inspect.stack()', 1.0), ('frame', 1.0), ('frame (rate=0.1)', 0.1), ('frame (rate=0.01)', 0.01)]:
+		vars(daemon).pop('add_caller_trace', None)
+		match name:
+			case 'disabled':
+				logging_getLogger().setLevel('INFO')
+			case 'inspect.stack()':
+				logging_getLogger().setLevel(Daemon.LOGLEVEL_TRACE)
+				daemon.add_caller_trace = lambda signal, trace_notice='', stack_offset=2: add_caller_trace_inspect(daemon, signal, trace_notice, stack_offset+1)
+			case other:
+				daemon.trace_sampling['rate'] = sample_rate
+		start = time_perf_counter()
+		trace = bench.on_bench_input(count)
+		duration = time_perf_counter() - start
+		print(f"{name:>24}: {duration / count * 1000000:8.2f}us per signal, {count / duration:10.1f} signals/sec (trace='{trace}')")
+
+
+if __name__ == '__main__':
+	main(int(sys_argv[1]) if len(sys_argv) > 1 else 10000)
+
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# Microbenchmark for the mqtt Trigger.handle() pipeline with typical 'device/input' payloads
+#
+# usage: PYTHONPATH=package python3 tools/benchmark_trigger.py [<MESSAGE-COUNT>]
+#
+# Compares the former text pipeline (uncompiled regex, '[payload]' wrapping, json_dumps of
+# jsonpath matches, %-formatting and json_loads of the result) with the precompiled one,
+# per trigger and for all triggers of a topic (sharing one parsed message context), and just the
+# signal building step (%-formatting plus json_loads vs SignalBuilder). Finally, the regex triggers
+# of a topic are matched per trigger and combined ([mqtt] trigger-regex-dispatch, RegexDispatcher).
+
+from sys import argv as sys_argv, \
+                path as sys_path
+from os.path import dirname as os_path_dirname, \
+                    abspath as os_path_abspath, \
+                    join as os_path_join
+from re import match as re_match
+from json import loads as json_loads, \
+                 dumps as json_dumps
+from time import perf_counter as time_perf_counter
+from configparser import ConfigParser as configparser_ConfigParser
+
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', 'package'))
+sys_path.insert(0, os_path_join(os_path_dirname(os_path_abspath(__file__)), '..', '..', 'shared', 'package'))
+
+from hal9000.brain.daemon import Daemon
+from hal9000.brain.topic import TopicMessage
+from hal9000.brain.plugins.mqtt import Trigger
+from hal9000.brain.plugins.mqtt.trigger import SignalBuilder, copy_json, json_text
+
+
+CONFIGURATION = r'''
+[trigger:control-regex]
+mqtt-topic = hal9000/event/frontend/device/input
+mqtt-payload-regex = ^{"source": {"type": "rotary", "name": "control"}, "event": {"delta": "(?P<delta>[+-]?[0-9]+)"}}$
+signal-json-formatter = ["enclosure", {"control": {"delta": "%(delta)s"}}]
+
+[trigger:volume-jsonpath]
+mqtt-topic = hal9000/event/frontend/device/input
+mqtt-payload-jsonpath = $[?(@.source.name=="volume")].event
+signal-json-formatter = ["enclosure", {"volume": %(jsonpath)s}]
+
+[trigger:control-jsonpath]
+mqtt-topic = hal9000/event/frontend/device/input
+mqtt-payload-jsonpath = $[?(@.source.name=="control")].event
+signal-json-formatter = ["enclosure", {"control": %(jsonpath)s}]
+'''
+
+PAYLOADS = [b'{"source": {"type": "rotary", "name": "control"}, "event": {"delta": "+1"}}',
+            b'{"source": {"type": "rotary", "name": "control"}, "event": {"delta": "-1"}}',
+            b'{"source": {"type": "rotary", "name": "volume"}, "event": {"delta": "+1"}}',
+            b'{"source": {"type": "button", "name": "volume"}, "event": {"status": "clicked"}}']
+
+
+class Message(object):
+
+	def __init__(self, topic: str, payload: bytes) -> None:
+		self.topic = topic
+		self.payload = payload
+
+
+def handle_text(trigger: Trigger, message: Message) -> list:
+	signal = None
+	payload = message.payload.decode('utf-8', 'surrogateescape')
+	if trigger.module.config['payload-regex'] is not None:
+		matches = re_match(trigger.module.config['payload-regex'], payload)
+		if matches is not None:
+			signal = json_loads(trigger.module.config['signal-json-formatter'] % matches.groupdict())
+	if trigger.module.config['payload-jsonpath'] is not None:
+		for match in trigger.module.payload_jsonpath_parser.find(json_loads(f'[{payload}]')):
+			signal = json_loads(trigger.module.config['signal-json-formatter'] % {'jsonpath': json_dumps(match.value)})
+	return signal
+
+
+def benchmark_builder(count: int) -> None:
+	for formatter, values, bare, text in [('["enclosure", {"control": {"delta": "%(delta)s"}}]', {'delta': '+1'}, json_loads, str),
+	                                      ('["enclosure", {"volume": %(jsonpath)s}]', {'jsonpath': {'delta': '+1'}}, copy_json, json_text)]:
+		builder = SignalBuilder(formatter)
+		text_values = {name: json_text(value) if bare is copy_json else value for name, value in values.items()}
+		start = time_perf_counter()
+		for index in range(0, count):
+			json_loads(formatter % text_values)
+		duration_text = time_perf_counter() - start
+		start = time_perf_counter()
+		for index in range(0, count):
+			builder.build(values, bare, text)
+		duration_builder = time_perf_counter() - start
+		print(f"{'build ' + ', '.join(values.keys()):>32}: text {duration_text / count * 1000000:8.2f}us, " \
+		      f"builder {duration_builder / count * 1000000:8.2f}us per signal")
+
+
+def benchmark_regex_dispatch(daemon: Daemon, messages: list, count: int) -> None:
+	configuration = configparser_ConfigParser(delimiters='=', interpolation=None, \
+	                                          converters={'string': lambda string: string.strip('"').strip("'")})
+	for name in ['control', 'volume', 'select', 'menu', 'light', 'motion', 'rfid', 'mode']:
+		for type in ['rotary', 'button']:
+			configuration.read_dict({f'trigger:{name}-{type}-regex': {'mqtt-topic': 'hal9000/event/frontend/device/input', \
+			                         'mqtt-payload-regex': f'^{{"source": {{"type": "{type}", "name": "{name}"}}, "event": {{"(?P<key>[a-z]+)": "(?P<value>[^"]*)"}}}}$', \
+			                         'signal-json-formatter': f'["enclosure", {{"{name}": {{"%(key)s": "%(value)s"}}}}]'}})
+	triggers = []
+	for section_name in configuration.sections():
+		trigger = Trigger(section_name.split(':', 1).pop(1), daemon=daemon)
+		trigger.configure(configuration, section_name)
+		triggers.append(trigger)
+	def dispatch(message: Message, combined: bool) -> dict:
+		signals = {}
+		context = TopicMessage(message.topic, message.payload)
+		if combined is True:
+			context.regex_matches = daemon.get_mqtt_regex_dispatcher(message.topic, False, triggers).match(context.text)
+		for trigger in triggers:
+			if context.regex_matches is not None and context.regex_matches.get(trigger.module.id, True) is None:
+				continue
+			signal = trigger.handle(context)
+			if signal is not None and len(signal) > 0:
+				signals[trigger.module.id] = signal
+		return signals
+	for message in messages[:len(PAYLOADS)]:
+		if dispatch(message, True) != dispatch(message, False):
+			print(f"MISMATCH (regex dispatch) for payload {message.payload}")
+	for name, combined in [('individual', False), ('combined', True)]:
+		start = time_perf_counter()
+		for message in messages:
+			dispatch(message, combined)
+		duration = time_perf_counter() - start
+		print(f"{f'{len(triggers)} regex triggers':>32} {name:>10}: {duration / count * 1000000:8.2f}us per message, {count / duration:10.1f} messages/sec")
+
+
+def main(count: int) -> None:
+	daemon = Daemon()
+	configuration = configparser_ConfigParser(delimiters='=', interpolation=None, \
+	                                          converters={'string': lambda string: string.strip('"').strip("'")})
+	configuration.read_string(CONFIGURATION)
+	triggers = []
+	for section_name in configuration.sections():
+		trigger = Trigger(section_name.split(':', 1).pop(1), daemon=daemon)
+		trigger.configure(configuration, section_name)
+		triggers.append(trigger)
+	messages = [Message('hal9000/event/frontend/device/input', PAYLOADS[index % len(PAYLOADS)]) for index in range(0, count)]
+	for message in messages[:len(PAYLOADS)]:
+		for trigger in triggers:
+			if handle_text(trigger, message) != trigger.handle(TopicMessage(message.topic, message.payload)):
+				print(f"MISMATCH for trigger '{trigger.module.id}' and payload {message.payload}")
+	for trigger in triggers:
+		for name, handle in [('text', handle_text), ('compiled', lambda trigger, message: trigger.handle(TopicMessage(message.topic, message.payload)))]:
+			start = time_perf_counter()
+			for message in messages:
+				handle(trigger, message)
+			duration = time_perf_counter() - start
+			print(f"{trigger.module.id:>32} {name:>8}: {duration / count * 1000000:8.2f}us per message, {count / duration:10.1f} messages/sec")
+	start = time_perf_counter()
+	for message in messages:
+		for trigger in triggers:
+			handle_text(trigger, message)
+	duration = time_perf_counter() - start
+	print(f"{'all triggers':>32} {'text':>8}: {duration / count * 1000000:8.2f}us per message, {count / duration:10.1f} messages/sec")
+	start = time_perf_counter()
+	for message in messages:
+		context = TopicMessage(message.topic, message.payload)
+		for trigger in triggers:
+			trigger.handle(context)
+	duration = time_perf_counter() - start
+	print(f"{'all triggers':>32} {'shared':>8}: {duration / count * 1000000:8.2f}us per message, {count / duration:10.1f} messages/sec")
+	benchmark_builder(count)
+	benchmark_regex_dispatch(daemon, messages, count)
+
+
+if __name__ == '__main__':
+	main(int(sys_argv[1]) if len(sys_argv) > 1 else 10000)
+
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Local D-Bus stand-in for NetworkManager (just the objects and properties used by hal9000.brain.network)
+#
+# usage: dbus-run-session -- python3 tools/dbus_networkmanager.py [<IPV4>]
+#
+# Exports the NetworkManager object, one (default) active connection and its IP4Config on the session bus
+# (clients use it as their system bus via DBUS_SYSTEM_BUS_ADDRESS=$DBUS_SESSION_BUS_ADDRESS); the tools
+# import NetworkManager from this module to run it on their own (private) bus connection.
+
+from sys import argv as sys_argv
+from asyncio import run as asyncio_run, \
+                    Event as asyncio_Event
+
+from dbus_fast import Variant
+from dbus_fast.aio import MessageBus
+from dbus_fast.constants import BusType, PropertyAccess
+from dbus_fast.service import ServiceInterface, dbus_property
+
+
+class Manager(ServiceInterface):
+
+	def __init__(self, connections: list) -> None:
+		super().__init__('org.freedesktop.NetworkManager')
+		self.connections = connections
+
+
+	@dbus_property(access=PropertyAccess.READ)
+	def ActiveConnections(self) -> 'ao':
+		return self.connections
+
+
+class ActiveConnection(ServiceInterface):
+
+	def __init__(self, ip4config: str, default: bool = True) -> None:
+		super().__init__('org.freedesktop.NetworkManager.Connection.Active')
+		self.ip4config = ip4config
+		self.default = default
+
+
+	@dbus_property(access=PropertyAccess.READ)
+	def Default(self) -> 'b':
+		return self.default
+
+
+	@dbus_property(access=PropertyAccess.READ)
+	def Ip4Config(self) -> 'o':
+		return self.ip4config
+
+
+class IP4Config(ServiceInterface):
+
+	def __init__(self, address: str) -> None:
+		super().__init__('org.freedesktop.NetworkManager.IP4Config')
+		self.address = address
+
+
+	@dbus_property(access=PropertyAccess.READ)
+	def AddressData(self) -> 'aa{sv}':
+		return [{'address': Variant('s', self.address), 'prefix': Variant('u', 24)}]
+
+
+class NetworkManager(object):
+	PATH = '/org/freedesktop/NetworkManager'
+
+	def __init__(self, address: str = '192.168.0.42') -> None:
+		self.bus = None
+		self.ip4config = IP4Config(address)
+		self.connection = ActiveConnection(f'{NetworkManager.PATH}/IP4Config/1')
+		self.manager = Manager([f'{NetworkManager.PATH}/ActiveConnection/1'])
+
+
+	async def start(self) -> None:
+		self.bus = await MessageBus(bus_type=BusType.SESSION).connect()
+		self.bus.export(NetworkManager.PATH, self.manager)
+		self.bus.export(f'{NetworkManager.PATH}/ActiveConnection/1', self.connection)
+		self.bus.export(f'{NetworkManager.PATH}/IP4Config/1', self.ip4config)
+		await self.bus.request_name('org.freedesktop.NetworkManager')
+
+
+	def set_address(self, address: str) -> None:
+		self.ip4config.address = address
+		self.ip4config.emit_properties_changed({'AddressData': self.ip4config.AddressData})
+
+
+	def stop(self) -> None:
+		self.bus.disconnect()
+
+
+async def main(address: str) -> None:
+	network_manager = NetworkManager(address)
+	await network_manager.start()
+	print(f"NetworkManager stand-in running with IPv4 address '{address}'")
+	await asyncio_Event().wait()
+
+
+if __name__ == '__main__':
+	asyncio_run(main(sys_argv[1] if len(sys_argv) > 1 else '192.168.0.42'))
+
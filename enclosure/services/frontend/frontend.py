@@ -4,6 +4,8 @@ from os.path import exists as os_path_exists
 from sys import argv as sys_argv, exit as sys_exit
 from time import monotonic as time_monotonic
 from json import loads as json_loads, dumps as json_dumps
+from signal import signal as signal_signal, \
+                   SIGUSR1 as signal_SIGUSR1
 from logging import getLogger as logging_getLogger, \
                     addLevelName as logging_addLevelName
 from importlib import import_module as importlib_import_module
@@ -14,6 +16,7 @@ from fastapi import FastAPI as fastapi_FastAPI
 from uvicorn import run as uvicorn_run
 from uvicorn.config import LOGGING_CONFIG as uvicorn_config_LOGGING_CONFIG
 
+from hal9000.logger import Logger, RingBufferHandler
 from hal9000.frontend import Frontend, RUNLEVEL, STATUS
 import hal9000.frontend.arduino
 import hal9000.frontend.flet
@@ -27,6 +30,7 @@ class FrontendManager:
 		self.frontends = []
 		self.tasks = {}
 		self.mqtt_client = None
+		self.logger = Logger('uvicorn')
 
 
 	async def configure(self, filename):
@@ -41,11 +45,19 @@ class FrontendManager:
 		self.config['frontend:broker-port'] = self.configuration.getint('frontend', 'mqtt-broker-port', fallback=1883)
 		self.config['frontend:broker-clientid'] = self.configuration.getstring('frontend', 'mqtt-broker-clientid', fallback='frontend')
 		self.config['frontend:broker-keepalive'] = self.configuration.getint('frontend', 'mqtt-broker-keepalive', fallback=0)
+		self.config['frontend:log-ring-buffer'] = self.configuration.getint('frontend', 'log-ring-buffer', fallback=0)
 		self.config['frontend:plugins'] = self.configuration.getlist('frontend', 'plugins', fallback=[])
 		for name in self.config['frontend:plugins']:
 			self.config[f'frontend:{name}:module'] = self.configuration.get(f'frontend:{name}', 'module', fallback=None)
 		logging_getLogger("uvicorn").info(f"[frontend] Switching to configured log-level '{self.config['frontend:log-level']}'...")
 		logging_getLogger('uvicorn').setLevel(self.config['frontend:log-level'])
+		if self.config['frontend:log-ring-buffer'] > 0:
+			ring_buffer = RingBufferHandler(self.config['frontend:log-ring-buffer'])
+			if len(logging_getLogger('uvicorn').handlers) > 0:
+				ring_buffer.setFormatter(logging_getLogger('uvicorn').handlers[0].formatter)
+			logging_getLogger('uvicorn').addHandler(ring_buffer)
+			logging_getLogger("uvicorn").info(f"[frontend] Buffering the last {self.config['frontend:log-ring-buffer']} log records (dumped on SIGUSR1)")
+		signal_signal(signal_SIGUSR1, self.on_posix_signal_dump)
 		logging_getLogger("uvicorn").info(f"[frontend] connecting to MQTT broker ({self.config['frontend:broker-ipv4']})...")
 		for counter in range(0, 4):
 			if self.mqtt_client is None or self.mqtt_client.is_connected() is False:
@@ -65,6 +77,11 @@ class FrontendManager:
 		self.frontends.append(frontend)
 
 
+	def on_posix_signal_dump(self, number: int, frame) -> None:
+		RingBufferHandler.dump_all('uvicorn')
+		self.logger.info("[frontend] METRICS = {metrics}", metrics=lambda: json_dumps({frontend.name: frontend.get_metrics() for frontend in self.frontends}))
+
+
 	def calculate_runlevel(self) -> str:
 		frontends_runlevel = []
 		for frontend in self.frontends:
@@ -118,7 +135,7 @@ class FrontendManager:
 	def on_mqtt_message(self, client, userdata, message):
 		topic = message.topic
 		payload = message.payload.decode('utf-8', 'surrogateescape')
-		logging_getLogger('uvicorn').log(Frontend.LOG_LEVEL_TRACE, f"[frontend] received MQTT message: {topic} => {payload}")
+		self.logger.trace("[frontend] received MQTT message: {topic} => {payload}", topic=topic, payload=payload)
 		if topic == 'hal9000/event/brain/runlevel':
 			match payload:
 				case 'killed':
@@ -199,8 +216,7 @@ class FrontendManager:
 									except:
 										pass
 								self.mqtt_client.publish(topic, payload)
-								logging_getLogger('uvicorn').log(Frontend.LOG_LEVEL_TRACE, f"[frontend] published MQTT message: " \
-								                                                           f"{topic} => {payload}")
+								self.logger.trace("[frontend] published MQTT message: {topic} => {payload}", topic=topic, payload=payload)
 			await asyncio_sleep(0.01)
 		logging_getLogger("uvicorn").info(f"[frontend] mqtt_publisher() exiting due to task being cancelled")
 
@@ -222,6 +238,7 @@ async def fastapi_lifespan(app: fastapi_FastAPI):
 			if frontend_class is not None:
 				logging_getLogger("uvicorn").info(f"[frontend] Starting frontend '{frontend_name}'...'")
 				frontend_instance = frontend_class(app)
+				frontend_instance.configure_queues(manager.configuration)
 				match await frontend_instance.configure(manager.configuration):
 					case True:
 						manager.add_frontend(frontend_instance)
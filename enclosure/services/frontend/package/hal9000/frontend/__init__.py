@@ -1,6 +1,8 @@
 from enum import StrEnum as enum_StrEnum
-from asyncio import Queue as asyncio_Queue
-from logging import getLogger as logging_getLogger
+from configparser import ConfigParser as configparser_ConfigParser
+
+from hal9000.logger import Logger
+from hal9000.queues import BoundedQueue, OVERFLOW, OVERFLOW_VALUES
 
 
 class RUNLEVEL(enum_StrEnum):
@@ -22,15 +24,40 @@ class Frontend:
 
 	def __init__(self, name: str):
 		self.name = name
-		self.logger = logging_getLogger('uvicorn')
-		self.commands = asyncio_Queue()
-		self.events = asyncio_Queue()
+		self.logger = Logger('uvicorn')
+		self.commands = BoundedQueue(0, OVERFLOW.BLOCK, Frontend.queue_key, name=f'frontend:{name}:commands', logger=self.logger)
+		self.events = BoundedQueue(0, OVERFLOW.BLOCK, Frontend.queue_key, name=f'frontend:{name}:events', logger=self.logger)
 		self.config = {}
 		self.tasks = {}
 		self.runlevel = RUNLEVEL.STARTING
 		self.status = Frontend.STATUS_UNKNOWN
 
 
+	@staticmethod
+	def queue_key(item: dict | None) -> str | None:
+		return item.get('topic') if item is not None else None
+
+
+	def configure_queues(self, configuration: configparser_ConfigParser) -> None:
+		for name, queue, fallback in [('commands', self.commands, OVERFLOW.COALESCE), ('events', self.events, OVERFLOW.DROP_OLDEST)]:
+			limit = configuration.getint('frontend', f'{name}-queue-limit', fallback=1000)
+			limit = configuration.getint(f'frontend:{self.name}', f'{name}-queue-limit', fallback=limit)
+			overflow = configuration.getstring('frontend', f'{name}-queue-overflow', fallback=fallback)
+			overflow = configuration.getstring(f'frontend:{self.name}', f'{name}-queue-overflow', fallback=overflow)
+			if overflow not in OVERFLOW_VALUES:
+				self.logger.warning(f"[frontend:{self.name}] invalid value '{overflow}' for '{name}-queue-overflow', using '{fallback}' instead")
+				overflow = fallback
+			if overflow == OVERFLOW.BLOCK:
+				self.logger.warning(f"[frontend:{self.name}] unsupported value '{overflow}' for '{name}-queue-overflow' (items are queued " \
+				                    f"without waiting for space, they would be rejected), using '{fallback}' instead")
+				overflow = fallback
+			queue.configure(limit, overflow)
+
+
+	def get_metrics(self) -> dict:
+		return {'commands': self.commands.get_metrics(), 'events': self.events.get_metrics()}
+
+
 	async def configure(self, configuration) -> bool:
 		self.runlevel = RUNLEVEL.SYNCING
 		return True
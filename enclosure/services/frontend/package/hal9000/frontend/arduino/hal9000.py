@@ -208,13 +208,13 @@ class HAL9000(Frontend):
 								self.commands.put_nowait({'topic': 'pong', 'payload': ''})
 								event[0] = ''
 							else:
-								self.logger.debug(f"[frontend:arduino] device2host reads message: " \
-								                  f"{json_dumps({'topic': event[0], 'payload': event[1]})}")
+								self.logger.debug("[frontend:arduino] device2host reads message: {message}",
+								                  message=lambda: json_dumps({'topic': event[0], 'payload': event[1]}))
 							if event[0].startswith('syslog/'):
 								log_level = event[0][7:].upper()
 								if hasattr(logging, log_level) is True:
 									log_level = getattr(logging, log_level)
-									self.logger.log(log_level, f"[frontend:arduino] {event[0]}: {json_dumps(event[1])}")
+									self.logger.log(log_level, "[frontend:arduino] {topic}: {payload}", topic=event[0], payload=lambda: json_dumps(event[1]))
 							if isinstance(event[1], dict) is True:
 								if 'origin' not in event[1]:
 									event[1]['origin'] = 'frontend:arduino'
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from sys import stderr as sys_stderr
+from typing import TextIO as typing_TextIO
+from collections import deque as collections_deque
+from logging import getLogger as logging_getLogger, \
+                    Handler as logging_Handler, \
+                    LogRecord as logging_LogRecord, \
+                    NOTSET as logging_NOTSET, \
+                    DEBUG as logging_DEBUG, \
+                    INFO as logging_INFO, \
+                    WARNING as logging_WARNING, \
+                    ERROR as logging_ERROR, \
+                    CRITICAL as logging_CRITICAL
+
+# Shared module of the brain and frontend packages (copied into both images from the 'shared' build context)
+
+
+class LazyMessage(object):
+	__slots__ = ('template', 'fields', 'text')
+
+	def __init__(self, template: str, fields: dict) -> None:
+		self.template = template
+		self.fields = fields
+		self.text = None
+
+
+	def __str__(self) -> str:
+		if self.text is None:
+			fields = {}
+			for name, value in self.fields.items():
+				fields[name] = value() if callable(value) is True else value
+			self.text = self.template.format(**fields)
+		return self.text
+
+
+class Logger(object):
+	__slots__ = ('logger',)
+	TRACE = 5
+
+	def __init__(self, name: str | None = None) -> None:
+		self.logger = logging_getLogger(name)
+
+
+	@property
+	def level(self) -> int:
+		return self.logger.level
+
+
+	def setLevel(self, level: int | str) -> None:
+		self.logger.setLevel(level)
+
+
+	def isEnabledFor(self, level: int) -> bool:
+		return self.logger.isEnabledFor(level)
+
+
+	def emit(self, level: int, message: str, fields: dict) -> None:
+		# with fields, 'message' is a str.format() template: it is only rendered if a handler emits the record
+		# (callable field values are only called then, too); without fields it's logged as is (pre-formatted)
+		if self.logger.isEnabledFor(level) is True:
+			if len(fields) > 0:
+				self.logger.log(level, LazyMessage(message, fields), stacklevel=3)
+			else:
+				self.logger.log(level, message, stacklevel=3)
+
+
+	def log(self, level: int, message: str, **fields) -> None:
+		self.emit(level, message, fields)
+
+
+	def trace(self, message: str, **fields) -> None:
+		self.emit(Logger.TRACE, message, fields)
+
+
+	def debug(self, message: str, **fields) -> None:
+		self.emit(logging_DEBUG, message, fields)
+
+
+	def info(self, message: str, **fields) -> None:
+		self.emit(logging_INFO, message, fields)
+
+
+	def warning(self, message: str, **fields) -> None:
+		self.emit(logging_WARNING, message, fields)
+
+
+	def warn(self, message: str, **fields) -> None:
+		self.emit(logging_WARNING, message, fields)
+
+
+	def error(self, message: str, **fields) -> None:
+		self.emit(logging_ERROR, message, fields)
+
+
+	def critical(self, message: str, **fields) -> None:
+		self.emit(logging_CRITICAL, message, fields)
+
+
+class RingBufferHandler(logging_Handler):
+
+	def __init__(self, capacity: int = 1000, level: int | str = logging_NOTSET) -> None:
+		super().__init__(level)
+		self.records = collections_deque(maxlen=capacity)
+
+
+	def emit(self, record: logging_LogRecord) -> None:
+		try:
+			record.msg = record.getMessage() # rendered now: fields may change until the buffer is dumped
+			record.args = None
+			self.records.append(record)
+		except Exception:
+			self.handleError(record)
+
+
+	def dump(self, stream: typing_TextIO = sys_stderr) -> int:
+		records = list(self.records)
+		for record in records:
+			stream.write(f'{self.format(record)}\n')
+		stream.flush()
+		return len(records)
+
+
+	@staticmethod
+	def dump_all(name: str | None = None, stream: typing_TextIO = sys_stderr) -> int:
+		count = 0
+		for handler in logging_getLogger(name).handlers:
+			if isinstance(handler, RingBufferHandler) is True:
+				count += handler.dump(stream)
+		return count
+
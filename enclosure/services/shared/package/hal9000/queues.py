@@ -0,0 +1,181 @@
+from __future__ import annotations
+from enum import StrEnum as enum_StrEnum
+from typing import Any, \
+                   Callable as typing_Callable, \
+                   Hashable as typing_Hashable
+from collections import deque as collections_deque
+from asyncio import Queue as asyncio_Queue, \
+                    Event as asyncio_Event
+
+from hal9000.logger import Logger
+
+# Shared module of the brain and frontend packages (copied into both images from the 'shared' build context)
+
+
+class OVERFLOW(enum_StrEnum):
+	BLOCK       = 'block'           # put() waits for space, put_nowait() rejects the new item (only for queues with backpressure)
+	DROP_OLDEST = 'drop-oldest'
+	DROP_NEWEST = 'drop-newest'
+	COALESCE    = 'coalesce-by-key' # replaces the newest queued item with the same key (else drops the oldest)
+
+OVERFLOW_VALUES = frozenset(OVERFLOW)
+
+
+class BoundedQueue(asyncio_Queue):
+	# with a 'coalesce' function (returning a key or None for items that are never coalesced), a new (dict) item
+	# supersedes a still queued item with the same key: the queued item is updated and moved to the tail (it must not
+	# be delivered ahead of items that were queued after the superseded state);
+	# 'backpressure' declares that the producers await put() or wait_for_space(), without it the BLOCK policy would
+	# just reject items (put_nowait()) and is therefore refused by configure(); the limit is enforced by full() (which
+	# asyncio.Queue.put() and put_nowait() consult), the storage is owned via _init()/_put()/_get() (and _remove(), for
+	# dropped items, which are task_done()'d on behalf of their never coming consumer)
+
+	def __init__(self, maxsize: int = 0, overflow: OVERFLOW = OVERFLOW.BLOCK, key: typing_Callable[[Any], typing_Hashable] | None = None,
+	                   coalesce: typing_Callable[[dict], typing_Hashable | None] | None = None,
+	                   name: str = 'queue', backpressure: bool = False, logger: Logger | None = None) -> None:
+		super().__init__(0)
+		self.limit = max(maxsize, 0)
+		self.overflow = overflow
+		self.key = key
+		self.coalesce = coalesce
+		self.name = name
+		self.backpressure = backpressure
+		self.logger = logger if logger is not None else Logger()
+		self.pending = {}
+		self.space = asyncio_Event()
+		self.space.set()
+		self.metrics = {'overflows': 0, 'dropped': 0, 'rejected': 0, 'coalesced': 0, 'blocked': 0, 'backlog-max': 0}
+
+
+	def configure(self, maxsize: int, overflow: OVERFLOW | str) -> None:
+		if overflow not in OVERFLOW_VALUES:
+			raise ValueError(f"BoundedQueue.configure(): invalid overflow policy '{overflow}' (valid: {', '.join(OVERFLOW_VALUES)})")
+		if overflow == OVERFLOW.COALESCE and self.key is None:
+			raise ValueError(f"BoundedQueue.configure(): overflow policy '{overflow}' requires a key function")
+		if overflow == OVERFLOW.BLOCK and self.backpressure is False and maxsize > 0:
+			raise ValueError(f"BoundedQueue.configure(): overflow policy '{overflow}' requires producers that wait for space " \
+			                 f"(queue '{self.name}' has none)")
+		self.limit = max(maxsize, 0)
+		self.overflow = OVERFLOW(overflow)
+
+
+	@property
+	def maxsize(self) -> int:
+		return self.limit
+
+
+	def full(self) -> bool:
+		return self.limit > 0 and self.qsize() >= self.limit
+
+
+	def put_nowait(self, item: Any) -> None:
+		if self.coalesce is not None:
+			key = self.coalesce(item)
+			if key is not None:
+				queued = self.pending.get(key)
+				if queued is not None:
+					self._remove(queued)
+					queued.update(item)
+					super().put_nowait(queued)
+					self.task_done() # for the superseded entry (only after the put, as for dropped items)
+					self.metrics['coalesced'] += 1
+					return
+				if self.full() is False or self.overflow in [OVERFLOW.DROP_OLDEST, OVERFLOW.COALESCE]:
+					self.pending[key] = item
+		dropped = None
+		if self.full() is True:
+			self.metrics['overflows'] += 1
+			match self.overflow:
+				case OVERFLOW.BLOCK:
+					self.metrics['rejected'] += 1
+					self.logger.warning("[queue:{name}] queue is full (limit {limit}), rejecting new item: {item}", \
+					                    name=self.name, limit=self.maxsize, item=item)
+					return
+				case OVERFLOW.DROP_NEWEST:
+					self.metrics['dropped'] += 1
+					return
+				case OVERFLOW.COALESCE | OVERFLOW.DROP_OLDEST:
+					dropped = self._superseded(item) if self.overflow == OVERFLOW.COALESCE else None
+					if dropped is not None:
+						self.metrics['coalesced'] += 1 # the new item is queued at the tail, the superseded one is removed
+					else:
+						dropped = self._oldest(item)
+						self.metrics['dropped'] += 1
+					if len(self.pending) > 0:
+						self.forget(dropped)
+					if dropped is item:
+						return
+					self._remove(dropped)
+		super().put_nowait(item)
+		if dropped is not None:
+			self.task_done() # for the dropped item, only after the put: join() must not return while the new item is queued
+		self.metrics['backlog-max'] = max(self.metrics['backlog-max'], self.qsize())
+
+
+	async def put(self, item: Any) -> None:
+		if self.overflow == OVERFLOW.BLOCK:
+			if self.full() is True:
+				self.metrics['blocked'] += 1
+			await super().put(item)
+		else:
+			self.put_nowait(item)
+
+
+	def get_nowait(self) -> Any:
+		item = super().get_nowait()
+		if len(self.pending) > 0:
+			self.forget(item)
+		if self.full() is False:
+			self.space.set()
+		return item
+
+
+	async def wait_for_space(self) -> None:
+		while self.full() is True:
+			self.space.clear()
+			await self.space.wait()
+
+
+	def forget(self, item: Any) -> None:
+		key = self.coalesce(item)
+		if key is not None and self.pending.get(key) is item:
+			del self.pending[key]
+
+
+	def _init(self, maxsize: int) -> None:
+		self._queue = collections_deque()
+
+
+	def _put(self, item: Any) -> None:
+		self._queue.append(item)
+
+
+	def _get(self) -> Any:
+		return self._queue.popleft()
+
+
+	def _remove(self, item: Any) -> None:
+		for index, queued in enumerate(self._queue):
+			if queued is item:
+				del self._queue[index]
+				return
+		raise ValueError('BoundedQueue._remove(): item is not queued')
+
+
+	def _oldest(self, item: Any) -> Any:
+		# returns the item to drop: a queued one or (if it must not displace any of them) the new item
+		return self._queue[0]
+
+
+	def _superseded(self, item: Any) -> Any | None:
+		# returns the newest queued item with the same key as the new item (if any)
+		key = self.key(item)
+		for queued in reversed(self._queue):
+			if self.key(queued) == key:
+				return queued
+		return None
+
+
+	def get_metrics(self) -> dict:
+		return dict(self.metrics, backlog=self.qsize(), limit=self.maxsize, overflow=str(self.overflow))
+
@@ -59,7 +59,7 @@ podman manifest exists "localhost/hal9000-brain:latest"
 if [ $? -eq 0 ]; then
 	podman manifest rm "localhost/hal9000-brain:latest"
 fi
-podman build --platform "${BUILD_PLATFORMS}" --build-arg DATA_DIRECTORY="${DATA_DIRECTORY}" --manifest "localhost/hal9000-brain:latest" -f Containerfile .
+podman build --platform "${BUILD_PLATFORMS}" --build-arg DATA_DIRECTORY="${DATA_DIRECTORY}" --build-context shared=../shared/package --manifest "localhost/hal9000-brain:latest" -f Containerfile .
 
 echo "Building image 'hal9000-dashboard'..."
 cd "${GIT_REPODIR}/enclosure/services/dashboard/"
@@ -83,7 +83,7 @@ podman manifest exists "localhost/hal9000-frontend:latest"
 if [ $? -eq 0 ]; then
 	podman manifest rm "localhost/hal9000-frontend:latest"
 fi
-podman build --platform "${BUILD_PLATFORMS}" --build-arg DATA_DIRECTORY="${DATA_DIRECTORY}" --manifest "localhost/hal9000-frontend:latest" -f Containerfile .
+podman build --platform "${BUILD_PLATFORMS}" --build-arg DATA_DIRECTORY="${DATA_DIRECTORY}" --build-context shared=../shared/package --manifest "localhost/hal9000-frontend:latest" -f Containerfile .
 
 echo "Building image 'hal9000-kalliope'..."
 cd "${GIT_REPODIR}/kalliope"